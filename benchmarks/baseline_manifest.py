@@ -0,0 +1,109 @@
+"""
+Cold start benchmark for baseline discovery with and without the baseline manifest.
+
+Builds a synthetic baseline tree, then runs each scenario in a fresh Python
+process so nothing is shared between runs:
+
+    python benchmarks/baseline_manifest.py --apps 20 --entities 50
+    python benchmarks/baseline_manifest.py --listdir-latency 5   # simulate a network share
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SIKULI_FRAMEWORK_BACKEND", "sikuligo")
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+sys.path.insert(0, os.path.abspath(SRC))
+
+from region.baselineIndex import BaselineIndex
+from region.baselineManifest import BaselineManifest
+
+_CHILD = r"""
+import json, os, sys, time
+os.environ.setdefault("SIKULI_FRAMEWORK_BACKEND", "sikuligo")
+sys.path.insert(0, %(src)r)
+latency = %(latency)f
+if latency:
+    _listdir = os.listdir
+    def _slow_listdir(path):
+        time.sleep(latency)
+        return _listdir(path)
+    os.listdir = _slow_listdir
+
+from region.baselineIndex import BaselineIndex
+from region.baselineManifest import BaselineManifest
+start = time.perf_counter()
+
+index = BaselineIndex()
+if %(manifest)r:
+    BaselineManifest.load(index, %(manifest)r)
+
+roots = %(roots)r
+found = 0
+for app, entity in %(names)r:
+    # Same probe order as Finder.findBaselines for a sub-entity: single, sequence, series, series+sequence
+    for candidate in (app + "/" + entity, app + "/Button" + entity[len(app):]):
+        for suffix in ("", "-0", "[0]", "[0]-0"):
+            if index.locate(candidate + suffix + ".png", roots):
+                found += 1
+                break
+        else:
+            continue
+        break
+print(json.dumps({"seconds": time.perf_counter() - start, "scans": index.scans, "found": found}))
+"""
+
+
+def _tree(root, apps, entities):
+    names = []
+    for a in range(apps):
+        app = "App%d" % a
+        directory = os.path.join(root, "baseline", app)
+        os.makedirs(directory)
+        for e in range(entities):
+            entity = "%s,button%d" % (app, e)
+            layout = ("", "-0", "[0]", "[0]-0")[e % 4]
+            open(os.path.join(directory, entity + layout + ".png"), "wb").close()
+            names.append((app, entity))
+    return os.path.join(root, "baseline"), names
+
+
+def _run(baseline, names, manifest, latency):
+    code = _CHILD % {
+        "src": os.path.abspath(SRC),
+        "latency": latency,
+        "manifest": manifest,
+        "roots": [os.path.join(baseline, "os", "linux"), baseline, os.getcwd()],
+        "names": names,
+    }
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=20)
+    parser.add_argument("--entities", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--listdir-latency", type=float, default=0.0, help="milliseconds added to every directory listing")
+    args = parser.parse_args()
+
+    latency = args.listdir_latency / 1000.0
+    with tempfile.TemporaryDirectory() as root:
+        baseline, names = _tree(root, args.apps, args.entities)
+        manifest = BaselineManifest.save(BaselineManifest.build(BaselineIndex(), [baseline]), BaselineManifest.getPath(baseline))
+
+        print("%d directories, %d entities, listdir latency %.1fms" % (args.apps + 1, len(names), args.listdir_latency))
+        for label, path in (("without manifest", None), ("with manifest", manifest)):
+            runs = [_run(baseline, names, path, latency) for _ in range(args.repeat)]
+            best = min(run["seconds"] for run in runs)
+            print("%-17s best=%7.2fms scans=%d found=%d" % (label, best * 1000, runs[0]["scans"], runs[0]["found"]))
+
+
+if __name__ == "__main__":
+    main()
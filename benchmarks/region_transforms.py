@@ -0,0 +1,69 @@
+"""
+Micro-benchmark of adapter region geometry and the transform pipeline.
+
+Times building regions, the region methods the transforms call (`nearby`,
+`above`, `limit`, `add`, ...) and a whole `RegionalTransform` chain as it
+runs for a sub-entity search:
+
+    python benchmarks/region_transforms.py --number 100000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+os.environ.setdefault("SIKULI_FRAMEWORK_BACKEND", "sikuligo")
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+sys.path.insert(0, os.path.abspath(SRC))
+
+from adapters.sikuligo_backend import Location, Region
+from region.transform import RegionAbove, RegionClickOffset, RegionLimitByParent, RegionMorph, RegionNearby
+
+
+class _Entity(object):
+    def __init__(self, region, parent=None):
+        self.region = region
+        self.parent = parent
+
+
+def _scenarios():
+    window = _Entity(Region(None, bounds=(0, 0, 1920, 1080)))
+    button = _Entity(Region(None, bounds=(800, 600, 120, 30)), parent=window)
+    other = Region(None, bounds=(700, 650, 50, 50))
+    region = button.region
+    pipeline = (RegionNearby(20), RegionAbove(40), RegionLimitByParent(), RegionMorph(-2, -2, 2, 2), RegionClickOffset(5, 5))
+
+    def transforms():
+        operand = region
+        for transform in pipeline:
+            operand = transform.apply(operand, previousMatches=[], entity=button)
+        return operand
+
+    return (
+        ("Region(bounds=...)", lambda: Region(None, bounds=(800, 600, 120, 30))),
+        ("Region(x, y, w, h)", lambda: Region(800, 600, 120, 30)),
+        ("nearby", lambda: region.nearby(20)),
+        ("above", lambda: region.above(40)),
+        ("limit(region)", lambda: region.limit(window.region)),
+        ("limit(tuple)", lambda: region.limit((0, 0, 1920, 1080))),
+        ("add(region)", lambda: region.add(other)),
+        ("add(location)", lambda: region.add(Location(10, 10))),
+        ("getClickLocation", region.getClickLocation),
+        ("transform pipeline", transforms),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, statement in _scenarios():
+        best = min(timeit.repeat(statement, number=args.number, repeat=args.repeat))
+        print("%-20s %8.3fus" % (label, best / args.number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
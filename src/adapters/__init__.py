@@ -1,10 +1,25 @@
+from .frame import Frame
+from .geometry import Point, Rect
+from .match_cache import MatchCache, match_cache
+from .pattern_cache import PatternCache, pattern_cache
+from .region_set import PointSet, RegionSet
 from .sikuligo_backend import Pattern, Region, Screen
-from .types import BackendError, BackendMatch
+from .types import BackendError, BackendMatch, MatchNotFound
 
 __all__ = [
     "BackendError",
     "BackendMatch",
+    "Frame",
+    "MatchCache",
+    "MatchNotFound",
     "Pattern",
+    "PatternCache",
+    "Point",
+    "PointSet",
+    "Rect",
     "Region",
+    "RegionSet",
     "Screen",
+    "match_cache",
+    "pattern_cache",
 ]
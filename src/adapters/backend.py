@@ -0,0 +1,25 @@
+"""
+Adapter wrappers of the backend selected by ``SIKULI_FRAMEWORK_BACKEND``.
+
+``sikuligo`` drives a sikuligo server, ``local`` matches in-process with NumPy
+(see local_backend).  Both expose the same Location/Pattern/Region/Screen
+surface, framework code imports them from here.
+"""
+
+from __future__ import annotations
+
+import os
+
+from .types import BackendError
+
+BACKEND_SIKULIGO = "sikuligo"
+BACKEND_LOCAL = "local"
+
+name = os.environ.get("SIKULI_FRAMEWORK_BACKEND", BACKEND_SIKULIGO).strip().lower()
+
+if name == BACKEND_LOCAL:
+    from .local_backend import Location, Pattern, Region, Screen
+else:
+    from .sikuligo_backend import Location, Pattern, Region, Screen
+
+__all__ = ["BackendError", "Location", "Pattern", "Region", "Screen", "name"]
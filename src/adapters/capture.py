@@ -0,0 +1,428 @@
+"""
+Screen capture providers.
+
+Capturing used to shell out to ``screencapture``, ImageMagick ``import`` or
+``scrot`` for every screenshot.  A provider grabs the requested bounds into a
+`Frame` instead; PNG is only encoded when a file is actually asked for
+(`Screen.capture_region`).  Providers, fastest first:
+
+- `MssCapture`: the ``mss`` package when it is installed (X11 SHM, macOS, Windows)
+- `X11Capture`: XGetImage on the root window through libX11 and ctypes
+- `SubprocessCapture`: the capture tools, run from a persistent helper process
+
+The provider is detected once per process.  ``SIKULI_FRAMEWORK_CAPTURE``
+(``mss``, ``x11`` or ``subprocess``) forces one.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from .frame import Frame
+from .types import BackendError
+
+TOOL_TIMEOUT = 10.0  # seconds a capture tool may run, eg. `import` hangs on an unreachable display
+REPLY_MARGIN = 5.0   # seconds on top of TOOL_TIMEOUT before a silent capture worker is killed
+
+
+class CaptureProvider:
+    """Grabs screen areas into frames, `bounds` None is the whole screen."""
+
+    name = "none"
+
+    def grab(self, bounds: tuple[int, int, int, int] | None) -> Frame:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MssCapture(CaptureProvider):
+    name = "mss"
+
+    def __init__(self) -> None:
+        import mss  # optional dependency
+
+        self._mss = mss
+        self._local = threading.local()  # mss handles are per thread
+
+    def _handle(self):
+        handle = getattr(self._local, "handle", None)
+        if handle is None:
+            handle = self._local.handle = self._mss.mss()
+        return handle
+
+    def grab(self, bounds: tuple[int, int, int, int] | None) -> Frame:
+        handle = self._handle()
+        if bounds is None:
+            screen = handle.monitors[0]
+            bounds = (screen["left"], screen["top"], screen["width"], screen["height"])
+        x, y, w, h = bounds
+        shot = handle.grab({"left": int(x), "top": int(y), "width": int(w), "height": int(h)})
+        return Frame.from_bgrx(shot.width, shot.height, shot.bgra, x=x, y=y)
+
+    def close(self) -> None:
+        handle = getattr(self._local, "handle", None)
+        if handle is not None:
+            handle.close()
+            self._local.handle = None
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("create_image", ctypes.c_void_p),
+        ("destroy_image", ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)),
+    ]
+
+
+_Z_PIXMAP = 2
+_ALL_PLANES = ctypes.c_ulong(-1).value
+_X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+# Module level: Xlib keeps a pointer to the handler, it must outlive every provider
+_IGNORE_X_ERRORS = _X_ERROR_HANDLER(lambda _display, _event: 0)
+_X_ERRORS_LOCK = threading.Lock()  # the error handler is process wide
+
+
+class X11Capture(CaptureProvider):
+    """XGetImage of the requested bounds only, no process or file in between."""
+
+    name = "x11"
+
+    def __init__(self, display: str | None = None) -> None:
+        path = ctypes.util.find_library("X11")
+        if path is None:
+            raise BackendError("libX11 not found")
+        xlib = ctypes.cdll.LoadLibrary(path)
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        xlib.XRootWindow.restype = ctypes.c_ulong
+        xlib.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XGetImage.restype = ctypes.POINTER(_XImage)
+        xlib.XGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.c_ulong, ctypes.c_int,
+        ]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xlib.XSetErrorHandler.restype = ctypes.c_void_p
+        xlib.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+
+        self._xlib = xlib
+        self._display = xlib.XOpenDisplay(display.encode() if display else None)
+        if not self._display:
+            raise BackendError("cannot open X display %r" % (display or os.environ.get("DISPLAY")))
+
+        screen = xlib.XDefaultScreen(self._display)
+        self._root = xlib.XRootWindow(self._display, screen)
+        self.size = (xlib.XDisplayWidth(self._display, screen), xlib.XDisplayHeight(self._display, screen))
+        self._lock = threading.Lock()  # Xlib connections aren't thread safe
+
+    def grab(self, bounds: tuple[int, int, int, int] | None) -> Frame:
+        width, height = self.size
+        x, y, w, h = bounds if bounds is not None else (0, 0, width, height)
+        # XGetImage fails for areas outside the root window, grab the visible part
+        left, top = max(0, int(x)), max(0, int(y))
+        right, bottom = min(width, int(x) + int(w)), min(height, int(y) + int(h))
+        if right <= left or bottom <= top:
+            raise BackendError(f"region {(x, y, w, h)} is outside the screen {self.size}")
+
+        with self._lock:
+            image = self._get_image(left, top, right - left, bottom - top)
+            if not image:
+                raise BackendError(f"XGetImage failed for {(left, top, right - left, bottom - top)}")
+            try:
+                ximage = image.contents
+                if ximage.bits_per_pixel != 32:
+                    raise BackendError(f"unsupported X11 pixel format: {ximage.bits_per_pixel} bits per pixel")
+                data = ctypes.string_at(ximage.data, ximage.bytes_per_line * ximage.height)
+                stride = ximage.bytes_per_line
+            finally:
+                image.contents.destroy_image(ctypes.cast(image, ctypes.c_void_p))
+        return Frame.from_bgrx(right - left, bottom - top, data, stride=stride, x=left, y=top)
+
+    def _get_image(self, x: int, y: int, w: int, h: int):
+        # The default handler exits the process on protocol errors (eg. the screen shrank), report them as a
+        # failed grab instead.  Only for this call: other X users of the process keep their own handler.
+        with _X_ERRORS_LOCK:
+            previous = self._xlib.XSetErrorHandler(ctypes.cast(_IGNORE_X_ERRORS, ctypes.c_void_p))
+            try:
+                return self._xlib.XGetImage(self._display, self._root, x, y, w, h, _ALL_PLANES, _Z_PIXMAP)
+            finally:
+                self._xlib.XSetErrorHandler(previous)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._display:
+                self._xlib.XCloseDisplay(self._display)
+                self._display = None
+
+
+def detect_tool() -> tuple[str, str] | None:
+    """(kind, executable) of the capture tool of this machine, None when there is none."""
+    if sys.platform == "darwin":
+        return "screencapture", "screencapture"
+    for kind in ("import", "scrot"):
+        path = shutil.which(kind)
+        if path:
+            return kind, path
+    return None
+
+
+def tool_command(tool: tuple[str, str], bounds: tuple[int, int, int, int] | None, path: str | None) -> list[str]:
+    """
+    Command capturing `bounds` to `path`, or to stdout as PPM when the tool can (path None).
+
+    Every tool is asked for an unfiltered format (BMP, PPM): decoding a filtered PNG of the
+    whole screen costs more than the capture.  scrot picks the format from the extension.
+    """
+    kind, executable = tool
+    if kind == "screencapture":
+        cmd = [executable, "-x", "-t", "bmp"]
+        if bounds is not None:
+            x, y, w, h = bounds
+            cmd.append(f"-R{x},{y},{w},{h}")
+        return cmd + [path]
+    if kind == "import":
+        cmd = [executable, "-window", "root"]
+        if bounds is not None:
+            x, y, w, h = bounds
+            cmd.extend(["-crop", f"{w}x{h}+{x}+{y}"])
+        return cmd + ["-depth", "8", "ppm:-"]
+    cmd = [executable, "-o"]
+    if bounds is not None:
+        x, y, w, h = bounds
+        cmd.extend(["-a", f"{x},{y},{w},{h}"])
+    return cmd + [path]
+
+
+class CaptureWorker:
+    """
+    Pipe to a capture_worker process, started on first use and restarted when it dies.
+
+    The worker stops capture tools running longer than `timeout`.  A worker that doesn't
+    answer within `timeout` + REPLY_MARGIN is killed, the next capture starts a new one.
+    """
+
+    def __init__(self, argv: list[str] | None = None, timeout: float = TOOL_TIMEOUT) -> None:
+        self.argv = argv or [sys.executable, "-I", os.path.join(os.path.dirname(os.path.abspath(__file__)), "capture_worker.py")]
+        self.timeout = timeout
+        self._process: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+        self.starts = 0
+
+    def _start(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            # Unbuffered, replies are read with select() which doesn't see Python's buffers
+            self._process = subprocess.Popen(
+                self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0
+            )
+            self.starts += 1
+        return self._process
+
+    def _read(self, process: subprocess.Popen, buffer: bytearray, size: int | None, deadline: float) -> None:
+        """Read into buffer until it holds a whole line (size None) or size bytes, raises TimeoutError past deadline."""
+        fd = process.stdout.fileno()
+        while (b"\n" not in buffer) if size is None else (len(buffer) < size):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError("capture worker did not answer")
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                raise EOFError("capture worker exited")
+            buffer += chunk
+
+    def _exchange(self, request: bytes) -> bytes:
+        process = self._start()
+        process.stdin.write(request)
+        deadline = time.monotonic() + self.timeout + REPLY_MARGIN
+        buffer = bytearray()
+        self._read(process, buffer, None, deadline)
+        header, _, rest = bytes(buffer).partition(b"\n")
+        status, _, detail = header.decode("utf-8", "replace").partition(" ")
+        if status != "ok":
+            raise BackendError(f"screen capture failed: {detail}")
+        data = bytearray(rest)
+        self._read(process, data, int(detail), deadline)
+        return bytes(data)
+
+    def run(self, argv: list[str], output: str | None = None) -> bytes:
+        """Run a capture command in the worker, returns its stdout (or the output file)."""
+        request = (json.dumps({"argv": argv, "output": output, "timeout": self.timeout}) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                try:
+                    return self._exchange(request)
+                except TimeoutError:
+                    raise
+                except (OSError, EOFError):
+                    self._stop()
+                    return self._exchange(request)  # once more with a fresh worker
+            except TimeoutError:
+                self._kill()  # hung, the next capture starts a new worker
+                raise BackendError(f"screen capture timed out after {self.timeout + REPLY_MARGIN:g}s") from None
+
+    def _kill(self) -> None:
+        process, self._process = self._process, None
+        if process is not None:
+            process.kill()
+            process.wait()
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=2)
+            except Exception:
+                process.kill()
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+
+class SubprocessCapture(CaptureProvider):
+    """
+    Capture tool per screenshot, asking for formats that are cheap to decode.
+
+    The tool is looked up once.  By default it runs in a persistent `CaptureWorker`
+    instead of being forked from this process every time.
+    """
+
+    name = "subprocess"
+
+    def __init__(self, persistent: bool = True, tool: tuple[str, str] | None = None) -> None:
+        self.tool = tool or detect_tool()
+        self.worker = CaptureWorker() if persistent else None
+
+    def _run(self, argv: list[str], output: str | None) -> bytes:
+        if self.worker is not None:
+            return self.worker.run(argv, output)
+        try:
+            result = subprocess.run(
+                argv, check=True, stdout=subprocess.DEVNULL if output else subprocess.PIPE, stderr=subprocess.DEVNULL,
+                timeout=TOOL_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            raise BackendError(f"screen capture timed out after {TOOL_TIMEOUT:g}s") from None
+        if output is None:
+            return result.stdout
+        try:
+            with open(output, "rb") as handle:
+                return handle.read()
+        finally:
+            os.unlink(output)
+
+    def grab(self, bounds: tuple[int, int, int, int] | None) -> Frame:
+        if self.tool is None:
+            raise BackendError("screen capture backend unavailable for this runtime")
+
+        x0, y0 = (bounds[0], bounds[1]) if bounds is not None else (0, 0)
+        output = None
+        if self.tool[0] != "import":
+            fd, output = tempfile.mkstemp(prefix="sikuligo-frame-", suffix=".bmp" if self.tool[0] == "screencapture" else ".ppm")
+            os.close(fd)
+        try:
+            data = self._run(tool_command(self.tool, bounds, output), output)
+        except Exception:
+            if output is not None and os.path.exists(output):
+                os.unlink(output)
+            raise
+        return Frame.from_image(data, x=x0, y=y0)
+
+    def close(self) -> None:
+        if self.worker is not None:
+            self.worker.close()
+
+
+PROVIDERS = {
+    MssCapture.name: MssCapture,
+    X11Capture.name: X11Capture,
+    SubprocessCapture.name: SubprocessCapture,
+}
+
+_provider: CaptureProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def detect_provider() -> CaptureProvider:
+    """The fastest provider that works here, or the one forced by SIKULI_FRAMEWORK_CAPTURE."""
+    forced = os.environ.get("SIKULI_FRAMEWORK_CAPTURE", "").strip().lower()
+    if forced:
+        if forced not in PROVIDERS:
+            raise BackendError(f"unknown capture provider {forced!r}, expected one of {', '.join(PROVIDERS)}")
+        return PROVIDERS[forced]()
+
+    candidates = [MssCapture]
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+        candidates.append(X11Capture)
+    for candidate in candidates:
+        try:
+            return candidate()
+        except Exception:
+            continue
+    return SubprocessCapture()
+
+
+def capture_provider() -> CaptureProvider:
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = detect_provider()
+    return _provider
+
+
+def set_capture_provider(provider: CaptureProvider | None) -> None:
+    """Use `provider` for all captures, None detects again on the next capture."""
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    if previous is not None and previous is not provider:
+        previous.close()
+
+
+def grab(bounds: tuple[int, int, int, int] | None) -> Frame:
+    return capture_provider().grab(bounds)
+
+
+__all__ = [
+    "CaptureProvider",
+    "CaptureWorker",
+    "MssCapture",
+    "SubprocessCapture",
+    "X11Capture",
+    "capture_provider",
+    "detect_provider",
+    "detect_tool",
+    "grab",
+    "set_capture_provider",
+]
@@ -0,0 +1,52 @@
+"""
+Long-lived capture helper used by `capture.SubprocessCapture`.
+
+Runs as a small, standard-library-only child process.  Each request is one
+JSON line on stdin: ``{"argv": [...], "output": path or null, "timeout": seconds}``.
+The helper runs the capture tool and answers with ``ok <size>\\n`` followed by
+the image bytes (the tool's stdout, or the output file which is then removed),
+or with ``error <message>\\n``, also when the tool ran longer than the timeout.
+
+Forking the capture tool from this process is much cheaper than forking it
+from the framework process, with its large heap and many threads.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+
+def serve(requests, replies):
+    for line in requests:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            output = request.get("output")
+            result = subprocess.run(
+                request["argv"],
+                check=True,
+                stdout=subprocess.DEVNULL if output else subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                timeout=request.get("timeout"),
+            )
+            if output:
+                try:
+                    with open(output, "rb") as handle:
+                        data = handle.read()
+                finally:
+                    os.unlink(output)
+            else:
+                data = result.stdout
+        except Exception as e:
+            message = ("%s: %s" % (type(e).__name__, e)).replace("\n", " ")
+            replies.write(("error %s\n" % message).encode("utf-8"))
+        else:
+            replies.write(("ok %d\n" % len(data)).encode("ascii"))
+            replies.write(data)
+        replies.flush()
+
+
+if __name__ == "__main__":
+    serve(sys.stdin, sys.stdout.buffer)
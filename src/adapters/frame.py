@@ -0,0 +1,422 @@
+"""
+Captured screen frames and the small image codecs needed to produce them.
+
+A `Frame` is an 8-bit gray or RGB pixel buffer anchored at its screen
+position, so frames can be cropped to a region and matched against without
+another capture.  The decoders cover what the capture tools emit (PPM, BMP)
+and baseline images (PNG).  Pixel conversions and PNG unfiltering run in
+NumPy when it is installed; without it they are only fast enough for small
+images, see `accelerated()`.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional acceleration
+    np = None
+
+from .types import BackendError
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def accelerated() -> bool:
+    """Are whole-screen frames cheap to convert (NumPy installed)?"""
+    return np is not None
+
+
+class Frame:
+    """Pixels of a screen area, row-major, 1 (gray) or 3 (RGB) channels per pixel."""
+
+    __slots__ = ("x", "y", "width", "height", "channels", "pixels", "captured_at", "_gray")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        pixels: bytes,
+        *,
+        channels: int = 1,
+        x: int = 0,
+        y: int = 0,
+        captured_at: float | None = None,
+    ) -> None:
+        if channels not in (1, 3):
+            raise BackendError(f"unsupported frame channel count: {channels}")
+        if len(pixels) != width * height * channels:
+            raise BackendError("frame pixel buffer does not match its dimensions")
+        self.x = int(x)
+        self.y = int(y)
+        self.width = int(width)
+        self.height = int(height)
+        self.channels = int(channels)
+        self.pixels = bytes(pixels)
+        self.captured_at = time.monotonic() if captured_at is None else float(captured_at)
+        self._gray = self if channels == 1 else None
+
+    @property
+    def bounds(self) -> tuple[int, int, int, int]:
+        return self.x, self.y, self.width, self.height
+
+    def age_millis(self, now: float | None = None) -> float:
+        return ((time.monotonic() if now is None else now) - self.captured_at) * 1000.0
+
+    def contains(self, bounds: tuple[int, int, int, int]) -> bool:
+        x, y, w, h = bounds
+        return x >= self.x and y >= self.y and x + w <= self.x + self.width and y + h <= self.y + self.height
+
+    def crop(self, bounds: tuple[int, int, int, int] | None) -> "Frame":
+        """Return the part of this frame inside `bounds` (screen coordinates)."""
+        if bounds is None:
+            return self
+        x, y, w, h = bounds
+        left = max(self.x, int(x))
+        top = max(self.y, int(y))
+        right = min(self.x + self.width, int(x) + int(w))
+        bottom = min(self.y + self.height, int(y) + int(h))
+        if right <= left or bottom <= top:
+            raise BackendError(f"region {tuple(bounds)} is outside the captured frame {self.bounds}")
+        if (left, top, right - left, bottom - top) == self.bounds:
+            return self
+
+        stride = self.width * self.channels
+        start = (left - self.x) * self.channels
+        end = (right - self.x) * self.channels
+        rows = [
+            self.pixels[row * stride + start: row * stride + end]
+            for row in range(top - self.y, bottom - self.y)
+        ]
+        cropped = Frame(
+            right - left,
+            bottom - top,
+            b"".join(rows),
+            channels=self.channels,
+            x=left,
+            y=top,
+            captured_at=self.captured_at,
+        )
+        return cropped
+
+    def gray(self) -> "Frame":
+        """Return an 8-bit gray version of this frame (ITU-R 601 luma)."""
+        if self._gray is None:
+            self._gray = Frame(
+                self.width,
+                self.height,
+                _rgb_to_gray(self.pixels),
+                channels=1,
+                x=self.x,
+                y=self.y,
+                captured_at=self.captured_at,
+            )
+        return self._gray
+
+    def to_png(self) -> bytes:
+        return encode_png(self.width, self.height, self.pixels, self.channels)
+
+    def array(self):
+        """NumPy view of the pixels, shape (h, w) or (h, w, 3)."""
+        if np is None:
+            raise BackendError("numpy is required for Frame.array()")
+        data = np.frombuffer(self.pixels, dtype=np.uint8)
+        if self.channels == 1:
+            return data.reshape(self.height, self.width)
+        return data.reshape(self.height, self.width, self.channels)
+
+    @classmethod
+    def from_image(cls, data: bytes, *, x: int = 0, y: int = 0, captured_at: float | None = None) -> "Frame":
+        """Decode PNG, PPM or BMP bytes."""
+        if data.startswith(_PNG_SIGNATURE):
+            width, height, channels, pixels = decode_png(data)
+        elif data[:2] in (b"P5", b"P6"):
+            width, height, channels, pixels = decode_ppm(data)
+        elif data[:2] == b"BM":
+            width, height, channels, pixels = decode_bmp(data)
+        else:
+            raise BackendError("unsupported image format")
+        return cls(width, height, pixels, channels=channels, x=x, y=y, captured_at=captured_at)
+
+    @classmethod
+    def from_bgrx(
+        cls,
+        width: int,
+        height: int,
+        data: bytes | memoryview,
+        *,
+        stride: int | None = None,
+        x: int = 0,
+        y: int = 0,
+        captured_at: float | None = None,
+    ) -> "Frame":
+        """Wrap 32-bit BGRX/BGRA pixels (X11 ZPixmap, mss) as an RGB frame."""
+        pixels = _bgrx_to_rgb(data, width, height, stride or width * 4)
+        return cls(width, height, pixels, channels=3, x=x, y=y, captured_at=captured_at)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "Frame":
+        with open(path, "rb") as handle:
+            return cls.from_image(handle.read(), **kwargs)
+
+    def __repr__(self) -> str:
+        return f"Frame({self.x},{self.y},{self.width},{self.height} channels={self.channels})"
+
+
+def _rgb_to_gray(pixels: bytes) -> bytes:
+    if np is not None:
+        rgb = np.frombuffer(pixels, dtype=np.uint8).reshape(-1, 3).astype(np.uint32)
+        return ((rgb[:, 0] * 299 + rgb[:, 1] * 587 + rgb[:, 2] * 114) // 1000).astype(np.uint8).tobytes()
+    return bytes(
+        (r * 299 + g * 587 + b * 114) // 1000
+        for r, g, b in zip(pixels[0::3], pixels[1::3], pixels[2::3])
+    )
+
+
+def _bgrx_to_rgb(data: bytes | memoryview, width: int, height: int, stride: int) -> bytes:
+    if np is not None:
+        rows = np.frombuffer(data, dtype=np.uint8, count=stride * height).reshape(height, stride)
+        return rows[:, :width * 4].reshape(height, width, 4)[:, :, 2::-1].tobytes()
+    data = bytes(data)
+    if stride != width * 4:
+        data = b"".join(data[row * stride:row * stride + width * 4] for row in range(height))
+    rgb = bytearray(width * height * 3)
+    rgb[0::3] = data[2::4]
+    rgb[1::3] = data[1::4]
+    rgb[2::3] = data[0::4]
+    return bytes(rgb)
+
+
+def encode_png(width: int, height: int, pixels: bytes, channels: int = 1, level: int = 1) -> bytes:
+    """Encode 8-bit gray/RGB pixels as PNG (filter None, fast zlib level by default)."""
+    stride = width * channels
+    raw = b"".join(b"\x00" + pixels[row * stride:(row + 1) * stride] for row in range(height))
+
+    def _chunk(tag: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+
+    color_type = 0 if channels == 1 else 2
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (
+        _PNG_SIGNATURE
+        + _chunk(b"IHDR", ihdr)
+        + _chunk(b"IDAT", zlib.compress(raw, level))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def decode_png(data: bytes) -> tuple[int, int, int, bytes]:
+    """Decode a non-interlaced PNG into (width, height, channels, pixels), alpha is dropped."""
+    if not data.startswith(_PNG_SIGNATURE):
+        raise BackendError("not a PNG image")
+
+    offset = len(_PNG_SIGNATURE)
+    idat = []
+    palette = None
+    width = height = depth = color_type = interlace = None
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset:offset + 4])
+        tag = data[offset + 4:offset + 8]
+        payload = data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if tag == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", payload)
+        elif tag == b"PLTE":
+            palette = payload
+        elif tag == b"IDAT":
+            idat.append(payload)
+        elif tag == b"IEND":
+            break
+
+    if width is None:
+        raise BackendError("PNG image has no IHDR chunk")
+    if interlace:
+        raise BackendError("interlaced PNG images are not supported")
+
+    samples = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    bits = depth * samples
+    bpp = max(1, bits // 8)
+    stride = (width * bits + 7) // 8
+    raw = _unfilter(zlib.decompress(b"".join(idat)), height, stride, bpp)
+
+    if depth == 16:
+        raw = raw[0::2]
+    elif depth < 8:
+        raw = _unpack_bits(raw, width, height, stride, depth, scale=color_type == 0)
+
+    if color_type == 3:
+        if palette is None:
+            raise BackendError("palette PNG image has no PLTE chunk")
+        if np is not None:
+            colors = np.frombuffer(palette, dtype=np.uint8)[:len(palette) // 3 * 3].reshape(-1, 3)
+            return width, height, 3, colors[np.frombuffer(raw, dtype=np.uint8)].tobytes()
+        return width, height, 3, b"".join(palette[index * 3:index * 3 + 3] for index in raw)
+    if color_type == 4:
+        return width, height, 1, raw[0::2]
+    if color_type == 6:
+        return width, height, 3, _drop_alpha(raw)
+    return width, height, 1 if color_type == 0 else 3, raw
+
+
+def _drop_alpha(rgba: bytes) -> bytes:
+    if np is not None:
+        return np.frombuffer(rgba, dtype=np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    out = bytearray(len(rgba) // 4 * 3)
+    out[0::3] = rgba[0::4]
+    out[1::3] = rgba[1::4]
+    out[2::3] = rgba[2::4]
+    return bytes(out)
+
+
+def _unpack_bits(raw: bytes, width: int, height: int, stride: int, depth: int, scale: bool) -> bytes:
+    per_byte = 8 // depth
+    mask = (1 << depth) - 1
+    factor = 255 // mask if scale else 1
+    if np is not None:
+        rows = np.frombuffer(raw, dtype=np.uint8, count=height * stride).reshape(height, stride, 1)
+        shifts = np.arange(8 - depth, -1, -depth, dtype=np.uint8)
+        values = ((rows >> shifts) & mask).reshape(height, stride * per_byte)[:, :width]
+        return (values * factor).astype(np.uint8).tobytes()
+    out = bytearray()
+    for row in range(height):
+        line = raw[row * stride:(row + 1) * stride]
+        values = []
+        for byte in line:
+            for shift in range(8 - depth, -1, -depth):
+                values.append(((byte >> shift) & mask) * factor)
+        out.extend(values[:width])
+    return bytes(out)
+
+
+def _unfilter(data: bytes, height: int, stride: int, bpp: int) -> bytes:
+    if np is not None:
+        return _unfilter_numpy(data, height, stride, bpp)
+    out = bytearray(height * stride)
+    previous = bytearray(stride)
+    position = 0
+    for row in range(height):
+        kind = data[position]
+        line = bytearray(data[position + 1:position + 1 + stride])
+        position += stride + 1
+        if kind == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif kind == 2:
+            if np is not None:
+                line = bytearray((np.frombuffer(line, np.uint8) + np.frombuffer(previous, np.uint8)).tobytes())
+            else:
+                for i in range(stride):
+                    line[i] = (line[i] + previous[i]) & 0xFF
+        elif kind == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(stride):
+                a = line[i - bpp] if i >= bpp else 0
+                b = previous[i]
+                c = previous[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                if pa <= pb and pa <= pc:
+                    predictor = a
+                elif pb <= pc:
+                    predictor = b
+                else:
+                    predictor = c
+                line[i] = (line[i] + predictor) & 0xFF
+        elif kind != 0:
+            raise BackendError(f"unknown PNG filter type {kind}")
+        out[row * stride:(row + 1) * stride] = line
+        previous = line
+    return bytes(out)
+
+
+def _unfilter_numpy(data: bytes, height: int, stride: int, bpp: int) -> bytes:
+    rows = np.frombuffer(data, dtype=np.uint8, count=height * (stride + 1)).reshape(height, stride + 1)
+    kinds = rows[:, 0]
+    filtered = rows[:, 1:]
+    if height and int(kinds.max()) > 4:
+        raise BackendError(f"unknown PNG filter type {int(kinds.max())}")
+
+    if not (kinds >= 3).any():
+        # None, Sub and Up: a row at a time
+        out = np.empty((height, stride), dtype=np.uint8)
+        previous = np.zeros(stride, dtype=np.uint8)
+        for row in range(height):
+            line = filtered[row]
+            if kinds[row] == 1:
+                line = np.cumsum(line.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+            elif kinds[row] == 2:
+                line = line + previous
+            out[row] = line
+            previous = out[row]
+        return out.tobytes()
+
+    # Average and Paeth depend on the pixel to the left and the row above: every pixel of an
+    # anti-diagonal only depends on earlier diagonals, so a diagonal at a time
+    width = stride // bpp
+    pixels = filtered.reshape(height, width, bpp).astype(np.int16)
+    out = np.zeros((height + 1, width + 1, bpp), dtype=np.int16)  # padded with a zero row and column
+    for diagonal in range(height + width - 1):
+        r = np.arange(max(0, diagonal - width + 1), min(height - 1, diagonal) + 1)
+        x = diagonal - r
+        a, b, c = out[r + 1, x], out[r, x + 1], out[r, x]
+        kind = kinds[r][:, None]
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+        predictor = np.select([kind == 1, kind == 2, kind == 3, kind == 4], [a, b, (a + b) >> 1, paeth], 0)
+        out[r + 1, x + 1] = (pixels[r, x] + predictor) & 0xFF
+    return out[1:, 1:].astype(np.uint8).tobytes()
+
+
+def decode_ppm(data: bytes) -> tuple[int, int, int, bytes]:
+    """Decode binary PGM (P5) / PPM (P6) with maxval 255."""
+    fields = []
+    position = 2
+    while len(fields) < 3:
+        while data[position:position + 1].isspace():
+            position += 1
+        if data[position:position + 1] == b"#":
+            position = data.index(b"\n", position) + 1
+            continue
+        start = position
+        while not data[position:position + 1].isspace():
+            position += 1
+        fields.append(int(data[start:position]))
+    position += 1  # single whitespace before the raster
+    width, height, maxval = fields
+    if maxval != 255:
+        raise BackendError("only 8-bit PPM/PGM images are supported")
+    channels = 3 if data[:2] == b"P6" else 1
+    return width, height, channels, data[position:position + width * height * channels]
+
+
+def decode_bmp(data: bytes) -> tuple[int, int, int, bytes]:
+    """Decode uncompressed 24/32-bit BMP (as written by `screencapture -t bmp`)."""
+    (pixel_offset,) = struct.unpack("<I", data[10:14])
+    width, height = struct.unpack("<ii", data[18:26])
+    (bits,) = struct.unpack("<H", data[28:30])
+    (compression,) = struct.unpack("<I", data[30:34])
+    if bits not in (24, 32) or compression not in (0, 3):
+        raise BackendError(f"unsupported BMP format bits={bits} compression={compression}")
+
+    bottom_up = height > 0
+    height = abs(height)
+    bpp = bits // 8
+    stride = (width * bpp + 3) & ~3
+    rows = []
+    for row in range(height):
+        source = height - 1 - row if bottom_up else row
+        start = pixel_offset + source * stride
+        line = data[start:start + width * bpp]
+        rgb = bytearray(width * 3)
+        rgb[0::3] = line[2::bpp]
+        rgb[1::3] = line[1::bpp]
+        rgb[2::3] = line[0::bpp]
+        rows.append(bytes(rgb))
+    return width, height, 3, b"".join(rows)
@@ -0,0 +1,177 @@
+"""
+Recently captured frames of a screen.
+
+Finder, screenshot logging and vanish detection often grab the screen within
+milliseconds of each other.  A `FrameBuffer` keeps the last few frames with
+their capture time so a consumer asking for "a frame no older than N ms" gets
+one that was already taken.  Captures are single-flight: requesters that
+arrive while a suitable capture is running wait for it instead of starting
+their own.
+
+Input changes the screen, so `Screen` drops the buffered frames whenever it
+sends mouse or keyboard input.
+"""
+
+from __future__ import annotations
+
+import collections
+import os
+import threading
+import time
+from typing import Callable
+
+from .frame import Frame
+
+Bounds = tuple[int, int, int, int]
+
+
+def _covers(outer: Bounds | None, inner: Bounds | None) -> bool:
+    """Whether a capture of `outer` (None: whole screen) contains `inner`."""
+    if outer is None:
+        return True
+    if inner is None:
+        return False
+    x, y, w, h = inner
+    ox, oy, ow, oh = outer
+    return x >= ox and y >= oy and x + w <= ox + ow and y + h <= oy + oh
+
+
+class _Capture:
+    """A capture in progress, other requesters wait on it."""
+
+    __slots__ = ("bounds", "started", "done", "frame", "error")
+
+    def __init__(self, bounds: Bounds | None, started: float) -> None:
+        self.bounds = bounds
+        self.started = started
+        self.done = threading.Event()
+        self.frame: Frame | None = None
+        self.error: BaseException | None = None
+
+
+class FrameBuffer:
+    """Ring of the last `capacity` frames, at most `max_bytes` of pixels."""
+
+    def __init__(
+        self,
+        grab: Callable[[Bounds | None], Frame],
+        capacity: int = 4,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("SIKULI_FRAMEWORK_FRAME_BUFFER_MB", "64")) * 1024 * 1024)
+        self.grab = grab
+        self.capacity = int(capacity)
+        self.max_bytes = int(max_bytes)
+        self.clock = clock
+        self._frames: collections.deque[tuple[Bounds | None, Frame]] = collections.deque()
+        self._bytes = 0
+        self._pending: list[_Capture] = []
+        self._lock = threading.Lock()
+        self.captures = 0
+        self.hits = 0
+        self.joins = 0
+
+    def get(self, bounds: Bounds | None = None, max_age_millis: float = 0, newer_than: float | None = None) -> Frame:
+        """
+        Frame of `bounds` (None: the whole screen) captured at most `max_age_millis` ago.
+
+        `newer_than` (a `Frame.captured_at`) rules out that frame and older ones, eg. a frame
+        that was already searched.  With `max_age_millis` 0 a new capture is always taken.
+        """
+        now = self.clock()
+        oldest = now - max(0.0, float(max_age_millis)) / 1000.0
+        if newer_than is not None:
+            oldest = max(oldest, newer_than + 1e-9)
+
+        with self._lock:
+            if max_age_millis > 0:
+                for captured, frame in reversed(self._frames):
+                    if frame.captured_at >= oldest and _covers(captured, bounds):
+                        self.hits += 1
+                        return self._crop(frame, bounds)
+                for capture in self._pending:
+                    if capture.started >= oldest and _covers(capture.bounds, bounds):
+                        self.joins += 1
+                        break
+                else:
+                    capture = None
+            else:
+                capture = None
+
+            owner = capture is None
+            if owner:
+                capture = _Capture(bounds, now)
+                self._pending.append(capture)
+
+        if owner:
+            self._capture(capture)
+        else:
+            capture.done.wait()
+
+        if capture.error is not None:
+            raise capture.error
+        return self._crop(capture.frame, bounds)
+
+    @staticmethod
+    def _crop(frame: Frame, bounds: Bounds | None) -> Frame:
+        return frame if bounds is None else frame.crop(bounds)
+
+    def _capture(self, capture: _Capture) -> None:
+        try:
+            capture.frame = self.grab(capture.bounds)
+        except BaseException as exc:
+            capture.error = exc
+        finally:
+            with self._lock:
+                self._pending.remove(capture)
+                if capture.frame is not None:
+                    self.captures += 1
+                    if capture.started != float("-inf"):  # not invalidated while capturing
+                        self._push(capture.bounds, capture.frame)
+            capture.done.set()
+
+    def _push(self, bounds: Bounds | None, frame: Frame) -> None:
+        size = len(frame.pixels)
+        if size > self.max_bytes or self.capacity <= 0:
+            return
+        self._frames.append((bounds, frame))
+        self._bytes += size
+        while len(self._frames) > self.capacity or self._bytes > self.max_bytes:
+            _, dropped = self._frames.popleft()
+            self._bytes -= len(dropped.pixels)
+
+    def invalidate(self) -> None:
+        """Forget the buffered frames, the next request captures again."""
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+            # Captures still running may predate the change, don't let new requesters join them
+            for capture in self._pending:
+                capture.started = float("-inf")
+
+    def configure(self, capacity: int | None = None, max_bytes: int | None = None) -> None:
+        with self._lock:
+            if capacity is not None:
+                self.capacity = int(capacity)
+            if max_bytes is not None:
+                self.max_bytes = int(max_bytes)
+            while self._frames and (len(self._frames) > self.capacity or self._bytes > self.max_bytes):
+                _, dropped = self._frames.popleft()
+                self._bytes -= len(dropped.pixels)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "frames": len(self._frames),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "capacity": self.capacity,
+                "captures": self.captures,
+                "hits": self.hits,
+                "joins": self.joins,
+            }
+
+
+__all__ = ["FrameBuffer"]
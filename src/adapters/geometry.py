@@ -0,0 +1,142 @@
+"""
+Immutable geometry values shared by the adapter backends.
+
+`Rect` and `Point` are named tuples: slotted, hashable and unpackable like the
+plain `(x, y, w, h)` / `(x, y)` tuples they replace, so frames, caches and
+legacy code keep working with them unchanged.  Transforms (`nearby`, `above`,
+`limit`, `add`, ...) are computed on them, and `as_rect` / `as_point` check the
+known types before falling back to duck typing.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, NamedTuple
+
+from .types import BackendError
+
+_new = tuple.__new__  # builds Rect/Point without the keyword handling of their generated __new__
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+    def offset(self, dx: int, dy: int) -> "Point":
+        return _new(Point, (self.x + dx, self.y + dy))
+
+
+class Rect(NamedTuple):
+    x: int
+    y: int
+    w: int
+    h: int
+
+    @property
+    def right(self) -> int:
+        return self.x + self.w
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.h
+
+    @property
+    def center(self) -> Point:
+        return _new(Point, (self.x + (self.w // 2), self.y + (self.h // 2)))
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x <= x < self.x + self.w and self.y <= y < self.y + self.h
+
+    def union(self, other: "Rect") -> "Rect":
+        x1, y1, w1, h1 = self
+        x2, y2, w2, h2 = other
+        left = x1 if x1 < x2 else x2
+        top = y1 if y1 < y2 else y2
+        right = max(x1 + w1, x2 + w2)
+        bottom = max(y1 + h1, y2 + h2)
+        return _new(Rect, (left, top, right - left, bottom - top))
+
+    def union_point(self, x: int, y: int) -> "Rect":
+        x1, y1, w1, h1 = self
+        left = min(x1, x)
+        top = min(y1, y)
+        return _new(Rect, (left, top, max(x1 + w1, x) - left, max(y1 + h1, y) - top))
+
+    def intersection(self, other: "Rect") -> "Rect | None":
+        """Overlap of both rectangles, None when they are apart (touching edges give an empty rect)."""
+        x1, y1, w1, h1 = self
+        x2, y2, w2, h2 = other
+        left = x1 if x1 > x2 else x2
+        top = y1 if y1 > y2 else y2
+        right = min(x1 + w1, x2 + w2)
+        bottom = min(y1 + h1, y2 + h2)
+        if right < left or bottom < top:
+            return None
+        return _new(Rect, (left, top, right - left, bottom - top))
+
+    def grow(self, pad: int) -> "Rect":
+        x, y, w, h = self
+        return _new(Rect, (x - pad, y - pad, w + (2 * pad), h + (2 * pad)))
+
+    def above(self, h: int) -> "Rect":
+        return _new(Rect, (self.x, self.y - h, self.w, h))
+
+    def below(self, h: int) -> "Rect":
+        return _new(Rect, (self.x, self.y + self.h, self.w, h))
+
+    def left_of(self, w: int) -> "Rect":
+        return _new(Rect, (self.x - w, self.y, w, self.h))
+
+    def right_of(self, w: int) -> "Rect":
+        return _new(Rect, (self.x + self.w, self.y, w, self.h))
+
+    @staticmethod
+    def bounding(rects: Iterable["Rect"]) -> "Rect":
+        """Smallest rect covering all the given ones."""
+        rects = iter(rects)
+        try:
+            left, top, w, h = next(rects)
+        except StopIteration:
+            raise BackendError("no rectangles to cover") from None
+        right = left + w
+        bottom = top + h
+        for x, y, w, h in rects:
+            left = x if x < left else left
+            top = y if y < top else top
+            right = max(right, x + w)
+            bottom = max(bottom, y + h)
+        return _new(Rect, (left, top, right - left, bottom - top))
+
+
+EMPTY = Rect(0, 0, 0, 0)
+
+
+def as_rect(value: Any) -> Rect:
+    """Rect of a Rect, 4-sequence, or anything with x/y/w/h or getX/getY/getW/getH."""
+    kind = type(value)
+    if kind is Rect:
+        return value
+    if isinstance(value, (tuple, list)) and len(value) == 4:
+        return _new(Rect, (int(value[0]), int(value[1]), int(value[2]), int(value[3])))
+    if all(hasattr(value, k) for k in ("x", "y", "w", "h")):
+        return _new(Rect, (int(value.x), int(value.y), int(value.w), int(value.h)))
+    if all(hasattr(value, k) for k in ("getX", "getY", "getW", "getH")):
+        return _new(Rect, (int(value.getX()), int(value.getY()), int(value.getW()), int(value.getH())))
+    raise BackendError(f"Unable to coerce region bounds from {kind.__name__}")
+
+
+def as_point(value: Any) -> Point:
+    """Point of a Point, 2-sequence, or anything with getX/getY, x/y or target_x/target_y."""
+    kind = type(value)
+    if kind is Point:
+        return value
+    if isinstance(value, (tuple, list)) and len(value) == 2:
+        return _new(Point, (int(value[0]), int(value[1])))
+    if hasattr(value, "getX") and hasattr(value, "getY"):
+        return _new(Point, (int(value.getX()), int(value.getY())))
+    if hasattr(value, "x") and hasattr(value, "y"):
+        return _new(Point, (int(value.x), int(value.y)))
+    if hasattr(value, "target_x") and hasattr(value, "target_y"):
+        return _new(Point, (int(value.target_x), int(value.target_y)))
+    if hasattr(value, "getClickLocation"):
+        return as_point(value.getClickLocation())
+    raise BackendError(f"Unable to coerce point from {kind.__name__}")
@@ -0,0 +1,70 @@
+"""
+Input events queued by `Screen.batch()` and sent together.
+
+Every mouse move, click, text or hotkey is a blocking call to the input
+backend (an RPC for sikuligo, a process for xdotool).  Inside a batch they
+are queued instead and sent in as few calls as the backend allows when the
+block ends.  Before sending, the queue is fused: a move followed by a click
+on the same point only clicks there, repeated moves to the same point are
+sent once and consecutive texts are typed with one call.  Moves to other
+points are kept, a drawing path still goes through every point.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, NamedTuple
+
+
+class InputEvent(NamedTuple):
+    kind: str  # "move", "click", "type" or "hotkey"
+    x: int = 0
+    y: int = 0
+    button: str = "left"
+    text: str = ""
+    keys: tuple[str, ...] = ()
+    delay_millis: int | None = None
+
+
+def fuse_events(events: Iterable[InputEvent]) -> list[InputEvent]:
+    """The same input in fewer events."""
+    fused: list[InputEvent] = []
+    for event in events:
+        last = fused[-1] if fused else None
+        if last is not None and last.kind == "move" and last.delay_millis is None and event.kind in ("move", "click"):
+            if (last.x, last.y) == (event.x, event.y):
+                fused[-1] = event  # clicks move there themselves
+                continue
+        if last is not None and last.kind == event.kind == "type" and last.delay_millis == event.delay_millis:
+            fused[-1] = last._replace(text=last.text + event.text)
+            continue
+        fused.append(event)
+    return fused
+
+
+class InputBatch:
+    """Events queued while a `Screen.batch()` block runs."""
+
+    def __init__(self, send: Callable[[list[InputEvent]], Any], delay_millis: int | None = None) -> None:
+        self._send = send
+        self.delay_millis = None if delay_millis is None else int(delay_millis)
+        self.events: list[InputEvent] = []
+        self.sent = 0  # events sent after fusing
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, event: InputEvent) -> None:
+        if event.delay_millis is None and self.delay_millis is not None and event.kind != "hotkey":
+            event = event._replace(delay_millis=self.delay_millis)
+        self.events.append(event)
+
+    def flush(self) -> None:
+        """Send what is queued, e.g. before searching a screen that must show it."""
+        if not self.events:
+            return
+        events, self.events = fuse_events(self.events), []
+        self._send(events)
+        self.sent += len(events)
+
+    def discard(self) -> None:
+        self.events = []
@@ -0,0 +1,406 @@
+"""
+In-process matching backend (``SIKULI_FRAMEWORK_BACKEND=local``).
+
+Templates are matched with normalized cross-correlation computed by NumPy
+FFTs on locally captured frames, without a sikuligo server round trip.  The
+backend reuses the adapter `Pattern`/`Region`/`Screen` wrappers of the
+sikuligo backend, so framework code sees the same surface: similarity, target
+offsets and resize are honoured the same way.
+
+Input goes through ``xdotool`` when it is installed.  Screens built from a
+still image (`Screen.from_image`) record input events instead, which is what
+tests and offline baseline checks use.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import time
+from typing import Any, Callable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+from . import sikuligo_backend as _adapter
+from .frame import Frame
+from .input_batch import InputEvent
+from .sikuligo_backend import SCAN_INTERVAL, Location, _capture_frame, _resize_nearest
+from .types import BackendError, BackendMatch, MatchNotFound
+
+DEFAULT_SIMILARITY = 0.7
+XDOTOOL_BUTTONS = {"left": "1", "middle": "2", "right": "3"}
+EXACT_SIMILARITY = 0.99  # NCC of identical pixels is 1.0 give or take rounding
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise BackendError("The local backend requires numpy. Install it first: pip install numpy")
+
+
+def _window_sums(values, h: int, w: int):
+    """Sum of every h x w window of a 2-D array, via an integral image."""
+    integral = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(values, axis=0), axis=1, out=integral[1:, 1:])
+    return integral[h:, w:] - integral[:-h, w:] - integral[h:, :-w] + integral[:-h, :-w]
+
+
+def match_scores(image, template):
+    """
+    Normalized cross-correlation of `template` at every position of `image` (2-D gray arrays).
+
+    Returns an array of shape (H - h + 1, W - w + 1) with scores in [-1, 1], None when the
+    template is larger than the image.
+    """
+    _require_numpy()
+    image = np.asarray(image, dtype=np.float64)
+    template = np.asarray(template, dtype=np.float64)
+    height, width = image.shape
+    h, w = template.shape
+    if h > height or w > width:
+        return None
+
+    centered = template - template.mean()
+    template_norm = float(np.sqrt((centered * centered).sum()))
+    window_sum = _window_sums(image, h, w)
+    window_sq = _window_sums(image * image, h, w)
+    variance = np.maximum(window_sq - (window_sum * window_sum) / (h * w), 0.0)
+
+    if template_norm == 0.0:
+        # Flat template: correlation is undefined, score flat windows by how close their level is
+        mean = window_sum / (h * w)
+        return np.where(variance < 1e-6, 1.0 - np.abs(mean - template.mean()) / 255.0, 0.0)
+
+    shape = (height + h - 1, width + w - 1)
+    spectrum = np.fft.rfft2(image, shape) * np.fft.rfft2(centered[::-1, ::-1], shape)
+    correlation = np.fft.irfft2(spectrum, shape)[h - 1:height, w - 1:width]
+
+    denominator = np.sqrt(variance) * template_norm
+    scores = np.zeros_like(correlation)
+    np.divide(correlation, denominator, out=scores, where=denominator > 1e-6)
+    return np.clip(scores, -1.0, 1.0)
+
+
+def best_match(image, template) -> tuple[int, int, float] | None:
+    """(x, y, score) of the best template position in image, None when it doesn't fit."""
+    scores = match_scores(image, template)
+    if scores is None:
+        return None
+    y, x = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    return int(x), int(y), float(scores[y, x])
+
+
+class LocalPattern:
+    """Immutable template: image plus the similarity, target offset and resize factor to match it with."""
+
+    __slots__ = ("image", "similarity", "offset", "factor", "_gray")
+
+    def __init__(
+        self,
+        image: str | bytes | bytearray | memoryview,
+        similarity: float = DEFAULT_SIMILARITY,
+        offset: tuple[int, int] = (0, 0),
+        factor: float = 1.0,
+    ) -> None:
+        self.image = image
+        self.similarity = float(similarity)
+        self.offset = (int(offset[0]), int(offset[1]))
+        self.factor = float(factor)
+        self._gray = None
+
+    def _copy(self, **changes) -> "LocalPattern":
+        values = {"similarity": self.similarity, "offset": self.offset, "factor": self.factor}
+        values.update(changes)
+        return LocalPattern(self.image, **values)
+
+    def similar(self, similarity: float) -> "LocalPattern":
+        return self._copy(similarity=similarity)
+
+    def exact(self) -> "LocalPattern":
+        return self._copy(similarity=1.0)
+
+    def target_offset(self, dx: int, dy: int) -> "LocalPattern":
+        return self._copy(offset=(dx, dy))
+
+    def resize(self, factor: float) -> "LocalPattern":
+        return self._copy(factor=factor)
+
+    def gray(self) -> Frame:
+        """Gray template pixels, resized by the pattern factor."""
+        if self._gray is None:
+            if isinstance(self.image, str):
+                frame = Frame.from_file(self.image)
+            else:
+                frame = Frame.from_image(bytes(self.image))
+            frame = frame.gray()
+            if self.factor != 1.0:
+                frame = _resize_nearest(frame, self.factor)
+            self._gray = frame
+        return self._gray
+
+    def __str__(self) -> str:
+        name = self.image if isinstance(self.image, str) else "<bytes>"
+        return f'Pattern("{name}").similar({self.similarity})'
+
+
+def match_frame(
+    frame: Frame,
+    template: Frame,
+    similarity: float | None = None,
+    offset: tuple[int, int] = (0, 0),
+) -> BackendMatch | None:
+    """Best match of a gray template in a captured frame (screen coordinates), None below the similarity."""
+    found = best_match(frame.gray().array(), template.array())
+    if found is None:
+        return None
+    x, y, score = found
+    threshold = DEFAULT_SIMILARITY if similarity is None else min(float(similarity), EXACT_SIMILARITY)
+    if score < threshold:
+        return None
+    x += frame.x
+    y += frame.y
+    return BackendMatch(
+        x=x,
+        y=y,
+        w=template.width,
+        h=template.height,
+        target_x=x + (template.width // 2) + offset[0],
+        target_y=y + (template.height // 2) + offset[1],
+        score=score,
+    )
+
+
+class LocalRegion:
+    """Raw region: captures its bounds from the screen and matches patterns in them."""
+
+    def __init__(self, screen: "LocalScreen", bounds: tuple[int, int, int, int] | None = None) -> None:
+        self.screen = screen
+        self.bounds = bounds
+
+    def _search(self, pattern: LocalPattern, timeout_millis: int | None) -> BackendMatch | None:
+        deadline = time.monotonic() + (max(0, timeout_millis) / 1000.0 if timeout_millis else 0.0)
+        while True:
+            match = match_frame(self.screen.capture(self.bounds), pattern.gray(), pattern.similarity, pattern.offset)
+            if match is not None:
+                return match
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.screen.scan_interval, remaining))
+
+    def find(self, pattern: LocalPattern, timeout_millis: int | None = None) -> BackendMatch:
+        match = self._search(pattern, timeout_millis)
+        if match is None:
+            raise MatchNotFound(f"{pattern} not found in {self.bounds or 'screen'}")
+        return match
+
+    def exists(self, pattern: LocalPattern, timeout_millis: int = 0) -> BackendMatch | None:
+        return self._search(pattern, timeout_millis)
+
+    def wait(self, pattern: LocalPattern, timeout_millis: int = 3000) -> BackendMatch:
+        return self.find(pattern, timeout_millis=timeout_millis)
+
+    def click(self, pattern: LocalPattern, timeout_millis: int | None = None) -> BackendMatch:
+        match = self.find(pattern, timeout_millis=timeout_millis)
+        self.screen.input.click(match.target_x, match.target_y, "left")
+        return match
+
+
+class XdotoolInput:
+    """Input through the xdotool command line tool."""
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+
+    def _run(self, *args: str) -> None:
+        subprocess.run([self.command, *args], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def move(self, x: int, y: int) -> None:
+        self._run("mousemove", str(int(x)), str(int(y)))
+
+    def click(self, x: int, y: int, button: str) -> None:
+        self._run("mousemove", str(int(x)), str(int(y)), "click", XDOTOOL_BUTTONS.get(button, "1"))
+
+    def type_text(self, text: str) -> None:
+        self._run("type", "--", text)
+
+    def hotkey(self, keys: list[str]) -> None:
+        self._run("key", "+".join(keys))
+
+    def run(self, events: list[InputEvent]) -> None:
+        """Send a batch chained on as few command lines as possible, type and key end a command line."""
+        args: list[str] = []
+        for event in events:
+            if event.delay_millis:
+                args += ["sleep", "%g" % (event.delay_millis / 1000.0)]
+            if event.kind == "move":
+                args += ["mousemove", str(event.x), str(event.y)]
+            elif event.kind == "click":
+                args += ["mousemove", str(event.x), str(event.y), "click", XDOTOOL_BUTTONS.get(event.button, "1")]
+            elif event.kind == "type":
+                self._run(*args, "type", "--", event.text)
+                args = []
+            else:
+                self._run(*args, "key", "+".join(event.keys))
+                args = []
+        if args:
+            self._run(*args)
+
+
+class RecordingInput:
+    """Input driver that only records what it was asked to do."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple] = []
+
+    def move(self, x: int, y: int) -> None:
+        self.events.append(("move", int(x), int(y)))
+
+    def click(self, x: int, y: int, button: str) -> None:
+        self.events.append(("click", int(x), int(y), button))
+
+    def type_text(self, text: str) -> None:
+        self.events.append(("type", text))
+
+    def hotkey(self, keys: list[str]) -> None:
+        self.events.append(("hotkey", tuple(keys)))
+
+
+class _NoInput:
+    def _fail(self, *_args: Any) -> None:
+        raise BackendError("The local backend needs xdotool for mouse and keyboard input")
+
+    move = click = type_text = hotkey = run = _fail
+
+
+def _default_input():
+    command = shutil.which("xdotool")
+    return XdotoolInput(command) if command else _NoInput()
+
+
+class LocalScreen:
+    """Raw screen: where frames come from and where input goes."""
+
+    def __init__(
+        self,
+        capture: Callable[[tuple[int, int, int, int] | None], Frame] | None = None,
+        input: Any = None,
+        scan_interval: float = SCAN_INTERVAL,
+    ) -> None:
+        self._capture = capture or _capture_frame
+        self.input = input if input is not None else _default_input()
+        self.scan_interval = float(scan_interval)
+        self.meta = {"backend": "local"}
+
+    def capture(self, bounds: tuple[int, int, int, int] | None = None) -> Frame:
+        return self._capture(_adapter._usable_bounds(bounds))
+
+    def region(self, x: int, y: int, w: int, h: int) -> LocalRegion:
+        return LocalRegion(self, (int(x), int(y), int(w), int(h)))
+
+    def find(self, pattern: LocalPattern, timeout_millis: int | None = None) -> BackendMatch:
+        return LocalRegion(self).find(pattern, timeout_millis)
+
+    def exists(self, pattern: LocalPattern, timeout_millis: int = 0) -> BackendMatch | None:
+        return LocalRegion(self).exists(pattern, timeout_millis)
+
+    def wait(self, pattern: LocalPattern, timeout_millis: int = 3000) -> BackendMatch:
+        return LocalRegion(self).wait(pattern, timeout_millis)
+
+    def click(self, pattern: LocalPattern, timeout_millis: int | None = None) -> BackendMatch:
+        return LocalRegion(self).click(pattern, timeout_millis)
+
+    def close(self) -> None:
+        pass
+
+
+class Pattern(_adapter.Pattern):
+    @classmethod
+    def _check_runtime(cls) -> None:
+        _require_numpy()
+
+    @classmethod
+    def _new_raw(cls, image: Any) -> LocalPattern:
+        return LocalPattern(image)
+
+
+class Region(_adapter.Region):
+    __slots__ = ()
+
+    _pattern_type = Pattern
+
+    def _find_in_frame(self, pattern: Pattern, frame: Frame) -> "Region":
+        match = match_frame(frame.crop(self._bounds), pattern.gray(), pattern.similarity, pattern.offset)
+        if match is None:
+            raise MatchNotFound(f"{pattern} not found in frame")
+        return self._region_type.from_match(match, raw_region=self._raw, screen=self._screen)
+
+
+Region._region_type = Region
+
+
+class Screen(Region, _adapter.Screen):
+    @property
+    def client(self):
+        raise BackendError("the local backend has no sikuligo client")
+
+    @classmethod
+    def auto(cls, **kwargs) -> "Screen":
+        _require_numpy()
+        return cls(LocalScreen(**kwargs))
+
+    connect = auto
+    spawn = auto
+
+    @classmethod
+    def from_image(cls, image: str | bytes, **kwargs) -> "Screen":
+        """A screen that always shows the same picture, with recorded input unless told otherwise."""
+        _require_numpy()
+        frame = Frame.from_file(image) if isinstance(image, str) else Frame.from_image(bytes(image))
+        kwargs.setdefault("input", RecordingInput())
+        return cls(LocalScreen(capture=lambda bounds: frame.crop(bounds), **kwargs))
+
+    @property
+    def input(self):
+        return self._raw_screen.input
+
+    def _grab(self, bounds: tuple[int, int, int, int] | None) -> Frame:
+        return self._raw_screen.capture(bounds)
+
+    def _send_input(self, events: list[InputEvent]) -> None:
+        driver = self.input
+        try:
+            if hasattr(driver, "run"):
+                driver.run(events)
+                return
+            for event in events:
+                if event.delay_millis:
+                    time.sleep(event.delay_millis / 1000.0)
+                if event.kind == "move":
+                    driver.move(event.x, event.y)
+                elif event.kind == "click":
+                    driver.click(event.x, event.y, event.button)
+                elif event.kind == "type":
+                    driver.type_text(event.text)
+                else:
+                    driver.hotkey(list(event.keys))
+        finally:
+            self._screen_changed()
+
+
+__all__ = [
+    "Location",
+    "LocalPattern",
+    "LocalRegion",
+    "LocalScreen",
+    "Pattern",
+    "RecordingInput",
+    "Region",
+    "Screen",
+    "XdotoolInput",
+    "best_match",
+    "match_frame",
+    "match_scores",
+]
@@ -0,0 +1,117 @@
+"""
+Process-wide cache of match results on captured frames.
+
+Matching a pattern against the same pixels always gives the same answer.
+Re-validation chains (`Entity.waitUntilVanish`, static dialogs) search an
+unchanged screen over and over, so `Region.find(pattern, frame=...)` looks
+the result up by the content hash of the searched area first.
+
+There is one entry per (pattern, search bounds).  When the area shows other
+pixels the entry is replaced, so results of stale frames don't pile up.
+Misses are cached too: a pattern that wasn't there isn't there on the same
+pixels either.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+from typing import Any, Hashable
+
+from .frame import Frame
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def _env_max_entries() -> int:
+    value = os.environ.get("SIKULI_FRAMEWORK_MATCH_CACHE", "").strip()
+    try:
+        return max(0, int(value)) if value else DEFAULT_MAX_ENTRIES
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def frame_digest(frame: Frame) -> bytes:
+    """Content hash of a frame's pixels and position."""
+    digest = hashlib.blake2b(frame.pixels, digest_size=16)
+    digest.update(repr(frame.bounds).encode("ascii"))
+    return digest.digest()
+
+
+def pattern_key(pattern: Any) -> Hashable:
+    """Identity of an adapter pattern: its image content plus how it is matched."""
+    file_key = getattr(pattern, "_file_key", None)
+    image = pattern.image
+    if file_key is not None:
+        source = file_key
+    elif isinstance(image, (bytes, bytearray, memoryview)):
+        source = hashlib.blake2b(bytes(image), digest_size=16).digest()
+    elif isinstance(image, str):
+        source = os.path.abspath(image)
+    else:
+        source = id(pattern)
+    return source, pattern.similarity, tuple(pattern.offset), pattern.factor
+
+
+class MatchCache:
+    """LRU of match results keyed by (pattern, bounds), valid for one content hash."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = _env_max_entries() if max_entries is None else int(max_entries)
+        self._entries: OrderedDict[Hashable, tuple[bytes, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def configure(self, max_entries: int) -> None:
+        with self._lock:
+            self.max_entries = max(0, int(max_entries))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, key: Hashable, digest: bytes) -> tuple[bool, Any]:
+        """(found, result) of a pattern/bounds key for the pixels hashed to digest."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == digest:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def store(self, key: Hashable, digest: bytes, result: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (digest, result)  # replaces the result of older pixels
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+match_cache = MatchCache()
@@ -0,0 +1,127 @@
+"""
+Process-wide LRU cache of decoded baseline patterns.
+
+Finder builds a new pattern for every baseline on every find attempt.  The
+cache keeps the loaded backend pattern (and its decoded gray pixels) keyed by
+file path, mtime and size plus the similarity/offset/resize applied to it, so
+a baseline is only decoded again when the file on disk changes.
+
+Cached values are shared between callers and must be treated as immutable.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+import struct
+import threading
+from typing import Any, Callable, Hashable
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _env_max_bytes() -> int:
+    value = os.environ.get("SIKULI_FRAMEWORK_PATTERN_CACHE_MB", "").strip()
+    if not value:
+        return DEFAULT_MAX_BYTES
+    try:
+        return max(0, int(float(value) * 1024 * 1024))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+class PatternCache:
+    """LRU of patterns bounded by an estimate of their decoded size in bytes."""
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self.max_bytes = _env_max_bytes() if max_bytes is None else int(max_bytes)
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            self._evict()
+
+    @staticmethod
+    def file_key(path: str) -> tuple[str, int, int] | None:
+        """(path, mtime, size) identifying the current content of an image file, None if it can't be stat'ed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def estimate_bytes(path: str, fallback: int) -> int:
+        """Decoded RGBA size of a PNG read from its header, the file size otherwise."""
+        try:
+            with open(path, "rb") as handle:
+                header = handle.read(24)
+        except OSError:
+            return fallback
+        if header[:8] == _PNG_SIGNATURE and header[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", header[16:24])
+            return width * height * 4
+        return fallback
+
+    def get(self, key: Hashable, build: Callable[[], Any], cost: int | Callable[[Any], int]) -> Any:
+        """Return the cached value for key, building (and caching) it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = build()
+        size = cost(value) if callable(cost) else int(cost)
+
+        with self._lock:
+            if size > self.max_bytes:
+                return value  # larger than the whole cache, don't flush everything else for it
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes and self._entries:
+            _key, (_value, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+pattern_cache = PatternCache()
@@ -0,0 +1,164 @@
+"""
+Batch geometry over many rectangles or points at once.
+
+Merging the matches of a multi-segment entity, covering previous matches or
+bounding a drawing path used to grow one `Region` per element.  `RegionSet`
+and `PointSet` keep the coordinates in NumPy arrays and answer union,
+intersection, clipping, nearby-expansion and point-in-rect queries with
+vectorized operations.  Without NumPy (e.g. under Jython) they fall back to
+plain `Rect` arithmetic with the same results.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+from .geometry import Point, Rect, as_point, as_rect
+
+
+class RegionSet:
+    """Immutable sequence of rectangles, stored as an (n, 4) array of x, y, w, h."""
+
+    __slots__ = ("_rects",)
+
+    def __init__(self, rects: Iterable[Any] = ()) -> None:
+        items = [r if type(r) is Rect else as_rect(r) for r in rects]
+        self._rects = np.array(items, dtype=np.int64).reshape(-1, 4) if np is not None else items
+
+    @classmethod
+    def _of(cls, rects: Any) -> "RegionSet":
+        instance = cls.__new__(cls)
+        instance._rects = rects
+        return instance
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __iter__(self) -> Iterator[Rect]:
+        for i in range(len(self._rects)):
+            yield self[i]
+
+    def __getitem__(self, index: int) -> Rect:
+        if np is None:
+            return self._rects[index]
+        return Rect(*(int(v) for v in self._rects[index]))
+
+    def __repr__(self) -> str:
+        return f"RegionSet({list(self)!r})"
+
+    def union(self) -> Rect | None:
+        """Smallest rect covering all rects, None for an empty set."""
+        if not len(self._rects):
+            return None
+        if np is None:
+            return Rect.bounding(self._rects)
+        a = self._rects
+        left, top = a[:, 0].min(), a[:, 1].min()
+        right, bottom = (a[:, 0] + a[:, 2]).max(), (a[:, 1] + a[:, 3]).max()
+        return Rect(int(left), int(top), int(right - left), int(bottom - top))
+
+    def intersection(self) -> Rect | None:
+        """Area shared by all rects, None when they don't overlap or the set is empty."""
+        if not len(self._rects):
+            return None
+        if np is None:
+            shared = self._rects[0]
+            for rect in self._rects[1:]:
+                shared = shared.intersection(rect)
+                if shared is None:
+                    return None
+            return shared
+        a = self._rects
+        left, top = a[:, 0].max(), a[:, 1].max()
+        right, bottom = (a[:, 0] + a[:, 2]).min(), (a[:, 1] + a[:, 3]).min()
+        if right < left or bottom < top:
+            return None
+        return Rect(int(left), int(top), int(right - left), int(bottom - top))
+
+    def clip(self, parent: Any) -> "RegionSet":
+        """Every rect limited to parent, rects outside of it are dropped."""
+        px, py, pw, ph = parent = as_rect(parent)
+        if np is None:
+            clipped = (rect.intersection(parent) for rect in self._rects)
+            return self._of([rect for rect in clipped if rect is not None])
+        a = self._rects
+        left = np.maximum(a[:, 0], px)
+        top = np.maximum(a[:, 1], py)
+        right = np.minimum(a[:, 0] + a[:, 2], px + pw)
+        bottom = np.minimum(a[:, 1] + a[:, 3], py + ph)
+        inside = (right >= left) & (bottom >= top)
+        return self._of(np.stack((left, top, right - left, bottom - top), axis=1)[inside])
+
+    def nearby(self, pad: int = 50) -> "RegionSet":
+        """Every rect grown by pad on each side, like `Region.nearby`."""
+        pad = int(pad)
+        if np is None:
+            return self._of([rect.grow(pad) for rect in self._rects])
+        return self._of(self._rects + np.array((-pad, -pad, 2 * pad, 2 * pad), dtype=np.int64))
+
+    def contains(self, points: "PointSet | Iterable[Any]") -> Any:
+        """Boolean matrix [point, rect] of which rect holds which point (nested lists without NumPy)."""
+        if not isinstance(points, PointSet):
+            points = PointSet(points)
+        if np is None:
+            return [[rect.contains(x, y) for rect in self._rects] for x, y in points]
+        a = self._rects
+        x = points._points[:, 0, None]
+        y = points._points[:, 1, None]
+        return (x >= a[:, 0]) & (x < a[:, 0] + a[:, 2]) & (y >= a[:, 1]) & (y < a[:, 1] + a[:, 3])
+
+    def containing(self, x: float, y: float) -> list[int]:
+        """Indexes of the rects holding the point (x, y)."""
+        if np is None:
+            return [i for i, rect in enumerate(self._rects) if rect.contains(x, y)]
+        return [int(i) for i in np.flatnonzero(self.contains([(x, y)])[0])]
+
+
+class PointSet:
+    """Immutable sequence of points, stored as an (n, 2) float array so sub-pixel paths survive."""
+
+    __slots__ = ("_points",)
+
+    def __init__(self, points: Iterable[Any] = ()) -> None:
+        items = [p if type(p) in (tuple, list, Point) and len(p) == 2 else as_point(p) for p in points]
+        if np is not None:
+            self._points = np.array(items, dtype=np.float64).reshape(-1, 2)
+        else:
+            self._points = [(p[0], p[1]) for p in items]
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        if np is None:
+            return iter(self._points)
+        return (tuple(p) for p in self._points.tolist())
+
+    def bounds(self) -> Rect | None:
+        """
+        Rect with the extreme points on its corners, at least 1x1 (a path's `Region.add` union).
+        None for an empty set.
+        """
+        if not len(self._points):
+            return None
+        if np is None:
+            xs = [p[0] for p in self._points]
+            ys = [p[1] for p in self._points]
+            left, top, right, bottom = min(xs), min(ys), max(xs), max(ys)
+        else:
+            left, top = self._points.min(axis=0)
+            right, bottom = self._points.max(axis=0)
+        left, top = int(left), int(top)
+        return Rect(left, top, max(1, int(right) - left), max(1, int(bottom) - top))
+
+    def within(self, rect: Any) -> Any:
+        """Boolean mask of the points inside rect (a list without NumPy)."""
+        rect = as_rect(rect)
+        if np is None:
+            return [rect.contains(x, y) for x, y in self._points]
+        return RegionSet([rect]).contains(self)[:, 0]
@@ -0,0 +1,425 @@
+"""
+Pool of pre-spawned sikuligo servers shared by framework processes.
+
+`Screen.auto()` spawns a sikuligo server when none is running, which costs
+seconds for every short Robot Framework suite or `run.py` target.  A pool
+manager keeps servers warm instead and `Screen.auto()` / `Screen.connect()`
+attach to an idle one:
+
+    python -m adapters.server_pool start --size 2 --idle-timeout 1800
+    python -m adapters.server_pool status
+    python -m adapters.server_pool stop
+
+Servers are discovered through a directory (``SIKULI_FRAMEWORK_POOL_DIR``,
+by default ``<tmp>/sikuli-framework-pool-<uid>``) holding a ``<port>.json``
+record and a ``<port>.lock`` file per server.  A process using a server holds
+an exclusive lock on its lock file while its screen is open.  The lock goes
+away with the process, crashed or not, so a lock that can be taken means an
+idle server.  The lock file's mtime is when the server was last used.
+Servers whose process died or that stopped accepting connections are
+evicted when found.  ``SIKULI_FRAMEWORK_POOL=0`` turns the pool off.
+
+The running manager holds a lock on ``manager.pid`` in the same directory,
+``stop`` asks it to end.  Stopping the pool stops idle servers right away.
+Busy servers lose their record, so nobody else leases them, and are stopped
+by their last user when it releases them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - the pool needs POSIX file locks
+    fcntl = None
+
+from .types import BackendError
+
+DEFAULT_SIZE = 2
+HEALTH_TIMEOUT = 0.2  # seconds to accept a connection
+STARTUP_TIMEOUT = 10.0
+MAINTAIN_INTERVAL = 5.0
+MANAGER_FILE = "manager.pid"
+
+
+def enabled() -> bool:
+    return fcntl is not None and os.environ.get("SIKULI_FRAMEWORK_POOL", "1").strip() != "0"
+
+
+def default_directory() -> str:
+    configured = os.environ.get("SIKULI_FRAMEWORK_POOL_DIR", "").strip()
+    if configured:
+        return configured
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"sikuli-framework-pool-{user}")
+
+
+def default_binary() -> str | None:
+    configured = os.environ.get("SIKULIGO_BINARY_PATH", "").strip()
+    return configured or shutil.which("sikuligo")
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _reap(pid: int, timeout: float = 2.0) -> None:
+    # Servers spawned by this process stay zombies (and look alive) until waited for
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0] or time.monotonic() > deadline:
+                return
+        except ChildProcessError:
+            return  # not our child
+        time.sleep(0.02)
+
+
+def _accepts(address: str, timeout: float) -> bool:
+    host, port = address.rsplit(":", 1)
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _try_lock(path: str) -> int | None:
+    """File descriptor holding the exclusive lock of path, None when another process holds it."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _unlock(fd: int) -> None:
+    try:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+class Lease:
+    """A pooled server used by this process until `release()` (or until the process exits)."""
+
+    def __init__(self, pool: "ServerPool", record: dict[str, Any], lock_path: str, fd: int) -> None:
+        self.pool = pool
+        self.record = record
+        self.address = record["address"]
+        self._lock_path = lock_path
+        self._fd: int | None = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            if self.pool.retired(self.record):
+                self.pool.stop(self.record)  # the pool was stopped while we used the server
+            else:
+                os.utime(self._lock_path)  # last used
+        except OSError:
+            pass
+        finally:
+            _unlock(fd)
+
+    def __enter__(self) -> "Lease":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"Lease({self.address})"
+
+
+class ServerPool:
+    """The pool directory: spawns, finds, leases and evicts servers."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        binary_path: str | None = None,
+        health_timeout: float = HEALTH_TIMEOUT,
+        startup_timeout: float = STARTUP_TIMEOUT,
+    ) -> None:
+        self.directory = directory or default_directory()
+        self.binary_path = binary_path or default_binary()
+        self.health_timeout = float(health_timeout)
+        self.startup_timeout = float(startup_timeout)
+
+    def _path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.directory, name + suffix)
+
+    def records(self) -> list[dict[str, Any]]:
+        records = []
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            try:
+                with open(path) as handle:
+                    records.append(json.load(handle))
+            except (OSError, ValueError):
+                continue  # being written or removed
+        return records
+
+    def healthy(self, record: dict[str, Any]) -> bool:
+        return _pid_alive(int(record["pid"])) and _accepts(record["address"], self.health_timeout)
+
+    def last_used(self, record: dict[str, Any]) -> float:
+        try:
+            return os.path.getmtime(self._path(record["name"], ".lock"))
+        except OSError:
+            return float(record.get("started", 0))
+
+    def lease(self) -> Lease | None:
+        """Take the idle server used longest ago, None when none is idle."""
+        if fcntl is None or not os.path.isdir(self.directory):
+            return None
+        for record in sorted(self.records(), key=self.last_used):
+            lock_path = self._path(record["name"], ".lock")
+            fd = _try_lock(lock_path)
+            if fd is None:
+                continue  # in use
+            if not self.healthy(record):
+                self._remove(record)
+                _unlock(fd)
+                continue
+            os.utime(lock_path)
+            return Lease(self, record, lock_path, fd)
+        return None
+
+    def spawn(self) -> dict[str, Any]:
+        """Start one more server and add it to the pool."""
+        if not self.binary_path:
+            raise BackendError("No sikuligo binary to spawn, set SIKULIGO_BINARY_PATH")
+        os.makedirs(self.directory, exist_ok=True)
+        port = _free_port()
+        name = str(port)
+        address = f"127.0.0.1:{port}"
+        process = subprocess.Popen(
+            [
+                self.binary_path,
+                "-listen",
+                address,
+                "-admin-listen",
+                "",
+                "-enable-reflection=false",
+                "-sqlite-path",
+                self._path(name, ".db"),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,  # outlives the manager's terminal
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while not _accepts(address, self.health_timeout):
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                process.wait()
+                raise BackendError(f"sikuligo server on {address} did not start")
+            time.sleep(0.05)
+
+        record = {"name": name, "address": address, "pid": process.pid, "started": time.time()}
+        open(self._path(name, ".lock"), "a").close()
+        temp = self._path(name, ".json.tmp")
+        with open(temp, "w") as handle:
+            json.dump(record, handle)
+        os.replace(temp, self._path(name, ".json"))  # never seen half written
+        return record
+
+    def _remove(self, record: dict[str, Any]) -> None:
+        for suffix in (".json", ".db", ".lock"):
+            try:
+                os.remove(self._path(record["name"], suffix))
+            except OSError:
+                pass
+
+    def stop(self, record: dict[str, Any]) -> None:
+        pid = int(record["pid"])
+        if _pid_alive(pid):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+            _reap(pid)
+        self._remove(record)
+
+    def maintain(self, size: int) -> dict[str, int]:
+        """Evict dead servers and spawn new ones until `size` are running."""
+        evicted = 0
+        running = 0
+        for record in self.records():
+            lock_path = self._path(record["name"], ".lock")
+            fd = _try_lock(lock_path) if fcntl is not None else None
+            if fd is None:
+                running += 1  # in use, its client would notice a dead server
+                continue
+            try:
+                if self.healthy(record):
+                    running += 1
+                else:
+                    self.stop(record)
+                    evicted += 1
+            finally:
+                _unlock(fd)
+        started = 0
+        while running + started < size:
+            self.spawn()
+            started += 1
+        return {"running": running + started, "started": started, "evicted": evicted}
+
+    def idle_for(self) -> float | None:
+        """Seconds since any server was last used, None while one is in use."""
+        newest = 0.0
+        for record in self.records():
+            fd = _try_lock(self._path(record["name"], ".lock"))
+            if fd is None:
+                return None
+            _unlock(fd)
+            newest = max(newest, self.last_used(record))
+        return time.time() - newest if newest else 0.0
+
+    def retired(self, record: dict[str, Any]) -> bool:
+        """Was the server taken out of the pool while in use, see stop_all()?"""
+        return not os.path.exists(self._path(record["name"], ".json"))
+
+    def stop_all(self) -> int:
+        """Stop the idle servers, retire the busy ones: they are stopped when their lease is released."""
+        records = self.records()
+        for record in records:
+            lock_path = self._path(record["name"], ".lock")
+            fd = _try_lock(lock_path) if fcntl is not None else None
+            if fd is None and fcntl is not None:
+                try:
+                    os.remove(self._path(record["name"], ".json"))
+                except OSError:
+                    pass
+                fd = _try_lock(lock_path)  # released meanwhile, before it could see it was retired
+                if fd is None:
+                    continue
+            try:
+                self.stop(record)
+            finally:
+                if fd is not None:
+                    _unlock(fd)
+        return len(records)
+
+    def manager_pid(self) -> int | None:
+        """Pid of the manager running this pool, None when there is none."""
+        path = os.path.join(self.directory, MANAGER_FILE)
+        if fcntl is None or not os.path.exists(path):
+            return None
+        fd = _try_lock(path)
+        if fd is not None:
+            _unlock(fd)  # left behind by a manager that was killed
+            return None
+        try:
+            with open(path) as handle:
+                return int(handle.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def shutdown(self, timeout: float = STARTUP_TIMEOUT) -> int:
+        """Stop the pool: ask its manager to and wait for it, or stop the servers when no manager runs."""
+        pid = self.manager_pid()
+        if pid is None:
+            return self.stop_all()
+        count = len(self.records())
+        os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while self.manager_pid() == pid:
+            if time.monotonic() > deadline:
+                raise BackendError(f"pool manager {pid} did not stop")
+            time.sleep(0.05)
+        return count
+
+    def run(self, size: int, idle_timeout: float | None = None, interval: float = MAINTAIN_INTERVAL) -> None:
+        """Keep `size` servers warm until stopped, or until none was used for `idle_timeout` seconds."""
+        os.makedirs(self.directory, exist_ok=True)
+        manager_path = os.path.join(self.directory, MANAGER_FILE)
+        manager = _try_lock(manager_path)
+        if manager is None:
+            raise BackendError(f"a pool manager is already running for {self.directory}")
+        os.ftruncate(manager, 0)
+        os.write(manager, str(os.getpid()).encode("ascii"))
+
+        def _terminate(*_args: Any) -> None:
+            raise SystemExit(0)
+
+        previous = signal.signal(signal.SIGTERM, _terminate)
+        try:
+            while True:
+                self.maintain(size)
+                idle = self.idle_for()
+                if idle_timeout and idle is not None and idle > idle_timeout:
+                    return
+                time.sleep(interval)
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            self.stop_all()
+            os.remove(manager_path)
+            _unlock(manager)
+
+
+def lease() -> Lease | None:
+    """Idle server of the default pool, None when the pool is off or has no idle server."""
+    if not enabled():
+        return None
+    return ServerPool().lease()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="server_pool", description="Keep warm sikuligo servers for framework processes")
+    parser.add_argument("command", choices=("start", "status", "stop"))
+    parser.add_argument("--directory", help="pool directory, defaults to $SIKULI_FRAMEWORK_POOL_DIR or %s" % default_directory())
+    parser.add_argument("--binary", help="sikuligo binary, defaults to $SIKULIGO_BINARY_PATH or sikuligo on the PATH")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="servers kept running")
+    parser.add_argument("--idle-timeout", type=float, default=None, help="stop the pool when unused for this many seconds")
+    args = parser.parse_args(argv)
+
+    pool = ServerPool(args.directory, args.binary)
+    if args.command == "start":
+        pool.run(args.size, args.idle_timeout)
+        return 0
+    if args.command == "stop":
+        print("stopped %d servers" % pool.shutdown())
+        return 0
+
+    for record in pool.records():
+        fd = _try_lock(pool._path(record["name"], ".lock"))
+        state = "busy" if fd is None else ("idle" if pool.healthy(record) else "dead")
+        if fd is not None:
+            _unlock(fd)
+        print("%-21s pid=%-7d %s" % (record["address"], record["pid"], state))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
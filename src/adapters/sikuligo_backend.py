@@ -7,12 +7,13 @@ framework migration (`Screen`, `Region`, `Pattern`, `Location`).
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 import os
-import shutil
-import subprocess
-import sys
 import tempfile
+import threading
+import time
 from typing import Any, Iterable
 
 try:
@@ -29,7 +30,28 @@ try:
 except ImportError:  # pragma: no cover - optional runtime dependency
     pb = None
 
-from .types import BackendError, BackendMatch
+from . import capture, server_pool
+from .frame import Frame
+from .frame_buffer import FrameBuffer
+from .geometry import EMPTY, Point, Rect, as_point, as_rect
+from .input_batch import InputBatch, InputEvent
+from .match_cache import frame_digest, match_cache, pattern_key
+from .pattern_cache import PatternCache, pattern_cache
+from .region_set import RegionSet
+from .types import BackendError, BackendMatch, MatchNotFound
+
+SCAN_INTERVAL = 0.1  # seconds between captures while waiting for patterns on captured frames
+
+
+def _async_of(name: str):
+    """Awaitable counterpart of a blocking method, run on a worker thread (looked up by name so overrides apply)."""
+
+    async def method(self, *args, **kwargs):
+        return await asyncio.to_thread(getattr(self, name), *args, **kwargs)
+
+    method.__name__ = method.__qualname__ = f"{name}_async"
+    method.__doc__ = f"Awaitable `{name}`, runs on a worker thread so the event loop keeps going."
+    return method
 
 
 def _require_runtime() -> None:
@@ -102,61 +124,28 @@ def _normalize_key(value: Any) -> str:
     return lowered
 
 
-def _capture_to_png(path: str, bounds: tuple[int, int, int, int] | None) -> None:
-    if sys.platform == "darwin":
-        cmd = ["screencapture", "-x"]
-        if bounds is not None:
-            x, y, w, h = bounds
-            if w > 0 and h > 0:
-                cmd.append(f"-R{x},{y},{w},{h}")
-        cmd.append(path)
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return
-
-    import_cmd = shutil.which("import")
-    if import_cmd:
-        cmd = [import_cmd, "-window", "root"]
-        if bounds is not None:
-            x, y, w, h = bounds
-            if w > 0 and h > 0:
-                cmd.extend(["-crop", f"{w}x{h}+{x}+{y}"])
-        cmd.append(path)
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return
-
-    scrot_cmd = shutil.which("scrot")
-    if scrot_cmd:
-        cmd = [scrot_cmd]
-        if bounds is not None:
-            x, y, w, h = bounds
-            if w > 0 and h > 0:
-                cmd.extend(["-a", f"{x},{y},{w},{h}"])
-        cmd.append(path)
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return
-
-    raise BackendError("screen capture backend unavailable for this runtime")
-
-
-def _coerce_point(value: Any) -> tuple[int, int]:
-    if isinstance(value, Location):
-        return int(value.x), int(value.y)
-    if isinstance(value, tuple) and len(value) == 2:
-        return int(value[0]), int(value[1])
-    if isinstance(value, list) and len(value) == 2:
-        return int(value[0]), int(value[1])
-    if hasattr(value, "getX") and hasattr(value, "getY"):
-        return int(value.getX()), int(value.getY())
-    if hasattr(value, "x") and hasattr(value, "y"):
-        return int(value.x), int(value.y)
-    if hasattr(value, "target_x") and hasattr(value, "target_y"):
-        return int(value.target_x), int(value.target_y)
-    if hasattr(value, "getClickLocation"):
-        return _coerce_point(value.getClickLocation())
-    raise BackendError(f"Unable to coerce point from {type(value).__name__}")
+def _usable_bounds(bounds: tuple[int, int, int, int] | None) -> tuple[int, int, int, int] | None:
+    if bounds is None or bounds[2] <= 0 or bounds[3] <= 0:
+        return None
+    return bounds
 
 
-@dataclass
+def _capture_frame(bounds: tuple[int, int, int, int] | None) -> Frame:
+    return capture.grab(_usable_bounds(bounds))
+
+
+def _gray_image(pb_mod: Any, name: str, frame: Frame) -> Any:
+    gray = frame.gray()
+    return pb_mod.GrayImage(name=name, width=gray.width, height=gray.height, pix=gray.pixels)
+
+
+def _coerce_point(value: Any) -> Point:
+    if type(value) is Location:
+        return Point(int(value.x), int(value.y))
+    return as_point(value)
+
+
+@dataclass(slots=True)
 class Location:
     x: int
     y: int
@@ -177,22 +166,53 @@ class Location:
 @dataclass
 class Pattern:
     _raw: Any
+    image: Any = None
+    similarity: float | None = None
+    offset: tuple[int, int] = (0, 0)
+    factor: float = 1.0
+    _frame: Frame | None = field(default=None, repr=False, compare=False)
+    # (path, mtime, size) of a baseline file, the raw pattern then comes from the pattern cache
+    _file_key: tuple[str, int, int] | None = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_image(cls, image: str | bytes | bytearray | memoryview) -> "Pattern":
+        cls._check_runtime()
+        if isinstance(image, str):
+            file_key = PatternCache.file_key(image)
+            if file_key is not None and pattern_cache.max_bytes > 0:
+                return cls(None, image=image, _file_key=file_key)
+        return cls(cls._new_raw(image), image=image)
+
+    @classmethod
+    def _check_runtime(cls) -> None:
         _require_runtime()
-        return cls(SikuligoPattern(image))
+
+    @classmethod
+    def _new_raw(cls, image: Any) -> Any:
+        return SikuligoPattern(image)
 
     def similar(self, similarity: float) -> "Pattern":
-        self._raw = self._raw.similar(similarity)
+        self.similarity = float(similarity)
+        if self._file_key is not None:
+            self._raw = None
+        else:
+            self._raw = self._raw.similar(similarity)
         return self
 
     def exact(self) -> "Pattern":
-        self._raw = self._raw.exact()
+        self.similarity = 1.0
+        if self._file_key is not None:
+            self._raw = None
+        else:
+            self._raw = self._raw.exact()
         return self
 
     def target_offset(self, dx: int, dy: int) -> "Pattern":
-        self._raw = self._raw.target_offset(dx, dy)
+        self.offset = (int(dx), int(dy))
+        if self._file_key is not None:
+            self._raw = None
+        else:
+            self._raw = self._raw.target_offset(dx, dy)
         return self
 
     # Legacy alias
@@ -200,59 +220,141 @@ class Pattern:
         return self.target_offset(dx, dy)
 
     def resize(self, factor: float) -> "Pattern":
-        self._raw = self._raw.resize(factor)
+        self.factor = float(factor)
+        self._frame = None
+        if self._file_key is not None:
+            self._raw = None
+        else:
+            self._raw = self._raw.resize(factor)
         return self
 
     @property
     def raw(self) -> Any:
+        if self._raw is None and self._file_key is not None:
+            # Raw patterns are backend objects, backends sharing the cache must not see each other's
+            key = self._file_key + ("raw", self.__class__.__module__, self.similarity, self.offset, self.factor)
+            self._raw = pattern_cache.get(
+                key,
+                self._build_raw,
+                PatternCache.estimate_bytes(self._file_key[0], self._file_key[2]),
+            )
         return self._raw
 
+    def _build_raw(self) -> Any:
+        raw = self._new_raw(self.image)
+        if self.similarity is not None:
+            raw = raw.exact() if self.similarity == 1.0 else raw.similar(self.similarity)
+        if self.offset != (0, 0):
+            raw = raw.target_offset(*self.offset)
+        if self.factor != 1.0:
+            raw = raw.resize(self.factor)
+        return raw
+
+    def gray(self) -> Frame:
+        """Decoded gray pixels of the pattern image, resized by the pattern factor."""
+        if self._frame is None:
+            if self._file_key is not None:
+                key = self._file_key + ("gray", self.factor)
+                self._frame = pattern_cache.get(key, self._decode_gray, lambda frame: len(frame.pixels))
+            else:
+                self._frame = self._decode_gray()
+        return self._frame
+
+    def _decode_gray(self) -> Frame:
+        if isinstance(self.image, str):
+            frame = Frame.from_file(self.image)
+        elif self.image is not None:
+            frame = Frame.from_image(bytes(self.image))
+        else:
+            raise BackendError("pattern has no image to decode")
+        frame = frame.gray()
+        if self.factor != 1.0:
+            frame = _resize_nearest(frame, self.factor)
+        return frame
+
     def __str__(self) -> str:
-        return str(self._raw)
+        return str(self.raw)
+
+
+def _resize_nearest(frame: Frame, factor: float) -> Frame:
+    width = max(1, int(round(frame.width * factor)))
+    height = max(1, int(round(frame.height * factor)))
+    columns = [min(frame.width - 1, int(x / factor)) for x in range(width)]
+    rows = []
+    for y in range(height):
+        source = min(frame.height - 1, int(y / factor)) * frame.width
+        line = frame.pixels[source:source + frame.width]
+        rows.append(bytes(line[x] for x in columns))
+    return Frame(width, height, b"".join(rows), channels=1)
 
 
 class Region:
+    __slots__ = ("_raw", "_screen", "_bounds", "_click_offset", "score", "index", "target_x", "target_y")
+
+    # Pattern and Region classes created by this backend, replaced by backends reusing these wrappers
+    _pattern_type = Pattern
+    _region_type: type = None  # set below
+
     def __init__(
         self,
-        raw_region: Any,
-        *,
+        raw_region: Any = None,
+        *args: int,
         screen: "Screen | None" = None,
         bounds: tuple[int, int, int, int] | None = None,
         score: float = 0.0,
         index: int = 0,
         target: tuple[int, int] | None = None,
     ) -> None:
+        # Sikuli style construction used by the transforms: Region(x, y, w, h), Region(region) and
+        # Region([regions]) covering all of them
+        if args:
+            bounds = as_rect((raw_region, *args))
+            raw_region = None
+        elif isinstance(raw_region, Region):
+            screen = screen or raw_region._screen
+            bounds = raw_region._bounds if bounds is None else bounds
+            raw_region = raw_region._raw
+        elif isinstance(raw_region, list):
+            regions = raw_region
+            if not regions:
+                raise BackendError("no regions to cover")
+            first = next((r for r in regions if isinstance(r, Region)), None)
+            screen = screen or (first._screen if first is not None else None)
+            if bounds is None and not any(isinstance(r, Region) and r._bounds is None for r in regions):
+                bounds = RegionSet([Region._coerce_bounds(r) for r in regions]).union()
+            raw_region = first._raw if first is not None else None
         self._raw = raw_region
         self._screen = screen
-        self._bounds = tuple(int(v) for v in bounds) if bounds is not None else None
+        if bounds is not None and type(bounds) is not Rect:
+            bounds = as_rect(bounds)
+        self._bounds = bounds
         self._click_offset = (0, 0)
         self.score = float(score)
         self.index = int(index)
-        if target is None and self._bounds is not None:
-            x, y, w, h = self._bounds
-            target = (x + (w // 2), y + (h // 2))
-        self.target_x = int(target[0]) if target else 0
-        self.target_y = int(target[1]) if target else 0
+        if target is not None:
+            self.target_x = int(target[0])
+            self.target_y = int(target[1])
+        elif bounds is not None:
+            x, y, w, h = bounds
+            self.target_x = x + (w // 2)
+            self.target_y = y + (h // 2)
+        else:
+            self.target_x = 0
+            self.target_y = 0
 
-    @staticmethod
-    def _coerce_pattern(pattern: Pattern | str | bytes | bytearray | memoryview) -> Pattern:
+    @classmethod
+    def _coerce_pattern(cls, pattern: Pattern | str | bytes | bytearray | memoryview) -> Pattern:
         if isinstance(pattern, Pattern):
             return pattern
-        return Pattern.from_image(pattern)
+        return cls._pattern_type.from_image(pattern)
 
     @staticmethod
-    def _coerce_bounds(value: Any) -> tuple[int, int, int, int]:
+    def _coerce_bounds(value: Any) -> Rect:
+        if type(value) is Rect:
+            return value
         if isinstance(value, Region):
-            return value.getX(), value.getY(), value.getW(), value.getH()
-        if isinstance(value, tuple) and len(value) == 4:
-            return int(value[0]), int(value[1]), int(value[2]), int(value[3])
-        if isinstance(value, list) and len(value) == 4:
-            return int(value[0]), int(value[1]), int(value[2]), int(value[3])
-        if all(hasattr(value, k) for k in ("x", "y", "w", "h")):
-            return int(value.x), int(value.y), int(value.w), int(value.h)
-        if all(hasattr(value, k) for k in ("getX", "getY", "getW", "getH")):
-            return int(value.getX()), int(value.getY()), int(value.getW()), int(value.getH())
-        raise BackendError(f"Unable to coerce region bounds from {type(value).__name__}")
+            return value._bounds if value._bounds is not None else EMPTY
+        return as_rect(value)
 
     @classmethod
     def from_match(cls, raw_match: Any, *, raw_region: Any, screen: "Screen | None") -> "Region":
@@ -262,38 +364,30 @@ class Region:
         index = int(getattr(raw_match, "index", 0))
         return cls(raw_region, screen=screen, bounds=rect, score=score, index=index, target=target)
 
-    def _wrap_scope(self, raw_scope: Any, bounds: tuple[int, int, int, int] | None) -> "Region":
-        return Region(raw_scope, screen=self._screen, bounds=bounds)
+    def _wrap_scope(self, raw_scope: Any, bounds: Rect | None) -> "Region":
+        return self._region_type(raw_scope, screen=self._screen, bounds=bounds)
 
     def _point_union(self, x: int, y: int) -> "Region":
-        x1, y1, w, h = self._bounds or (x, y, 1, 1)
-        x2 = x1 + w
-        y2 = y1 + h
-        min_x = min(x1, x)
-        min_y = min(y1, y)
-        max_x = max(x2, x)
-        max_y = max(y2, y)
-        return self._wrap_scope(self._raw, (min_x, min_y, max_x - min_x, max_y - min_y))
+        bounds = self._bounds or Rect(x, y, 1, 1)
+        return self._wrap_scope(self._raw, bounds.union_point(x, y))
 
     def getX(self) -> int:
-        return int(self._bounds[0]) if self._bounds is not None else 0
+        return self._bounds.x if self._bounds is not None else 0
 
     def getY(self) -> int:
-        return int(self._bounds[1]) if self._bounds is not None else 0
+        return self._bounds.y if self._bounds is not None else 0
 
     def getW(self) -> int:
-        return int(self._bounds[2]) if self._bounds is not None else 0
+        return self._bounds.w if self._bounds is not None else 0
 
     def getH(self) -> int:
-        return int(self._bounds[3]) if self._bounds is not None else 0
+        return self._bounds.h if self._bounds is not None else 0
 
     def setX(self, value: int) -> None:
-        x, y, w, h = self._bounds or (0, 0, 0, 0)
-        self._bounds = (int(value), y, w, h)
+        self._bounds = (self._bounds or EMPTY)._replace(x=int(value))
 
     def setY(self, value: int) -> None:
-        x, y, w, h = self._bounds or (0, 0, 0, 0)
-        self._bounds = (x, int(value), w, h)
+        self._bounds = (self._bounds or EMPTY)._replace(y=int(value))
 
     def setClickOffset(self, offset: Location) -> None:
         self._click_offset = (int(offset.getX()), int(offset.getY()))
@@ -302,21 +396,17 @@ class Region:
         return Location(self._click_offset[0], self._click_offset[1])
 
     def getClickLocation(self) -> Location:
-        x = self.getX() + (self.getW() // 2) + self._click_offset[0]
-        y = self.getY() + (self.getH() // 2) + self._click_offset[1]
-        return Location(x, y)
+        x, y = (self._bounds or EMPTY).center
+        return Location(x + self._click_offset[0], y + self._click_offset[1])
 
     def add(self, operand: Any) -> "Region":
         if self._bounds is None:
             return self
+        kind = type(operand)
+        if kind is Location or kind is Point:
+            return self._point_union(int(operand.x), int(operand.y))
         try:
-            ox, oy, ow, oh = self._coerce_bounds(operand)
-            x1, y1, w1, h1 = self._bounds
-            min_x = min(x1, ox)
-            min_y = min(y1, oy)
-            max_x = max(x1 + w1, ox + ow)
-            max_y = max(y1 + h1, oy + oh)
-            return self._wrap_scope(self._raw, (min_x, min_y, max_x - min_x, max_y - min_y))
+            return self._wrap_scope(self._raw, self._bounds.union(self._coerce_bounds(operand)))
         except BackendError:
             px, py = _coerce_point(operand)
             return self._point_union(px, py)
@@ -324,84 +414,223 @@ class Region:
     def limit(self, operand: Any) -> "Region":
         if self._bounds is None:
             return self
-        x1, y1, w1, h1 = self._bounds
-        x2, y2, w2, h2 = self._coerce_bounds(operand)
-        left = max(x1, x2)
-        top = max(y1, y2)
-        right = min(x1 + w1, x2 + w2)
-        bottom = min(y1 + h1, y2 + h2)
-        if right < left or bottom < top:
+        bounds = self._bounds.intersection(self._coerce_bounds(operand))
+        if bounds is None:
             raise BackendError("Region is outside parent bounds")
-        return self._wrap_scope(self._raw, (left, top, right - left, bottom - top))
+        return self._wrap_scope(self._raw, bounds)
+
+    def scoped(self, operand: Any) -> "Region":
+        """
+        Region searching only the part of this one inside `operand`.  Unlike limit(), which narrows the bounds
+        but keeps searching the whole of this region, searches of the result only look there.  The whole screen
+        (no bounds) is clipped at the origin, the backend clips the rest.
+        """
+        window = self._coerce_bounds(operand)
+        if self._bounds is not None:
+            bounds = self._bounds.intersection(window)
+        else:
+            bounds = window.intersection(Rect(0, 0, max(0, window.right), max(0, window.bottom)))
+        if bounds is None or bounds.w <= 0 or bounds.h <= 0:
+            raise BackendError("Region is outside parent bounds")
+        if self._screen is None:
+            return self._wrap_scope(self._raw, bounds)
+        return self._screen.region(*bounds)
 
     def nearby(self, value: int | None = None) -> "Region":
         if self._bounds is None:
             return self
         pad = int(value) if value is not None else 50
-        x, y, w, h = self._bounds
-        return self._wrap_scope(self._raw, (x - pad, y - pad, w + (2 * pad), h + (2 * pad)))
+        return self._wrap_scope(self._raw, self._bounds.grow(pad))
 
     def above(self, value: int | None = None) -> "Region":
         if self._bounds is None:
             return self
-        x, y, w, _ = self._bounds
-        h = int(value) if value is not None else max(1, self.getH())
-        return self._wrap_scope(self._raw, (x, y - h, w, h))
+        h = int(value) if value is not None else max(1, self._bounds.h)
+        return self._wrap_scope(self._raw, self._bounds.above(h))
 
     def below(self, value: int | None = None) -> "Region":
         if self._bounds is None:
             return self
-        x, y, w, h0 = self._bounds
-        h = int(value) if value is not None else max(1, h0)
-        return self._wrap_scope(self._raw, (x, y + h0, w, h))
+        h = int(value) if value is not None else max(1, self._bounds.h)
+        return self._wrap_scope(self._raw, self._bounds.below(h))
 
     def right(self, value: int | None = None) -> "Region":
         if self._bounds is None:
             return self
-        x, y, w0, h = self._bounds
-        w = int(value) if value is not None else max(1, w0)
-        return self._wrap_scope(self._raw, (x + w0, y, w, h))
+        w = int(value) if value is not None else max(1, self._bounds.w)
+        return self._wrap_scope(self._raw, self._bounds.right_of(w))
 
     def left(self, value: int | None = None) -> "Region":
         if self._bounds is None:
             return self
-        x, y, w0, h = self._bounds
-        w = int(value) if value is not None else max(1, w0)
-        return self._wrap_scope(self._raw, (x - w, y, w, h))
+        w = int(value) if value is not None else max(1, self._bounds.w)
+        return self._wrap_scope(self._raw, self._bounds.left_of(w))
 
-    def find(self, pattern: Pattern | str | bytes | bytearray | memoryview, timeout_millis: int | None = None) -> "Region":
+    def find(
+        self,
+        pattern: Pattern | str | bytes | bytearray | memoryview,
+        timeout_millis: int | None = None,
+        frame: Frame | None = None,
+    ) -> "Region":
         resolved = self._coerce_pattern(pattern)
+        if frame is not None:
+            return self._find_in_frame_cached(resolved, frame)
+        self._sync_input()
         try:
             match = self._raw.find(resolved.raw, timeout_millis=timeout_millis)
-            return Region.from_match(match, raw_region=self._raw, screen=self._screen)
+            return self._region_type.from_match(match, raw_region=self._raw, screen=self._screen)
         except Exception as exc:  # pragma: no cover - backend proxy
             raise _to_backend_error(exc) from exc
 
+    def _sync_input(self) -> None:
+        # Input queued by Screen.batch() goes out before searching a screen that should show it
+        flush = getattr(self._screen, "_flush_input", None)
+        if flush is not None:
+            flush()
+
+    def _find_in_frame_cached(self, pattern: Pattern, frame: Frame) -> "Region":
+        """`_find_in_frame`, answered from the match cache when the searched pixels were searched before."""
+        if not match_cache.enabled:
+            return self._find_in_frame(pattern, frame)
+
+        source = frame.crop(self._bounds)
+        key = (pattern_key(pattern), self._bounds)
+        digest = frame_digest(source)
+        found, result = match_cache.lookup(key, digest)
+        if not found:
+            try:
+                region = self._find_in_frame(pattern, source)
+            except MatchNotFound:
+                match_cache.store(key, digest, None)
+                raise
+            result = (region._bounds, region.score, (region.target_x, region.target_y))
+            match_cache.store(key, digest, result)
+            return region
+
+        if result is None:
+            raise MatchNotFound(f"{pattern} not found in frame (cached)")
+        bounds, score, target = result
+        return self._region_type(self._raw, screen=self._screen, bounds=bounds, score=score, target=target)
+
+    def _find_in_frame(self, pattern: Pattern, frame: Frame) -> "Region":
+        """Match against an already captured frame instead of letting the backend grab the screen."""
+        if self._screen is None:
+            raise BackendError("region is not associated with a screen")
+        pb_mod = _require_pb()
+        source = frame.crop(self._bounds)
+        template = pattern.gray()
+        req = pb_mod.FindRequest(
+            source=_gray_image(pb_mod, "frame", source),
+            pattern=pb_mod.Pattern(image=_gray_image(pb_mod, str(pattern), template)),
+        )
+        try:
+            response = self._screen.client.find(req)
+        except Exception as exc:  # pragma: no cover - backend proxy
+            raise _to_backend_error(exc) from exc
+
+        match = getattr(response, "match", None)
+        if match is None:
+            raise MatchNotFound(f"{pattern} not found in frame")
+        score = float(getattr(match, "score", 0.0))
+        if pattern.similarity is not None and score < pattern.similarity:
+            raise MatchNotFound(f"{pattern} not found in frame (best score {score:.3f} < {pattern.similarity:.3f})")
+
+        x, y, w, h = _rect_from_match(match)
+        x += source.x
+        y += source.y
+        target = (x + (w // 2) + pattern.offset[0], y + (h // 2) + pattern.offset[1])
+        return self._region_type(self._raw, screen=self._screen, bounds=(x, y, w, h), score=score, target=target)
+
     def exists(self, pattern: Pattern | str | bytes | bytearray | memoryview, timeout_millis: int = 0) -> "Region | None":
         resolved = self._coerce_pattern(pattern)
+        self._sync_input()
         try:
             match = self._raw.exists(resolved.raw, timeout_millis=timeout_millis)
             if match is None:
                 return None
-            return Region.from_match(match, raw_region=self._raw, screen=self._screen)
+            return self._region_type.from_match(match, raw_region=self._raw, screen=self._screen)
         except Exception as exc:  # pragma: no cover - backend proxy
             raise _to_backend_error(exc) from exc
 
     def wait(self, pattern: Pattern | str | bytes | bytearray | memoryview, timeout_millis: int = 3000) -> "Region":
         resolved = self._coerce_pattern(pattern)
+        self._sync_input()
         try:
             match = self._raw.wait(resolved.raw, timeout_millis=timeout_millis)
-            return Region.from_match(match, raw_region=self._raw, screen=self._screen)
+            return self._region_type.from_match(match, raw_region=self._raw, screen=self._screen)
         except Exception as exc:  # pragma: no cover - backend proxy
             raise _to_backend_error(exc) from exc
 
     def click(self, pattern: Pattern | str | bytes | bytearray | memoryview, timeout_millis: int | None = None) -> "Region":
         resolved = self._coerce_pattern(pattern)
+        self._sync_input()
         try:
             match = self._raw.click(resolved.raw, timeout_millis=timeout_millis)
-            return Region.from_match(match, raw_region=self._raw, screen=self._screen)
         except Exception as exc:  # pragma: no cover - backend proxy
             raise _to_backend_error(exc) from exc
+        if self._screen is not None:
+            self._screen._screen_changed()
+        return self._region_type.from_match(match, raw_region=self._raw, screen=self._screen)
+
+    def find_many(
+        self,
+        patterns: Iterable[Pattern | str | bytes | bytearray | memoryview],
+        timeout_millis: int | None = None,
+        frame: Frame | None = None,
+    ) -> list["Region | None"]:
+        """
+        Match several patterns on one capture of this region, None for the ones that aren't there.
+
+        Patterns still missing are searched again on newer captures until `timeout_millis` runs out.
+        """
+        resolved = [self._coerce_pattern(pattern) for pattern in patterns]
+        results: list[Region | None] = [None] * len(resolved)
+        self._scan(resolved, results, timeout_millis, frame, all)
+        return results
+
+    def exists_any(
+        self,
+        patterns: Iterable[Pattern | str | bytes | bytearray | memoryview],
+        timeout_millis: int = 0,
+        frame: Frame | None = None,
+    ) -> "tuple[int, Region] | None":
+        """(index, match) of the first of `patterns` seen in this region, None if none shows up in time."""
+        resolved = [self._coerce_pattern(pattern) for pattern in patterns]
+        results: list[Region | None] = [None] * len(resolved)
+        self._scan(resolved, results, timeout_millis, frame, any)
+        for index, match in enumerate(results):
+            if match is not None:
+                return index, match
+        return None
+
+    def _scan(self, patterns: list[Pattern], results: list, timeout_millis: int | None, frame: Frame | None, done) -> None:
+        # Every pass matches the patterns still missing against one frame
+        if frame is None and self._screen is None:
+            raise BackendError("region is not associated with a screen")
+        deadline = time.monotonic() + max(0, timeout_millis or 0) / 1000.0
+        searched = None
+        while True:
+            current = frame if frame is not None else self._screen.capture_frame(self, newer_than=searched)
+            for index, pattern in enumerate(patterns):
+                if results[index] is None:
+                    try:
+                        results[index] = self._find_in_frame_cached(pattern, current)
+                    except MatchNotFound:
+                        pass
+            remaining = deadline - time.monotonic()
+            if frame is not None or done(match is not None for match in results) or remaining <= 0:
+                return
+            searched = current.captured_at
+            time.sleep(min(SCAN_INTERVAL, remaining))
+
+    # asyncio counterparts, the backends block so they run on worker threads. Cancelling one stops
+    # waiting for it, the backend call itself still finishes in its thread.
+    find_async = _async_of("find")
+    exists_async = _async_of("exists")
+    wait_async = _async_of("wait")
+    click_async = _async_of("click")
+    find_many_async = _async_of("find_many")
+    exists_any_async = _async_of("exists_any")
 
     def hover(self, pattern: Pattern | str | bytes | bytearray | memoryview, timeout_millis: int | None = None) -> "Region":
         match = self.find(pattern, timeout_millis=timeout_millis)
@@ -432,10 +661,22 @@ class Region:
         return f"Region({x},{y},{w},{h})"
 
 
+Region._region_type = Region
+
+
+_POOL_OPTIONS = {"startup_timeout_seconds"}  # Screen.auto/connect options a pooled server can honour
+
+
 class Screen(Region):
+    # Frames at most this old are reused by capture_frame/capture_region unless the caller asks otherwise
+    frame_max_age_millis = 100
+
     def __init__(self, raw_screen: Any) -> None:
         self._screen = self
         self._cursor = (0, 0)
+        self._batches = threading.local()  # Screen.batch() opened by each thread
+        self._lease: server_pool.Lease | None = None
+        self.frames = FrameBuffer(self._grab)
         self._mouse_down_button = None
         self._raw_screen = raw_screen
         super().__init__(raw_screen, screen=self, bounds=None)
@@ -448,9 +689,29 @@ class Screen(Region):
     def meta(self):
         return getattr(self._raw_screen, "meta", None)
 
+    @classmethod
+    def _from_pool(cls, kwargs: dict) -> "Screen | None":
+        # An idle server of the pool (see server_pool), None if there is none.  Pooled servers are already
+        # running, so options about which server to use or how to start it (address, binary_path, ...) skip the pool.
+        if set(kwargs) - _POOL_OPTIONS or os.environ.get("SIKULI_GRPC_ADDR"):
+            return None
+        lease = server_pool.lease()
+        if lease is None:
+            return None
+        try:
+            screen = cls(SikuligoScreen.connect(address=lease.address, **kwargs))
+        except Exception:
+            lease.release()
+            return None
+        screen._lease = lease
+        return screen
+
     @classmethod
     def auto(cls, **kwargs) -> "Screen":
         _require_runtime()
+        screen = cls._from_pool(kwargs)
+        if screen is not None:
+            return screen
         try:
             return cls(SikuligoScreen.auto(**kwargs))
         except Exception as exc:  # pragma: no cover - backend proxy
@@ -459,6 +720,9 @@ class Screen(Region):
     @classmethod
     def connect(cls, **kwargs) -> "Screen":
         _require_runtime()
+        screen = cls._from_pool(kwargs)
+        if screen is not None:
+            return screen
         try:
             return cls(SikuligoScreen.connect(**kwargs))
         except Exception as exc:  # pragma: no cover - backend proxy
@@ -483,7 +747,7 @@ class Screen(Region):
     def region(self, x: int, y: int, w: int, h: int) -> Region:
         try:
             scoped = self._raw_screen.region(int(x), int(y), int(w), int(h))
-            return Region(scoped, screen=self, bounds=(int(x), int(y), int(w), int(h)))
+            return self._region_type(scoped, screen=self, bounds=(int(x), int(y), int(w), int(h)))
         except Exception as exc:  # pragma: no cover - backend proxy
             raise _to_backend_error(exc) from exc
 
@@ -496,12 +760,13 @@ class Screen(Region):
         except Exception:
             return None
 
-    def capture_region(self, region: Any | None = None) -> str:
-        bounds = self._bounds_from_region(region)
+    def capture_region(self, region: Any | None = None, max_age_millis: float | None = None) -> str:
+        """Capture into a PNG file (for screenshot logging), the caller owns the file."""
+        frame = self.capture_frame(region, max_age_millis=max_age_millis)
         fd, path = tempfile.mkstemp(prefix="sikuligo-capture-", suffix=".png")
-        os.close(fd)
         try:
-            _capture_to_png(path, bounds)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(frame.to_png())
             return path
         except Exception as exc:
             try:
@@ -510,34 +775,115 @@ class Screen(Region):
                 pass
             raise _to_backend_error(exc) from exc
 
-    def move_mouse(self, x: int, y: int, delay_millis: int | None = None) -> None:
+    def capture_frame(
+        self,
+        region: Any | None = None,
+        max_age_millis: float | None = None,
+        newer_than: float | None = None,
+    ) -> Frame:
+        """
+        Capture the screen (or the bounds of `region`) into memory for repeated matching.
+
+        A buffered frame at most `max_age_millis` old (default `frame_max_age_millis`) and captured
+        after `newer_than` is reused, 0 always captures.
+        """
+        self._flush_input()
+        bounds = _usable_bounds(self._bounds_from_region(region))
+        if max_age_millis is None:
+            max_age_millis = self.frame_max_age_millis
+        try:
+            return self.frames.get(bounds, max_age_millis, newer_than)
+        except BackendError:
+            raise
+        except Exception as exc:
+            raise _to_backend_error(exc) from exc
+
+    def _grab(self, bounds: tuple[int, int, int, int] | None) -> Frame:
+        return _capture_frame(bounds)
+
+    def _screen_changed(self) -> None:
+        # Input changes what is on the screen, buffered frames don't show it anymore
+        self.frames.invalidate()
+
+    @contextmanager
+    def batch(self, delay_millis: int | None = None):
+        """
+        Queue mouse and keyboard input until the with block ends, then send it at once.
+
+        `delay_millis` applies to queued moves, clicks and texts without a delay of their own.
+        Searches and captures inside the block send what is queued first, so they see its effect.
+        Events still queued when the block raises are dropped.  Nested batches join the outer one.
+        The batch belongs to the thread that opened it: input and searches of other threads
+        (eg. concurrent series, asyncio workers) go out right away and don't flush it.
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        batch = self._batches.batch = InputBatch(self._send_input, delay_millis)
+        try:
+            yield batch
+            batch.flush()
+        finally:
+            batch.discard()
+            self._batches.batch = None
+
+    @property
+    def _batch(self) -> InputBatch | None:
+        return getattr(self._batches, "batch", None)
+
+    def _flush_input(self) -> None:
+        if self._batch is not None:
+            self._batch.flush()
+
+    def _input(self, event: InputEvent) -> None:
+        if event.kind in ("move", "click"):
+            self._cursor = (event.x, event.y)
+        if self._batch is not None:
+            self._batch.add(event)
+        else:
+            self._send_input([event])
+
+    def _send_input(self, events: list[InputEvent]) -> None:
         pb_mod = _require_pb()
-        req = pb_mod.MoveMouseRequest(x=int(x), y=int(y))
-        if delay_millis is not None:
-            req.opts.delay_millis = int(delay_millis)
-        self.client.move_mouse(req)
-        self._cursor = (int(x), int(y))
+        try:
+            for event in events:
+                if event.kind == "move":
+                    req = pb_mod.MoveMouseRequest(x=event.x, y=event.y)
+                    send = self.client.move_mouse
+                elif event.kind == "click":
+                    req = pb_mod.ClickRequest(x=event.x, y=event.y)
+                    req.opts.button = event.button
+                    send = self.client.click
+                elif event.kind == "type":
+                    req = pb_mod.TypeTextRequest(text=event.text)
+                    send = self.client.type_text
+                else:
+                    req = pb_mod.HotkeyRequest(keys=list(event.keys))
+                    send = self.client.hotkey
+                if event.delay_millis is not None and event.kind != "hotkey":
+                    req.opts.delay_millis = int(event.delay_millis)
+                send(req)
+        finally:
+            self._screen_changed()
+
+    def move_mouse(self, x: int, y: int, delay_millis: int | None = None) -> None:
+        self._input(InputEvent("move", x=int(x), y=int(y), delay_millis=delay_millis))
 
     def click_point(self, x: int, y: int, button: Any = "left", delay_millis: int | None = None) -> None:
-        pb_mod = _require_pb()
-        req = pb_mod.ClickRequest(x=int(x), y=int(y))
-        req.opts.button = _normalize_button(button)
-        if delay_millis is not None:
-            req.opts.delay_millis = int(delay_millis)
-        self.client.click(req)
-        self._cursor = (int(x), int(y))
+        self._input(InputEvent("click", x=int(x), y=int(y), button=_normalize_button(button), delay_millis=delay_millis))
 
     def type_text(self, text: str, delay_millis: int | None = None) -> None:
-        pb_mod = _require_pb()
-        req = pb_mod.TypeTextRequest(text=str(text))
-        if delay_millis is not None:
-            req.opts.delay_millis = int(delay_millis)
-        self.client.type_text(req)
+        self._input(InputEvent("type", text=str(text), delay_millis=delay_millis))
 
     def hotkey(self, keys: Iterable[str]) -> None:
-        pb_mod = _require_pb()
-        req = pb_mod.HotkeyRequest(keys=[str(k) for k in keys if str(k).strip()])
-        self.client.hotkey(req)
+        self._input(InputEvent("hotkey", keys=tuple(str(k) for k in keys if str(k).strip())))
+
+    capture_region_async = _async_of("capture_region")
+    capture_frame_async = _async_of("capture_frame")
+    move_mouse_async = _async_of("move_mouse")
+    click_point_async = _async_of("click_point")
+    type_text_async = _async_of("type_text")
+    hotkey_async = _async_of("hotkey")
 
     def move_to(self, target: Any) -> None:
         x, y = _coerce_point(target)
@@ -559,12 +905,13 @@ class Screen(Region):
 
     def drag_to(self, start: Any, destination: Any, button: Any = "left") -> None:
         # No dedicated drag RPC yet; keep input path backend-native by approximating:
-        # move to start, then move + click destination.
+        # move to start, then move + click destination (sent as move + click).
         sx, sy = _coerce_point(start)
         dx, dy = _coerce_point(destination)
-        self.move_mouse(sx, sy)
-        self.move_mouse(dx, dy)
-        self.click_point(dx, dy, button=button)
+        with self.batch():
+            self.move_mouse(sx, sy)
+            self.move_mouse(dx, dy)
+            self.click_point(dx, dy, button=button)
 
     # Legacy naming compatibility
     def type(self, key: Any = None, text: Any = None, keyMod: Any = None) -> None:
@@ -590,4 +937,9 @@ class Screen(Region):
         self.type_text(text)
 
     def close(self) -> None:
-        self._raw_screen.close()
+        try:
+            self._raw_screen.close()
+        finally:
+            if self._lease is not None:
+                self._lease.release()
+                self._lease = None
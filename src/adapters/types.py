@@ -12,6 +12,10 @@ class BackendError(RuntimeError):
     pass
 
 
+class MatchNotFound(BackendError):
+    """The pattern isn't in the searched area (as opposed to the search failing)."""
+
+
 @dataclass(frozen=True)
 class BackendMatch:
     x: int
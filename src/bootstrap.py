@@ -132,6 +132,9 @@ addImagePath(Config.imageBaseline)
 
 logger.trace("Image search path: %s" % getImagePath())
 
+# Compile the baseline transforms up front instead of during the first finds
+logger.trace("Prewarmed %d baseline transforms" % Transform.prewarm([Config.imageBaseline], Config.imageSuffix))
+
 # Sikuli shows a visual effect (a blinking double lined red circle) on the spot where the action
 if Config.debugPlaybackMode: 
     setShowActions(True)
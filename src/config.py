@@ -32,6 +32,8 @@ import os
 
 BACKEND_LEGACY = "legacy"
 BACKEND_SIKULIGO = "sikuligo"
+BACKEND_LOCAL = "local"
+ADAPTER_BACKENDS = (BACKEND_SIKULIGO, BACKEND_LOCAL) # backends running through the adapters package
 _SELECTED_BACKEND = os.environ.get("SIKULI_FRAMEWORK_BACKEND", BACKEND_LEGACY).strip().lower()
 
 
@@ -39,8 +41,8 @@ def _noop(*args, **kwargs):
     return None
 
 
-if _SELECTED_BACKEND == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Screen
+if _SELECTED_BACKEND in ADAPTER_BACKENDS:
+    from adapters.backend import Screen
 
     setShowActions = _noop
 
@@ -115,7 +117,7 @@ class Config():
     def initScreen(cls):
         if cls.screen is not None:
             return cls.screen
-        if cls.backend == BACKEND_SIKULIGO:
+        if cls.backend in ADAPTER_BACKENDS:
             cls.screen = Screen.auto()
         else:
             cls.screen = Screen(0)
@@ -141,6 +143,20 @@ class Config():
         if JRegion is not None:
             JRegion.timeout = Config.regionTimeout
     
+    @classmethod
+    def setPatternCacheSize(cls, megabytes):
+        """ Memory cap of the decoded baseline pattern cache, 0 disables it (adapter backends) """
+        if cls.backend in ADAPTER_BACKENDS:
+            from adapters.pattern_cache import pattern_cache
+            pattern_cache.configure(int(float(megabytes) * 1024 * 1024))
+    
+    @classmethod
+    def setMatchCacheSize(cls, entries):
+        """ Match results kept for re-searching unchanged frames, 0 disables the cache (adapter backends) """
+        if cls.backend in ADAPTER_BACKENDS:
+            from adapters.match_cache import match_cache
+            match_cache.configure(entries)
+    
     @classmethod
     def setLogger(cls, logger):
         cls.logger = logger
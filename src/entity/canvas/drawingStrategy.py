@@ -28,13 +28,31 @@ NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
-from config import BACKEND_SIKULIGO, Config
+from config import ADAPTER_BACKENDS, Config
 
-if Config.backend == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Location, Region
+if Config.backend in ADAPTER_BACKENDS:
+    from adapters.backend import Location, Region
+    from adapters.region_set import PointSet
 else:
     from org.sikuli.script import Location
     from sikuli.Region import Region
+    PointSet = None
+
+
+def pathRegion(points):
+    """ Region around a drawing path, with the extreme points on its corners """
+    
+    if not points:
+        return None
+    
+    if PointSet is not None:
+        return Region(*PointSet(points).bounds())
+    
+    region = Region(points[0][0], points[0][1], 1, 1)
+    for x, y in points[1:]:
+        region = region.add(Location(x, y))
+    return region
+
 
 class DrawingStrategy(object):
     
@@ -67,11 +85,6 @@ class ContiniousDrawingStrategy(DrawingStrategy):
         
         if self.enabled:
             self.queue.append([x, y])
-            
-            if not self.region:
-                self.region = Region(x, y, 1, 1)
-            else:
-                self.region = self.region.add(Location(x, y))
                    
             
     def on(self):
@@ -85,8 +98,18 @@ class ContiniousDrawingStrategy(DrawingStrategy):
         super(ContiniousDrawingStrategy, self).off()
         
         # Prepare to draw annotation
+        self.region = pathRegion(self.queue)
         self.obj.center(self.region)
         
+        # Send the whole path as one batch of input
+        if Config.backend in ADAPTER_BACKENDS:
+            with self.obj.config.getScreen().batch():
+                self.draw()
+        else:
+            self.draw()
+        
+    def draw(self):
+        
         # Move to first location
         self.obj.mouseMove(self.queue[0][0], self.queue[0][1])        
         self.obj.startDrawing()
@@ -125,22 +148,24 @@ class SegmentDrawingStrategy(DrawingStrategy):
 
 class PracticeDrawingStrategy(DrawingStrategy):
     
+    points = None
     region = None
     
     def goto(self, x, y):
         
-        if not self.region:
-            self.region = Region(x, y, 1, 1)
-        else:
-            self.region = self.region.add(Location(x,y))
+        if self.points is None:
+            self.points = []
+        self.points.append([x, y])
         
     def on(self):
         
+        self.points = []
         self.region = None        
         super(PracticeDrawingStrategy, self).on()
         
     def off(self):
         
+        self.region = pathRegion(self.points)
         self.obj.center(self.region)
         super(PracticeDrawingStrategy, self).off()
     
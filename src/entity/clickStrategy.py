@@ -28,11 +28,11 @@ NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
-from config import BACKEND_SIKULIGO, Config
+from config import ADAPTER_BACKENDS, Config
 import time
 
-if Config.backend == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Pattern
+if Config.backend in ADAPTER_BACKENDS:
+    from adapters.backend import Pattern
 
     class InputEvent(object):
         BUTTON1_MASK = "left"
@@ -71,7 +71,7 @@ class StandardClick(ClickStrategy):
 
     
     def click(self, entity, button=InputEvent.BUTTON1_MASK):
-        if Config.backend == BACKEND_SIKULIGO:
+        if Config.backend in ADAPTER_BACKENDS:
             loc = entity.getRegion().getClickLocation()
             self.screen.click_point(loc.getX(), loc.getY(), button=button)
             return
@@ -92,7 +92,7 @@ class QuickClick(ClickStrategy):
 
     
     def click(self, entity, button=InputEvent.BUTTON1_MASK):
-        if Config.backend == BACKEND_SIKULIGO:
+        if Config.backend in ADAPTER_BACKENDS:
             loc = entity.getRegion().getClickLocation()
             self.screen.click_point(loc.getX(), loc.getY(), button=button)
             return
@@ -113,7 +113,7 @@ class ClickAfterVisualChange(ClickStrategy):
         self.assertStateChanged = assertStateChanged
                     
     def click(self, entity, button=InputEvent.BUTTON1_MASK):
-        if Config.backend == BACKEND_SIKULIGO:
+        if Config.backend in ADAPTER_BACKENDS:
             loc = entity.getRegion().getClickLocation()
             self.screen.click_point(loc.getX(), loc.getY(), button=button)
             return
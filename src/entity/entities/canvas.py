@@ -39,10 +39,10 @@ import string
 import os
 from entity.entities.scrollBar import ScrollBar
 from entity.entities.button import Button
-from config import BACKEND_SIKULIGO, Config
+from config import ADAPTER_BACKENDS, Config
 
-if Config.backend == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Location, Region
+if Config.backend in ADAPTER_BACKENDS:
+    from adapters.backend import Location, Region
 
     class InputEvent(object):
         BUTTON1_MASK = "left"
@@ -113,14 +113,14 @@ class Canvas(Entity):
     
     def startDrawing(self):
         #self.logger.trace("Starting to draw..")
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             self.config.getScreen().mouseDown(InputEvent.BUTTON1_MASK)
         else:
             self.region.mouseDown(InputEvent.BUTTON1_MASK)
         
     def stopDrawing(self):
         #self.logger.trace("Stop drawing..")
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             self.config.getScreen().mouseUp(InputEvent.BUTTON1_MASK)
         else:
             self.region.mouseUp(InputEvent.BUTTON1_MASK)
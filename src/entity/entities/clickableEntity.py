@@ -31,10 +31,10 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 from entity.entity import Entity
 from region.exception import FindExhaustedException
 from entity.exception import StateFailedException
-from config import BACKEND_SIKULIGO, Config
+from config import ADAPTER_BACKENDS, Config
 import time
 
-if Config.backend == BACKEND_SIKULIGO:
+if Config.backend in ADAPTER_BACKENDS:
     class InputEvent(object):
         BUTTON1_MASK = "left"
         BUTTON3_MASK = "right"
@@ -81,7 +81,7 @@ class ClickableEntity(Entity):
         # Ensure valid
         self.validate()
 
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             self.config.getScreen().drag_to(
                 self.region.getClickLocation(),
                 destination,
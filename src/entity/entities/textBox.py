@@ -30,12 +30,12 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from entity.entity import Entity
 import re
-from config import BACKEND_SIKULIGO, Config
+from config import ADAPTER_BACKENDS, Config
 import string
 import time
 
-if Config.backend == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Location
+if Config.backend in ADAPTER_BACKENDS:
+    from adapters.backend import Location
 
     class KeyModifier(object):
         CMD = "cmd"
@@ -80,7 +80,7 @@ class TextBox(Entity):
         super(TextBox, self).__init__(parent, *args, **kargs)
         
     def assertEquals(self, expectedText):
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             raise NotImplementedError(
                 "TextBox.assertEquals clipboard verification is not yet implemented for sikuligo backend"
             )
@@ -111,7 +111,7 @@ class TextBox(Entity):
         # Ensure valid
         self.validate()
 
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             click = self.region.getClickLocation()
             self.config.getScreen().click_point(click.getX(), click.getY(), button=InputEvent.BUTTON1_MASK)
             self.config.getScreen().type_text(str(text))
@@ -28,6 +28,7 @@ NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
+import asyncio
 import time
 import shutil
 import os
@@ -36,12 +37,14 @@ from region.exception import ImageSearchExhausted,\
     FindExhaustedException
 from entity.exception import UpdateFailureException,\
     TookTooLongToVanishException, TookTooLongToAppearException
-import re
 from compat import text_type
-from config import BACKEND_SIKULIGO, Config
+from config import ADAPTER_BACKENDS, Config
+from entity.keyRegistry import KeyRegistry, keyName
+from log.traceContext import breadcrumb, traced
 
-if Config.backend == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Pattern
+if Config.backend in ADAPTER_BACKENDS:
+    from adapters.backend import Pattern
+    from adapters.match_cache import frame_digest
 
     def getImagePath():
         return []
@@ -101,12 +104,10 @@ class Entity(object):
     subEntity = None   # is sub-entity? eg a button, created by a window would be a sub-entity
     caller = None       # Who was the one who created this entity?
     
-    parent = None       # parent of this entity
     resultParent = None # parent of the result of getResult()
     
     region = None       # region of this entity
     parentRegion = None # region to search for this entity in, defaults to parent
-    name = None         # name of this entity
     className = None    # class name of this entity
     result = None       # result of this entity    
     instances = None      # instances of sub-entities
@@ -126,7 +127,50 @@ class Entity(object):
     regionFinderStrategy = None
     searcherStrategy = None
     multiResultProxyStrategy = None
+    
+    validationTtl = None            # seconds to trust a validated region while it shows the same pixels, None: until invalidate()
+    validationFingerprint = None    # hash of the region's pixels when validated
+    validatedAt = None
+    
+    validation = None       # task of the validateAsync() in progress, shared by concurrent callers
+    validationCallers = 0
+
+    hierarchyVersion = 0    # incremented when a named entity is renamed or moved to another parent, see getNamesCache()
+    namesCache = None
+    namesCacheVersion = None
+    
+    _parent = None          # parent of this entity
+    _name = None            # name of this entity
+    
+    @property
+    def parent(self):
+        return self._parent
+    
+    @parent.setter
+    def parent(self, parent):
+        if self.namesCache and parent is not self._parent:
+            Entity.hierarchyVersion += 1 # names of this entity and its descendants are stale
+        self._parent = parent
+    
+    @property
+    def name(self):
+        return self._name
+    
+    @name.setter
+    def name(self, name):
+        if self.namesCache and name != self._name:
+            Entity.hierarchyVersion += 1
+        self._name = name
 
+    @classmethod
+    def setValidationTtl(cls, ttl):
+        """
+        Validation cache policy (adapter backends): a validated entity keeps a hash of its region's pixels.
+        Validating it again, even after invalidate(), only hashes that region and searches again when it
+        changed or when the validation is older than ttl seconds. None or 0 trusts validations until invalidate().
+        """
+        cls.validationTtl = ttl
+    
     @classmethod
     def setSearcherStrategy(cls, searcherStrategy):
         cls.searcherStrategy = searcherStrategy
@@ -147,6 +191,7 @@ class Entity(object):
     def setConfig(cls, config):
         cls.config = config        
     
+    @traced()
     def __init__(self, parent, caller=None, timeout=None, name=None, result=None, statusCascade=None, parentRegion=None, resultArgs=None, callback=None, context=None, updatePairs=None, resultParent=None, *args, **kargs):
         
         super(Entity, self).__init__(*args, **kargs) # Needed for handleable dialogs super
@@ -209,52 +254,31 @@ class Entity(object):
         """
         Initialize entity if being accessed for the first time, otherwise existing instance
         """
-
-        KEY_TYPE_NAMED_CLASS = 'namedClass'     # Used for "window" type entities usually 
-        KEY_TYPE_GENERIC_CLASS = 'genericCLass' # Used for sub-entities such as buttons, textboxes, etc.
-
         
         # Support searching
-        if isinstance(key, text_type):
+        if isinstance(key, text_type):
             searcher = self.searcherStrategy()
             searcher.add(self)
             searchResult = searcher.search(key)            
             key = searchResult.getEntity() 
-              
-            # Expecting key = [<keyname>, <class>, <args>]
-        if isinstance(key[0], text_type): # If the key name is a string, it is usually a sub-entity
-            keyName = key[0]
-            keyType = KEY_TYPE_GENERIC_CLASS
-            keyClass = key[1] # If the name is specified as a string, it is expected the second item in the array is the class
-        else: # Keyname must be a class, this key type is usually a "window" entity
-            keyName = key[0].__name__ # We get the name from the class itself
-            keyType = KEY_TYPE_NAMED_CLASS
-            keyClass = key[0]
-        
-        # Enforce that referenced key is part of the current context        
-        found = False
-        for element in self.__class__.__dict__:                     
-            if self.__class__.__dict__[element] == key:
-                found = True
-                    
-        if not found:        
-            raise Exception("Key [%s] is not found in the context %s" % (keyName, self))
+        
+        # Enforce that referenced key is part of the current context (or inherited by it)
+        entityKey = KeyRegistry.lookup(self.__class__, key)
+        if not entityKey:
+            raise Exception("Key [%s] is not found in the context %s" % (keyName(key), self))
         
         # Check to see if this key has already been initialized
-        if not self.instances.get(keyName):
+        if not self.instances.get(entityKey.name):
             
-            try:
-                args = key[2]
-            except IndexError:
-                args = {}
+            args = entityKey.getArgs()
             
             # If entity is a sub-entity we need to pass an argument as the name
-            if keyType == KEY_TYPE_GENERIC_CLASS:
-                args['name'] = keyName
+            if entityKey.generic:
+                args['name'] = entityKey.name
             
-            self.instances[keyName] = keyClass(self, **args)
+            self.instances[entityKey.name] = entityKey.keyClass(self, **args)
         
-        return self.instances[keyName]
+        return self.instances[entityKey.name]
     
     def getParent(self):
         return self.parent
@@ -279,6 +303,11 @@ class Entity(object):
         rootEntity=False, ancestorEntities=False, parentEntity=False    # ,button                                # .SaveDialog
         """        
         
+        namesCache = self.getNamesCache()
+        cacheKey = (rootEntity, ancestorEntities, isinstance(ancestorEntities, bool), topLevel, recurse) # True and 1 differ for families
+        if cacheKey in namesCache:
+            return namesCache[cacheKey]
+        
         # Use ,. as separator based on whether this is a sub-entity (owned by a window)
         if self.subEntity:
             prefix = ","
@@ -311,34 +340,42 @@ class Entity(object):
             # If this is a family and familyEntites is an integer, count down
             ancestorEntities = ancestorEntities-1 if self.family and not isinstance(ancestorEntities, bool) and ancestorEntities else ancestorEntities              
             
-            return self.parent.getCanonicalName(rootEntity=rootEntity, ancestorEntities=ancestorEntities, topLevel=False, recurse=True) + prefix + name
+            canonicalName = self.parent.getCanonicalName(rootEntity=rootEntity, ancestorEntities=ancestorEntities, topLevel=False, recurse=True) + prefix + name
         else:
-            return prefix + name;
-            
+            canonicalName = prefix + name
+        
+        namesCache[cacheKey] = canonicalName
+        return canonicalName
+    
+    def getNamesCache(self):
+        """
+        Values derived from the names of this entity and its ancestors, eg. canonical names or baseline file names.
+        Dropped when an entity that has been named gets another name or parent.
+        """
+        
+        if self.namesCacheVersion != Entity.hierarchyVersion:
+            self.namesCache = {}
+            self.namesCacheVersion = Entity.hierarchyVersion
+        
+        return self.namesCache
          
     def __str__(self):
         
-        return "%s:%s" % (self.getCanonicalName(), self.className)
+        namesCache = self.getNamesCache()
+        if 'str' not in namesCache:
+            namesCache['str'] = "%s:%s" % (self.getCanonicalName(), self.className)
+        return namesCache['str']
 
         
-    def formatPrefix(self, showBaseline=False, showStackTrace=True):
+    def formatPrefix(self, showBaseline=False, showStackTrace=True, formatter=None):
         """
-        Used for logging functions to create line prefix which states the entity name, type and stack trace
-        """        
-                
-        curframe = inspect.currentframe()
-        calframes = inspect.getouterframes(curframe, 1)
-                
-        # form the stack trace, remove frames that are not entirely important to see in the logs        
-        trace = ""
-        if showStackTrace:
-            for frame in calframes:
-                try:
-                    match = re.search(r"[ =]([A-Z]\w+?)\(", frame[4][0]) # try and capture only new objects 
-                    if match and match.group():                                        
-                        trace = "->" + match.group(1) + trace 
-                except TypeError:
-                    pass
+        Used for logging functions to create line prefix which states the entity name, type and what is running,
+        eg. [Calculator,buttonTwo:Button](screenshots)->click->Calculator, the label is `formatter` when given
+        """
+        
+        label = formatter if formatter is not None else "[%s]" % self
+        trace = breadcrumb() if showStackTrace else ""
+        return "%s%s " % (label, trace)
                        
     def isValid(self):
         """ Return the current status of the entity """
@@ -364,7 +401,7 @@ class Entity(object):
         
         self.validate()        
 
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             self.config.getScreen().drag_to(
                 self.region.getClickLocation(),
                 region,
@@ -387,37 +424,153 @@ class Entity(object):
     
     def validate(self, timeout=None):
         
-        parentRegion = None
-        
-        if self.status != self.STATUS_VALID:
+        if self.needsValidation():
             
             # make sure parents are valid too!
             if self.statusCascade:
                 self.parent.validate()
             
-            if self.parentRegion:
-                parentRegion = self.parentRegion
-            elif self.parent and self.parent.isValid(): # get parent region if we have a parent and it is valid
-                parentRegion = self.parent.region
+            timeout = self.prepareSearch(timeout)
+            if timeout is not None:
+                try:
+                    self.identified(self.regionFinder.find(timeout=timeout))
+                except ImageSearchExhausted:
+                    raise UpdateFailureException("-- cannot find window")
             
-            # Allow for argument override
-            timeout = timeout if timeout != None else self.timeout
-                
-            self.logger.trace("trying to validate, parentRegion=%%s timeout=%d" % self.timeout,  self.logger.getFormatter()(parentRegion))
-
+        return self
+    
+    async def validateAsync(self, timeout=None):
+        """
+        validate() for asyncio, the search runs through Finder.findAsync so entities can be validated together.
+        Concurrent calls for one entity (eg. children of the same invalid parent) share a single validation, which
+        is only cancelled once all of its callers are.
+        """
+        
+        validation = self.validation
+        if validation is None or validation.done() or validation.get_loop() is not asyncio.get_running_loop():
+            validation = self.validation = asyncio.ensure_future(self.performValidationAsync(timeout))
+            self.validationCallers = 0
+        
+        self.validationCallers += 1
+        try:
+            return await asyncio.shield(validation)
+        except asyncio.CancelledError:
+            if self.validationCallers == 1 and not validation.done():
+                validation.cancel()
+            raise
+        finally:
+            self.validationCallers -= 1
+    
+    async def performValidationAsync(self, timeout=None):
+        
+        if await self.runOffLoop(self.needsValidation):
             
-            try: 
-                
-                self.regionFinder.setRegion(parentRegion)
-                self.region = self.regionFinder.find(timeout=timeout)
-                self.logger.debug('identified at %%s', self.logger.getFormatter()(self.region).showBaseline())                
-                
-                self.status = self.STATUS_VALID
-            except ImageSearchExhausted:
-                raise UpdateFailureException("-- cannot find window")
+            if self.statusCascade:
+                await self.parent.validateAsync()
+            
+            timeout = await self.runOffLoop(self.prepareSearch, timeout)
+            if timeout is not None:
+                try:
+                    region = await self.regionFinder.findAsync(timeout=timeout)
+                except ImageSearchExhausted:
+                    raise UpdateFailureException("-- cannot find window")
+                await self.runOffLoop(self.identified, region)
             
         return self
+    
+    async def runOffLoop(self, step, *args):
+        """ Run a validation step on a worker thread when it captures the screen (validation cache), right away otherwise """
+        
+        if self.validationTtl:
+            return await asyncio.to_thread(step, *args)
+        return step(*args)
+    
+    def needsValidation(self):
+        """ Does validate() have to do anything, ie. is this entity invalid or has its validation expired? """
+        
+        self.expireValidation()
+        return self.status != self.STATUS_VALID
+    
+    def prepareSearch(self, timeout=None):
+        """ 
+        Point the region finder at the region to search, once the parents are valid.  Returns the timeout of the search,
+        None when the region found last time still shows the same pixels and no search is needed.
+        """
+        
+        if self.reuseValidation():
+            return None
+        
+        parentRegion = None
+        if self.parentRegion:
+            parentRegion = self.parentRegion
+        elif self.parent and self.parent.isValid(): # get parent region if we have a parent and it is valid
+            parentRegion = self.parent.region
         
+        # Allow for argument override
+        timeout = timeout if timeout != None else self.timeout
+            
+        self.logger.trace("trying to validate, parentRegion=%%s timeout=%d" % self.timeout,  self.logger.getFormatter()(parentRegion))
+        
+        self.regionFinder.setRegion(parentRegion)
+        return timeout
+    
+    def identified(self, region):
+        """ The region finder found this entity at region """
+        
+        self.region = region
+        self.logger.debug('identified at %%s', self.logger.getFormatter()(self.region).showBaseline())
+        
+        self.status = self.STATUS_VALID
+        self.rememberValidation()
+        
+    def getRegionFingerprint(self):
+        """
+        Hash of the pixels of this entity's region, None when it can't be captured (eg. Sikuli backend)
+        """
+        
+        if self.region is None or self.config is None or self.config.backend not in ADAPTER_BACKENDS:
+            return None
+        try:
+            # A fresh capture, a buffered frame may predate what changed on the screen
+            return frame_digest(self.config.getScreen().capture_frame(self.region, max_age_millis=0))
+        except Exception as e:
+            self.logger.trace("cannot fingerprint region, searching instead: %s" % e)
+            return None
+    
+    def rememberValidation(self):
+        """ Keep the fingerprint of the region just found, see setValidationTtl() """
+        
+        self.validatedAt = time.monotonic()
+        self.validationFingerprint = self.getRegionFingerprint() if self.validationTtl else None
+    
+    def isValidationCurrent(self):
+        """ Was the last validation less than validationTtl seconds ago, and does its region still show the same pixels? """
+        
+        if not self.validationTtl or self.validationFingerprint is None:
+            return False
+        if time.monotonic() - self.validatedAt > self.validationTtl:
+            return False
+        return self.getRegionFingerprint() == self.validationFingerprint
+    
+    def expireValidation(self):
+        """ A valid entity whose region changed, or that was validated too long ago, has to be searched for again """
+        
+        if self.status == self.STATUS_VALID and self.validationFingerprint is not None and not self.isValidationCurrent():
+            self.logger.trace("region changed or validation expired")
+            self.status = self.STATUS_INVALID
+            self.validationFingerprint = None
+    
+    def reuseValidation(self):
+        """ Make an invalidated entity valid again without searching, when its region still shows the same pixels """
+        
+        if self.isValidationCurrent():
+            self.logger.trace("region unchanged, still valid")
+            self.status = self.STATUS_VALID
+            return True
+        
+        self.validationFingerprint = None
+        return False
+    
     def getResult(self, **resultArgs):
         """
         This will initiate a resulting Entity.  Used by entities that have a visual result of interacting with itself.  
@@ -481,7 +634,7 @@ class Entity(object):
     
     def focus(self):        
         self.validate()
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             self.config.getScreen().move_to(self.region.getClickLocation())
         else:
             self.config.getScreen().mouseMove(self.region)
@@ -504,7 +657,7 @@ class Entity(object):
             raise Exception("Assertion failure")        
         except FileNotFoundException:
             # Baseline doesn't exist, save a copy
-            if self.config.backend == BACKEND_SIKULIGO:
+            if self.config.backend in ADAPTER_BACKENDS:
                 raise Exception("Baseline not provided: %s" % baselinePath)
             shutil.copy(capture(self.region), baselinePath)
             self.logger.error("Baseline not provided, please verify the baseline %s manually" % (baselinePath))
@@ -517,7 +670,7 @@ class Entity(object):
         searcher = self.searcherStrategy()
         searcher.add(self.__class__)
         
-        return self[searcher.search(query)['entity']]
+        return self[searcher.search(query).getEntity()]
 
 
     def waitUntilVanish(self, timeout=300, **resultArgs):
@@ -585,7 +738,7 @@ class Entity(object):
         """
         
         self.validate()
-        if self.config.backend == BACKEND_SIKULIGO:
+        if self.config.backend in ADAPTER_BACKENDS:
             self.config.getScreen().move_to(self.region.getClickLocation())
         else:
             self.region.mouseMove(self.region)
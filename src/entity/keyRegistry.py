@@ -0,0 +1,129 @@
+"""
+Per class registry of entity keys.
+
+Entity keys are the list members of an entity class, eg. BUTTON_TWO = ['buttonTwo', Button]
+or SAVE_DIALOG = [SaveDialog].  ``entity[key]`` only accepts keys defined by the entity's
+class (or one of its bases), which used to be checked by comparing the key against every
+member of the class on each access.  The registry of a class is built once, walking the MRO
+so inherited keys are found and keys redefined by a subclass shadow the base ones, and keys
+are then looked up by identity.
+"""
+
+import inspect
+import threading
+import weakref
+
+from compat import text_type
+
+
+class EntityKey(object):
+    """ A key defined by an entity class """
+
+    __slots__ = ("attribute", "key", "name", "keyClass", "generic", "owner")
+
+    def __init__(self, attribute, key, name, keyClass, generic, owner):
+        self.attribute = attribute  # BUTTON_TWO
+        self.key = key              # ['buttonTwo', Button]
+        self.name = name            # buttonTwo
+        self.keyClass = keyClass    # Button, or a callable creating the entity
+        self.generic = generic      # named by a string (sub-entity), rather than by its class
+        self.owner = owner          # class defining the key
+
+    def getArgs(self):
+        try:
+            return self.key[2]
+        except IndexError:
+            return {}
+
+    def __repr__(self):
+        return "EntityKey(%s.%s, name=%r)" % (self.owner.__name__, self.attribute, self.name)
+
+
+def parseKey(attribute, key, owner):
+    """ EntityKey for a class member, None when the member is not an entity key """
+
+    if not isinstance(key, list) or not key:
+        return None
+    if isinstance(key[0], text_type):
+        if len(key) < 2:
+            return None
+        return EntityKey(attribute, key, key[0], key[1], True, owner)
+    if inspect.isclass(key[0]):
+        return EntityKey(attribute, key, key[0].__name__, key[0], False, owner)
+    return None
+
+
+def keyName(key):
+    """ Name of a key for messages, eg. buttonTwo for ['buttonTwo', Button] """
+
+    try:
+        return key[0] if isinstance(key[0], text_type) else key[0].__name__
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return key
+
+
+class KeyRegistry(object):
+    """ Keys of one entity class, including inherited ones """
+
+    _registries = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, entityClass):
+        self.entityClass = entityClass
+        self.attributes = {}    # attribute -> EntityKey
+
+        for klass in reversed(entityClass.__mro__):
+            for attribute, value in list(klass.__dict__.items()):
+                entry = parseKey(attribute, value, klass)
+                if entry:
+                    self.attributes[attribute] = entry
+                else:
+                    self.attributes.pop(attribute, None) # redefined as something else than a key
+
+        self.keys = dict((id(entry.key), entry) for entry in self.attributes.values())
+
+    @classmethod
+    def forClass(cls, entityClass):
+        registry = cls._registries.get(entityClass)
+        if registry is None:
+            registry = cls(entityClass)
+            with cls._lock:
+                cls._registries[entityClass] = registry
+        return registry
+
+    @classmethod
+    def invalidate(cls, entityClass=None):
+        """ Forget the registry of a class whose keys changed, or of all classes """
+
+        with cls._lock:
+            if entityClass is None:
+                cls._registries.clear()
+            else:
+                cls._registries.pop(entityClass, None)
+
+    @classmethod
+    def lookup(cls, entityClass, key):
+        """
+        EntityKey of a key defined by entityClass or its bases, None when the class doesn't define it.
+        Keys added to or replaced on the class after its registry was built are picked up.
+        """
+
+        entry = cls.forClass(entityClass).find(key)
+        if entry is None or getattr(entityClass, entry.attribute, None) is not entry.key:
+            cls.invalidate(entityClass)
+            entry = cls.forClass(entityClass).find(key)
+        return entry
+
+    def find(self, key):
+        entry = self.keys.get(id(key))
+        if entry is not None and entry.key is key:
+            return entry
+
+        # An equal copy of the key, eg. built by a RobotFramework keyword
+        for entry in self.attributes.values():
+            if entry.key == key:
+                return entry
+        return None
+
+    def getKeys(self):
+        return list(self.attributes.values())
@@ -30,8 +30,11 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import re
 import inspect
+import weakref
+from functools import lru_cache
 from . import Entity, MultiResultProxy
 from compat import text_type
+from entity.keyRegistry import KeyRegistry
 
 class KeyNotFoundException(Exception):
     pass
@@ -74,6 +77,64 @@ class SearchResult(object):
         else:
             return "%s parent=%s" % (self.entity, self.parent)
 
+@lru_cache(maxsize=4096)
+def nameWords(name):
+    """
+    Lower case words of an entity name, eg. ('button', 'two') for buttonTwo
+    """
+    
+    return tuple(str.lower(word) for word in re.findall("(?m)((?:[A-Z0-9]{1}|^[a-z]{1})[a-z]*)", name))
+
+
+class WordIndex(object):
+    """
+    Inverted index of the key names of an entity class: word -> keys having this word in their name.
+    Built once per class from its KeyRegistry, and again when the registry is rebuilt.
+    """
+    
+    indexes = weakref.WeakKeyDictionary()
+    
+    def __init__(self, registry):
+        self.registry = registry
+        self.keys = registry.getKeys()
+        self.wordCounts = []   # number of words in the name of each key
+        self.words = {}        # word -> positions of the keys in self.keys
+        
+        for position, entityKey in enumerate(self.keys):
+            entityWords = nameWords(entityKey.name)
+            self.wordCounts.append(len(entityWords))
+            for word in set(entityWords):
+                self.words.setdefault(word, []).append(position)
+    
+    @classmethod
+    def forClass(cls, entityClass):
+        registry = KeyRegistry.forClass(entityClass)
+        index = cls.indexes.get(entityClass)
+        if index is None or index.registry is not registry:
+            index = cls(registry)
+            cls.indexes[entityClass] = index
+        return index
+    
+    def search(self, searchWords):
+        """
+        (number of words, EntityKey) of the keys having all the search words in their name
+        """
+        
+        postings = []
+        for word in searchWords:
+            positions = self.words.get(word)
+            if not positions:
+                return []
+            postings.append(positions)
+        
+        postings.sort(key=len)
+        positions = set(postings[0])
+        for other in postings[1:]:
+            positions.intersection_update(other)
+        
+        return [(self.wordCounts[position], self.keys[position]) for position in sorted(positions)]
+
+
 class Searcher(object):
     """
     Core search engine of Entity/SubEntity searchByName functions.
@@ -81,10 +142,12 @@ class Searcher(object):
     """
     
     pool = None
+    containers = None
     
     def __init__(self):
         super(Searcher, self).__init__()
-        self.pool = []
+        self.pool = None
+        self.containers = []
     
     def add(self, container, parent=None):        
         """
@@ -103,27 +166,39 @@ class Searcher(object):
                     self.add(result) # Recurse    
         
         elif inspect.isclass(container):
-
-            self.pool.append(SearchResult(entity=[container,], parent=parent)) # Add the class itself
-                        
-            for key in container.__dict__:
-                
-                # Ensure this member variable has a defined variable and is a list (All entity definitions will be lists)
-                if container.__dict__[key] and isinstance(container.__dict__[key], list):
-                    self.pool.append(SearchResult(owner=container, entity=container.__dict__[key], parent=parent))     
-
+            self.containers.append((container, container, parent))
+            self.pool = None
                              
         elif isinstance(container, object):
-            # This is a class, add all the keys of this class
-            
-            self.pool.append(SearchResult(entity=[container,], parent=parent)) # Add the class itself
-                        
-            for key in container.__class__.__dict__:
-                
-                # Ensure this member variable has a defined variable and is a list (All entity definitions will be lists)
-                if container.__class__.__dict__[key] and isinstance(container.__class__.__dict__[key], list):
-                    self.pool.append(SearchResult(owner=container, entity=container.__class__.__dict__[key], parent=parent))     
-                
+            # This is an entity, its keys are the keys of its class
+            self.containers.append((container, container.__class__, parent))
+            self.pool = None
+    
+    def getPool(self):
+        """
+        Every searchable item: each class or entity added and their keys (including inherited keys)
+        """
+        
+        if self.pool is None:
+            self.pool = []
+            for container, entityClass, parent in self.containers:
+                self.pool.append(SearchResult(entity=[container,], parent=parent)) # Add the class itself
+                for entityKey in KeyRegistry.forClass(entityClass).getKeys():
+                    self.pool.append(SearchResult(owner=container, entity=entityKey.key, parent=parent))
+        
+        return self.pool
+    
+    def getContainerName(self, container):
+        
+        if isinstance(container, str):
+            return container
+        elif inspect.isclass(container):
+            return container.__name__
+        elif isinstance(container, Entity):
+            return container.getName()
+        else:
+            raise Exception("Unable to get entity name")
+
 
     def search(self, query):
         """
@@ -149,7 +224,7 @@ class Searcher(object):
         results = []
         
         # Go through all pool items and see if any of our entities match the query
-        for poolItem in self.pool:             
+        for poolItem in self.getPool():             
             if (isinstance(query, object) and poolItem.getEntity() == [query]) or poolItem.getEntity() == query:
                 results.append(poolItem)
                     
@@ -157,7 +232,7 @@ class Searcher(object):
 
             # Convert items to string so they can be used in join in the exception
             poolItems = []
-            for poolItem in self.pool:
+            for poolItem in self.getPool():
                 poolItems.append(str(poolItem))                  
             
             raise KeyNotFoundException("Unable to find class for key=%s in:\n%s" % (query, '\n'.join(poolItems)))
@@ -168,58 +243,53 @@ class Searcher(object):
     
     def searchWithString(self, query):
         
-        foundKeys = {}
-        
         # Get the search words used to find the target element 
         searchWords = str.lower(query).split(' ')
         
-        # Go through all the keys and find somethin!
-        for poolItem in self.pool:
-            
-            if isinstance(poolItem.getEntity()[0], str):
-                curEntityName = poolItem.getEntity()[0]
-            elif inspect.isclass(poolItem.getEntity()[0]):
-                curEntityName = poolItem.getEntity()[0].__name__
-            elif isinstance(poolItem.getEntity()[0], Entity):
-                curEntityName = poolItem.getEntity()[0].getName()
-            
-            else:
-                raise Exception("Unable to get entity name")
-                            
-            # Find at the words in the current entity name
-            entityWords = re.findall("(?m)((?:[A-Z0-9]{1}|^[a-z]{1})[a-z]*)", curEntityName)
-            
-            # Convet words to lower case
-            for index, word in enumerate(entityWords):
-                entityWords[index] = str.lower(word)
-                
-
-            # Make sure all our search words matched
-            intersect =  list(set(searchWords) & set(entityWords))
-            if intersect and len(intersect) == len(searchWords):
-                
-                # Create a list of keys matched, and number of words they have
-                entityWordCount = len(entityWords)
-                if foundKeys.get(entityWordCount):
-                    foundKeys[entityWordCount].append(poolItem)
-                else:
-                    foundKeys[entityWordCount] = [poolItem]
-                        
+        foundKeys = self.findWords(searchWords)
+        if len(foundKeys) == 0:
+            # Keys might have been added to a class after its index was built
+            for container, entityClass, parent in self.containers:
+                KeyRegistry.invalidate(entityClass)
+            foundKeys = self.findWords(searchWords)
                                         
         if len(foundKeys) == 0:
             
             # Convert items to string so they can be used in join in the exception
             poolItems = []
-            for poolItem in self.pool:
+            for poolItem in self.getPool():
                 poolItems.append(str(poolItem))                
                 
             raise KeyNotFoundException("Unable to find [%s] in:\n%s" % (query, "\n".join(poolItems)))
     
         # Return the match with the least number of words (it will be more specific)
-        for wordsMatchedIndex, matches in sorted(foundKeys.items()):
+        for wordsMatchedIndex, matches in sorted(foundKeys.items()):
             
             if len(matches) > 1:          
                 raise AmbiguousKeySearchException("Target [%s] is ambiguous, matches=%s" % (query, matches))
             else:
-                return matches[0]    
-            
+                return matches[0]
+    
+    def findWords(self, searchWords):
+        """
+        Pool items having all the search words in their name, by the number of words in their name
+        """
+        
+        foundKeys = {}
+        
+        # Every search word has to match a different word of the name 
+        if len(set(searchWords)) != len(searchWords):
+            return foundKeys
+        
+        for container, entityClass, parent in self.containers:
+            
+            # The class or entity itself
+            entityWords = nameWords(self.getContainerName(container))
+            if set(searchWords).issubset(entityWords):
+                foundKeys.setdefault(len(entityWords), []).append(SearchResult(entity=[container,], parent=parent))
+            
+            # Its keys
+            for entityWordCount, entityKey in WordIndex.forClass(entityClass).search(searchWords):
+                foundKeys.setdefault(entityWordCount, []).append(SearchResult(owner=container, entity=entityKey.key, parent=parent))
+        
+        return foundKeys
\ No newline at end of file
@@ -85,8 +85,12 @@ class EntityLoggerProxy(object):
             msg = string.replace(msg, r'%%s',r'%s')
             msg = msg % args
         
-        # Formulate the prefix for this log statement
-        prefix = "%s " % str(self.formatter(self.entity).setLogLevel(level)) if self.entity else ''        
+        # Formulate the prefix for this log statement, objects with a formatPrefix (eg. entities) build their own
+        prefix = ''
+        if self.entity:
+            formatter = self.formatter(self.entity).setLogLevel(level)
+            formatPrefix = getattr(self.entity, 'formatPrefix', None)
+            prefix = formatPrefix(formatter=formatter) if formatPrefix else "%s " % str(formatter)
         
         self.logger.log(level, prefix + msg, *args, **kwargs)
         
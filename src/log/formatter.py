@@ -30,10 +30,10 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import os
 import re
-from config import BACKEND_SIKULIGO, Config
+from config import ADAPTER_BACKENDS, Config
 
-if Config.backend == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Pattern, Region, Screen
+if Config.backend in ADAPTER_BACKENDS:
+    from adapters.backend import Pattern, Region, Screen
 
     class Match(object):
         pass
@@ -110,7 +110,7 @@ class Formatter(object):
         return None
 
     def _capture_region(self, region):
-        if Config.backend == BACKEND_SIKULIGO:
+        if Config.backend in ADAPTER_BACKENDS:
             screen = None
             if hasattr(self.config, "getScreen"):
                 screen = self.config.getScreen()
@@ -0,0 +1,82 @@
+"""
+Trail of what is running, eg. ->click->Calculator->SaveDialog, used by log line prefixes.
+
+Entity constructors and RobotFramework keywords push a span while they run.  Spans live in a
+contextvar, so threads and asyncio tasks each keep their own trail, and pushing one is a single
+contextvar set.  The trail is only formatted when a log line prefix asks for it, once per span.
+"""
+
+import contextvars
+import functools
+
+
+class Span(object):
+    """ One running constructor or keyword, linked to the span it runs in """
+
+    __slots__ = ("name", "parent", "trail")
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.trail = None   # formatted on first use
+
+    def getTrail(self):
+        if self.trail is None:
+            self.trail = (self.parent.getTrail() if self.parent else "") + "->" + self.name
+        return self.trail
+
+
+_current = contextvars.ContextVar("sikuliFrameworkTrace", default=None)
+
+
+def push(name):
+    """ Start a span, returns the token to pass to pop() """
+    return _current.set(Span(name, _current.get()))
+
+
+def pop(token):
+    _current.reset(token)
+
+
+class span(object):
+    """ Context manager running its block in a span """
+
+    def __init__(self, name):
+        self.name = name
+        self.token = None
+
+    def __enter__(self):
+        self.token = push(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        pop(self.token)
+        return False
+
+
+def traced(name=None):
+    """
+    Decorator running a method in a span, named after the method or, for constructors, the class
+    of the object being created.
+    """
+
+    def decorate(method):
+        spanName = name if name else (None if method.__name__ == "__init__" else method.__name__)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kargs):
+            token = _current.set(Span(spanName or self.__class__.__name__, _current.get()))
+            try:
+                return method(self, *args, **kargs)
+            finally:
+                _current.reset(token)
+
+        return wrapper
+
+    return decorate
+
+
+def breadcrumb():
+    """ Trail of the running spans, outermost first, "" when nothing is traced """
+    current = _current.get()
+    return current.getTrail() if current else ""
@@ -0,0 +1,198 @@
+"""
+Directory index of baseline images used by the Finder.
+
+Every baseline directory is listed once and each image in it is parsed into
+(name, series, sequence, state).  Baseline lookups then become dictionary
+lookups instead of one ``os.path.isfile`` probe per candidate file name.  A
+directory is listed again only when its mtime changes.
+"""
+
+import os
+import re
+import threading
+import time
+
+
+class BaselineEntry(object):
+    """ A single baseline image, eg. Calculator[1]-0[disabled].png """
+
+    __slots__ = ("name", "series", "sequence", "state", "path")
+
+    def __init__(self, name, series, sequence, state, path):
+        self.name = name            # Calculator
+        self.series = series        # 1 (None when not part of a series)
+        self.sequence = sequence    # 0 (None when not part of a sequence)
+        self.state = state          # [disabled] ("" for the default state)
+        self.path = path
+
+    def __eq__(self, other):
+        return isinstance(other, BaselineEntry) and self.toTuple() == other.toTuple()
+
+    def __hash__(self):
+        return hash(self.toTuple())
+
+    def toTuple(self):
+        return (self.name, self.series, self.sequence, self.state, self.path)
+
+    def __repr__(self):
+        return "BaselineEntry(%r, series=%r, sequence=%r, state=%r)" % (self.name, self.series, self.sequence, self.state)
+
+
+class BaselineDirectory(object):
+    """ Parsed listing of one baseline directory """
+
+    def __init__(self, path, mtime, files, checked=None):
+        self.path = path
+        self.mtime = mtime          # st_mtime_ns of the directory, None if it doesn't exist
+        self.files = files          # file name -> BaselineEntry
+        self.checked = checked if checked is not None else time.time()
+
+    def getEntries(self):
+        return list(self.files.values())
+
+
+class BaselineIndex(object):
+    """
+    Process wide index of the baseline directories under the image search paths.
+
+    Lookups take a path relative to a search root (eg. Calculator/Calculator,buttonTwo.png) and
+    return the absolute path from the first root containing it, the same order Finder used to probe.
+    """
+
+    # Parses Name[series]-sequence[state]
+    NAME_PATTERN = re.compile(r"^(?P<name>.+?)(?:\[(?P<series>[0-9]+)\])?(?:-(?P<sequence>[0-9]+))?(?P<state>\[[^\[\]]*\])?$")
+
+    imageSuffix = ".png"
+    refreshInterval = 1.0   # seconds between directory mtime checks, 0 checks on every lookup
+
+    def __init__(self, imageSuffix=None, refreshInterval=None):
+        super(BaselineIndex, self).__init__()
+
+        if imageSuffix is not None:
+            self.imageSuffix = imageSuffix
+        if refreshInterval is not None:
+            self.refreshInterval = refreshInterval
+
+        self.directories = {}
+        self.scans = 0
+        self.dirty = False  # directories were listed since the index was loaded or saved
+        self.lock = threading.Lock()
+
+    @classmethod
+    def parseName(cls, filename, imageSuffix=None):
+        """ Split a baseline file name into (name, series, sequence, state), None if it isn't an image """
+
+        suffix = imageSuffix if imageSuffix is not None else cls.imageSuffix
+        if not filename.lower().endswith(suffix.lower()):
+            return None
+
+        match = cls.NAME_PATTERN.match(filename[:-len(suffix)])
+        if not match:
+            return None
+
+        series = match.group("series")
+        sequence = match.group("sequence")
+        return (
+            match.group("name"),
+            int(series) if series is not None else None,
+            int(sequence) if sequence is not None else None,
+            match.group("state") or "",
+        )
+
+    @staticmethod
+    def getRoots(roots):
+        """ Absolute, de-duplicated search roots in priority order """
+
+        result = []
+        for root in roots:
+            if not root:
+                continue
+            root = os.path.abspath(root)
+            if root not in result:
+                result.append(root)
+        return result
+
+    def locate(self, relativePath, roots):
+        """ Return the absolute path of the first root containing relativePath, None if missing """
+
+        for root in self.getRoots(roots):
+            candidate = os.path.abspath(os.path.join(root, relativePath))
+            if self.isfile(candidate):
+                return candidate
+        return None
+
+    def isfile(self, path):
+        """ Equivalent of os.path.isfile for baseline images, answered from the directory listing """
+
+        path = os.path.abspath(path)
+        directory = self.getDirectory(os.path.dirname(path))
+        return os.path.basename(path) in directory.files
+
+    def getDirectory(self, path):
+        """ Return the listing of a directory, rescanning it if its mtime changed """
+
+        path = os.path.abspath(path)
+        now = time.time()
+
+        directory = self.directories.get(path)
+        if directory is not None and (now - directory.checked) < self.refreshInterval:
+            return directory
+
+        mtime = self.getMtime(path)
+
+        with self.lock:
+            directory = self.directories.get(path)
+            if directory is None or directory.mtime != mtime:
+                directory = self.scan(path, mtime)
+                self.directories[path] = directory
+                self.dirty = True
+            directory.checked = now
+
+        return directory
+
+    def scan(self, path, mtime):
+        """ List a directory and parse every baseline image in it """
+
+        files = {}
+        if mtime is None:
+            return BaselineDirectory(path, None, files) # Directory doesn't exist
+
+        self.scans += 1
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return BaselineDirectory(path, None, files)
+
+        for filename in names:
+            parsed = self.parseName(filename, self.imageSuffix)
+            if parsed is None:
+                continue
+            name, series, sequence, state = parsed
+            files[filename] = BaselineEntry(name, series, sequence, state, os.path.join(path, filename))
+
+        return BaselineDirectory(path, mtime, files)
+
+    def getEntries(self, relativeDirectory, roots):
+        """ All parsed baselines of a directory across the search roots, earlier roots win """
+
+        entries = {}
+        for root in reversed(self.getRoots(roots)):
+            directory = self.getDirectory(os.path.join(root, relativeDirectory))
+            entries.update(directory.files)
+        return sorted(entries.values(), key=lambda entry: os.path.basename(entry.path))
+
+    def invalidate(self, path=None):
+        """ Forget a directory listing (or all of them) """
+
+        with self.lock:
+            if path is None:
+                self.directories = {}
+            else:
+                self.directories.pop(os.path.abspath(path), None)
+
+    @staticmethod
+    def getMtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,180 @@
+"""
+On-disk manifest of the baseline index.
+
+The manifest stores the parsed listing of every baseline directory keyed by
+directory path and mtime.  A new process loads it into the BaselineIndex and
+only lists a directory again when its mtime no longer matches.
+
+The manifest is kept next to the baseline directory (``baseline.manifest.json``
+beside ``baseline/``) so writing it doesn't change the mtime of the baseline
+directory itself.
+
+Usage:
+    export SIKULI_FRAMEWORK_BACKEND=sikuligo PYTHONPATH=src
+    python -m region.baselineManifest build examples/calculator/baseline
+    python -m region.baselineManifest verify examples/calculator/baseline
+"""
+
+import argparse
+import atexit
+import json
+import os
+import sys
+import tempfile
+
+from region.baselineIndex import BaselineDirectory, BaselineEntry, BaselineIndex
+
+
+class BaselineManifest(object):
+
+    VERSION = 1
+    SUFFIX = ".manifest.json"
+
+    @classmethod
+    def getPath(cls, imageBaseline):
+        """ baseline/ -> baseline.manifest.json """
+        return os.path.abspath(imageBaseline).rstrip("/\\") + cls.SUFFIX
+
+    @classmethod
+    def build(cls, index, roots):
+        """ List every directory under the search roots into the index """
+
+        for root in BaselineIndex.getRoots(roots):
+            for path, _dirs, _files in os.walk(root):
+                index.getDirectory(path)
+        return index
+
+    @classmethod
+    def save(cls, index, path):
+        """ Atomically write the directory listings of an index """
+
+        base = os.path.dirname(os.path.abspath(path))
+        directories = {}
+        for directory in sorted(list(index.directories.values()), key=lambda d: d.path):
+            if directory.mtime is None:
+                continue # Missing directories are cheap to stat, no need to record them
+            directories[os.path.relpath(directory.path, base)] = {
+                "mtime": directory.mtime,
+                "entries": [
+                    [os.path.basename(entry.path), entry.name, entry.series, entry.sequence, entry.state]
+                    for entry in sorted(directory.files.values(), key=lambda e: e.path)
+                ],
+            }
+
+        manifest = {
+            "version": cls.VERSION,
+            "imageSuffix": index.imageSuffix,
+            "directories": directories,
+        }
+
+        fd, temp = tempfile.mkstemp(prefix=".baseline-manifest-", dir=base)
+        try:
+            with os.fdopen(fd, "w") as handle:
+                json.dump(manifest, handle, indent=1, sort_keys=True)
+            os.replace(temp, path)
+        except Exception:
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+            raise
+
+        index.dirty = False
+        return path
+
+    @classmethod
+    def read(cls, path):
+        """ Return {directory: BaselineDirectory} from a manifest, empty if missing or unreadable """
+
+        try:
+            with open(path) as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get("version") != cls.VERSION:
+            return {}
+
+        base = os.path.dirname(os.path.abspath(path))
+        directories = {}
+        for relative, listing in manifest.get("directories", {}).items():
+            directory = os.path.normpath(os.path.join(base, relative))
+            files = {}
+            for filename, name, series, sequence, state in listing["entries"]:
+                files[filename] = BaselineEntry(name, series, sequence, state, os.path.join(directory, filename))
+            # checked=0 forces one mtime comparison before the listing is trusted
+            directories[directory] = BaselineDirectory(directory, listing["mtime"], files, checked=0)
+        return directories
+
+    @classmethod
+    def load(cls, index, path):
+        """ Seed an index with the listings from a manifest, returns the number of directories loaded """
+
+        directories = cls.read(path)
+        with index.lock:
+            for directory, listing in directories.items():
+                index.directories.setdefault(directory, listing)
+        return len(directories)
+
+    @classmethod
+    def verify(cls, path, roots):
+        """ Return the directories whose listing in the manifest is stale or missing """
+
+        recorded = cls.read(path)
+        stale = []
+
+        for directory, listing in sorted(recorded.items()):
+            if BaselineIndex.getMtime(directory) != listing.mtime:
+                stale.append(directory)
+
+        for root in BaselineIndex.getRoots(roots):
+            for directory, _dirs, _files in os.walk(root):
+                directory = os.path.normpath(directory)
+                if directory not in recorded:
+                    stale.append(directory)
+
+        return stale
+
+    @classmethod
+    def saveOnExit(cls, index, path):
+        """ Refresh the manifest at exit when this process had to list new or changed directories """
+
+        def _save():
+            if getattr(index, "dirty", False):
+                try:
+                    cls.save(index, path)
+                except OSError:
+                    pass # Read only baseline share, keep using the existing manifest
+
+        atexit.register(_save)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog="baselineManifest", description="Build or verify the baseline manifest")
+    parser.add_argument("command", choices=("build", "verify"))
+    parser.add_argument("baseline", help="baseline directory (Config.imageBaseline)")
+    parser.add_argument("--search-path", action="append", default=[], help="extra image search path, in priority order")
+    parser.add_argument("--manifest", help="manifest path, defaults to <baseline>%s" % BaselineManifest.SUFFIX)
+    parser.add_argument("--suffix", default=".png", help="image suffix")
+    args = parser.parse_args(argv)
+
+    roots = args.search_path + [args.baseline]
+    path = args.manifest or BaselineManifest.getPath(args.baseline)
+
+    if args.command == "build":
+        index = BaselineManifest.build(BaselineIndex(imageSuffix=args.suffix), roots)
+        BaselineManifest.save(index, path)
+        entries = sum(len(directory.files) for directory in index.directories.values())
+        print("wrote %s (%d directories, %d baselines)" % (path, len(index.directories), entries))
+        return 0
+
+    stale = BaselineManifest.verify(path, roots)
+    for directory in stale:
+        print("stale: %s" % directory)
+    print("%s is %s" % (path, "stale" if stale else "up to date"))
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
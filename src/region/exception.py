@@ -33,6 +33,9 @@ from error import SikuliFrameworkException
 class ImageSearchExhausted(SikuliFrameworkException):
     pass
 
+class SeriesCancelled(SikuliFrameworkException):
+    pass
+
 class ImageMissingException(SikuliFrameworkException):
     pass
 
@@ -28,19 +28,27 @@ NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
+import asyncio
 import time
 from region.exception import ImageMissingException,\
-    ImageSearchExhausted, FindExhaustedException
+    ImageSearchExhausted, FindExhaustedException, SeriesCancelled
 import sys
 import os
 import re
-from config import BACKEND_SIKULIGO
+import threading
+from config import ADAPTER_BACKENDS
+from region.baselineIndex import BaselineIndex
+from region.locationHints import LocationHints
+from region.retrySchedule import Deadline, RetrySchedule
 
 _BACKEND = os.environ.get("SIKULI_FRAMEWORK_BACKEND", "legacy").strip().lower()
 
-if _BACKEND == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Pattern, Region
+_ATTEMPT = object()  # step of Finder._attempts(): run performFind()
+
+if _BACKEND in ADAPTER_BACKENDS:
+    from adapters.backend import Pattern, Region
     from adapters.types import BackendError
+    from adapters.frame import accelerated
 
     ImageLocator = None
 
@@ -119,13 +127,74 @@ class Finder(FinderAbstract):
     
     threadLock = None
     
+    baselineIndex = BaselineIndex() # Shared directory index of the baseline images
+    baselineManifest = None         # Manifest the index was seeded from
+    
+    frameSnapshot = False   # Match every series/sequence of a find attempt against one captured frame
+    frameMaxAge = None      # ms, reuse a screen frame that recent (eg. taken by another finder), None: the screen's default
+    lastFrame = None        # capture time of the frame of the previous attempt, retries never search it again
+    seriesWorkers = 1       # Series matched at the same time by performFind, 1 tries them one after another
+    seriesWaitSlice = 0.1   # seconds, series matched at the same time wait on the screen this long between checking they were cancelled
+    
+    locationHints = LocationHints() # Last known location of each entity, shared by every Finder
+    locationHinting = False # Look around the last known location before searching the whole region
+    hintTimeout = 0         # seconds to wait for an entity at its last known location
+    
+    retrySchedule = RetrySchedule() # Pacing of the attempts made by find()
+    deadline = None         # Deadline of the current find(), backend waits never go past it
+    
     @classmethod
     def setLogger(cls, logger):
         cls.logger = logger
         
+    @classmethod
+    def setFrameSnapshot(cls, enabled):
+        cls.frameSnapshot = enabled
+        
+    @classmethod
+    def setFrameMaxAge(cls, millis):
+        cls.frameMaxAge = millis
+        
+    @classmethod
+    def setSeriesWorkers(cls, workers):
+        cls.seriesWorkers = max(1, int(workers))
+        
+    @classmethod
+    def setRetrySchedule(cls, retrySchedule):
+        cls.retrySchedule = retrySchedule
+        
+    @classmethod
+    def setLocationHinting(cls, enabled, locationHints=None):
+        cls.locationHinting = enabled
+        if locationHints is not None:
+            cls.locationHints = locationHints
+        
     @classmethod
     def setConfig(cls, config):
         cls.config = config
+        cls.loadBaselineManifest()
+        
+    @classmethod
+    def loadBaselineManifest(cls):
+        """ Seed the baseline index from the manifest next to Config.imageBaseline, if one has been built """
+        
+        from region.baselineManifest import BaselineManifest
+        
+        imageBaseline = getattr(cls.config, "imageBaseline", None)
+        if not imageBaseline:
+            return
+        
+        path = BaselineManifest.getPath(imageBaseline)
+        if path == cls.baselineManifest or not os.path.isfile(path):
+            return
+        
+        if BaselineManifest.load(cls.baselineIndex, path):
+            BaselineManifest.saveOnExit(cls.baselineIndex, path)
+        cls.baselineManifest = path
+        
+    @classmethod
+    def setBaselineIndex(cls, baselineIndex):
+        cls.baselineIndex = baselineIndex
         
     @classmethod
     def setTransform(cls, transform):
@@ -158,14 +227,7 @@ class Finder(FinderAbstract):
         # If this is set we've already found stuff       
         if self.collectionType: return
         
-        for filename, nameType in ( \
-                (self.entity.getCanonicalName(ancestorEntities=False, topLevel=False) + '/' + self.entity.getCanonicalName(),self.NAME_TYPE_FULL), \
-                (self.entity.getCanonicalName(ancestorEntities=False, topLevel=False) + '/' + self.entity.getCanonicalName(ancestorEntities=1), self.NAME_TYPE_GENERIC), \
-                (self.entity.getCanonicalName(ancestorEntities=False, topLevel=False) + '/' + self.entity.getClassName() + self.entity.getCanonicalName(rootEntity=False, ancestorEntities=False), self.NAME_TYPE_CLASS_ENTITY), \
-                (self.entity.getCanonicalName(ancestorEntities=False, topLevel=False) + '/' + self.entity.getClassName(), self.NAME_TYPE_CLASS), \
-                (self.entity.getClassName() + self.entity.getCanonicalName(rootEntity=False, ancestorEntities=False), self.NAME_TYPE_CLASS_ENTITY), \
-                (self.entity.getClassName(), self.NAME_TYPE_CLASS)
-            ):
+        for filename, nameType in self.getBaselineCandidates():
         
             # single
             try:
@@ -241,8 +303,34 @@ class Finder(FinderAbstract):
                        
         raise ImageMissingException("cannot find image on disk [\"%s%s\"]" % (filename, self.state)) # if we don't have single image or sequence, file cannot be found
 
+    def getBaselineCandidates(self):
+        """
+        Baseline file names of the entity with their name types, in the order they are tried.
+        Kept by the entity until its hierarchy changes, so the finders created for each state of a button reuse them.
+        """
+        
+        try:
+            namesCache = self.entity.getNamesCache()
+        except AttributeError:
+            namesCache = {} # not an Entity
+        
+        candidates = namesCache.get('baselineCandidates')
+        if candidates is None:
+            directory = self.entity.getCanonicalName(ancestorEntities=False, topLevel=False)
+            className = self.entity.getClassName()
+            classEntityName = className + self.entity.getCanonicalName(rootEntity=False, ancestorEntities=False)
+            candidates = namesCache['baselineCandidates'] = (
+                (directory + '/' + self.entity.getCanonicalName(), self.NAME_TYPE_FULL),
+                (directory + '/' + self.entity.getCanonicalName(ancestorEntities=1), self.NAME_TYPE_GENERIC),
+                (directory + '/' + classEntityName, self.NAME_TYPE_CLASS_ENTITY),
+                (directory + '/' + className, self.NAME_TYPE_CLASS),
+                (classEntityName, self.NAME_TYPE_CLASS_ENTITY),
+                (className, self.NAME_TYPE_CLASS),
+            )
+        return candidates
+
     def _locate_baseline(self, relative_image_path):
-        if _BACKEND != BACKEND_SIKULIGO:
+        if _BACKEND not in ADAPTER_BACKENDS:
             return ImageLocator().locate(relative_image_path)[:-4] + ".png"
 
         roots = []
@@ -252,12 +340,15 @@ class Finder(FinderAbstract):
             roots.append(self.config.imageBaseline)
         roots.append(os.getcwd())
 
-        for root in roots:
-            candidate = os.path.abspath(os.path.join(root, relative_image_path))
-            if os.path.isfile(candidate):
-                return candidate
+        candidate = self.baselineIndex.locate(relative_image_path, roots)
+        if candidate is None:
+            raise FileNotFoundException(relative_image_path)
+        return candidate
 
-        raise FileNotFoundException(relative_image_path)
+    def _baseline_exists(self, path):
+        if _BACKEND not in ADAPTER_BACKENDS:
+            return os.path.isfile(path)
+        return self.baselineIndex.isfile(path)
     
     def setRegion(self, region):
 
@@ -297,7 +388,7 @@ class Finder(FinderAbstract):
             match = re.search(r"([^/\\[\]]*?)(?:-[0-9]{1,2}|\[[0-9]{1,2}\]|\[[0-9]{1,2}\]-[0-9]{1,2}|).png", self.path, re.IGNORECASE)
             filename = os.path.dirname(self.path) + "/" + match.group(1) + suffix + ".png"
             
-            if not os.path.isfile(filename):
+            if not self._baseline_exists(filename):
                 break
             
             files.append( filename )
@@ -333,21 +424,69 @@ class Finder(FinderAbstract):
         
         self.logger.trace(" colType=%s" % (self.collectionType))
         
-        startTime = time.time() 
+        attempts = self._attempts(timeout)
+        step = next(attempts)
+        while True:
+            if step is _ATTEMPT:
+                try:
+                    outcome = self.performFind()
+                except ImageSearchExhausted as e:
+                    outcome = e
+            else:
+                time.sleep(step)
+                outcome = None
+            try:
+                step = attempts.send(outcome)
+            except StopIteration as found:
+                return found.value
+    
+    async def findAsync(self, timeout=5):
+        """
+        find() for asyncio: attempts run on a worker thread and the backoff is awaited, so many finders can wait at once.
+        Cancelling stops before the next attempt, an attempt already running finishes in its thread.
+        """
+        
+        await asyncio.to_thread(self.findBaselines)
+        
+        attempts = self._attempts(timeout)
+        step = next(attempts)
+        while True:
+            if step is _ATTEMPT:
+                try:
+                    outcome = await asyncio.to_thread(self.performFind)
+                except ImageSearchExhausted as e:
+                    outcome = e
+            else:
+                await asyncio.sleep(step)
+                outcome = None
+            try:
+                step = attempts.send(outcome)
+            except StopIteration as found:
+                return found.value
+    
+    def _attempts(self, timeout):
+        """
+        Attempt loop of find() and findAsync(), which only differ in how they wait.  Yields _ATTEMPT when the caller
+        has to run performFind() and send back its region or the ImageSearchExhausted it raised, otherwise the seconds 
+        to back off.  Returns the region found, raises FindExhaustedException once the timeout passed.
+        """
+        
+        self.deadline = Deadline(timeout)
+        delays = self.retrySchedule.delays()
         
         attempt = 0
-        while (time.time() - startTime) < timeout:
-            try:            
-                result = self.performFind()
-                self.logger.trace("-- success! [attempt=%i]" % attempt)                
-                return result
-            except ImageSearchExhausted:
-                self.logger.trace("-- failure! [attempt=%i]" % attempt)
+        while not self.deadline.expired():
+            outcome = yield _ATTEMPT
+            if not isinstance(outcome, ImageSearchExhausted):
+                self.logger.trace("-- success! [attempt=%i]" % attempt)
+                return outcome
+            self.logger.trace("-- failure! [attempt=%i]" % attempt)
             attempt += 1
+            
+            # Back off before the next attempt, never past the deadline
+            yield self.deadline.limit(next(delays))
                 
-        raise FindExhaustedException("entity=%s timeout=%ds elapsed=%ds attempts=%d" % (self.entity, timeout, (time.time() - startTime), attempt))
-                                   
- 
+        raise FindExhaustedException("entity=%s timeout=%ds elapsed=%ds attempts=%d" % (self.entity, timeout, self.deadline.elapsed(), attempt))
     
     def performFind(self):
         """
@@ -355,69 +494,218 @@ class Finder(FinderAbstract):
         Works with the Transforms class to load extra data stored in the PNG's to control how they're matched.
         """
         
-        # sequence and series                
-        for series in self.seriesRange:            
-            regions = []
-            lastRegion = self.region
-            nextRegion = self.region if _BACKEND == BACKEND_SIKULIGO else Region(self.region)
+        # One capture per attempt when snapshotting, a new frame is only taken after a full pass fails
+        frame = self._captureFrame()
+        
+        result = self._findSeriesAtHint(frame)
+        if result is None:
+            if self.seriesWorkers > 1 and len(self.seriesRange) > 1:
+                result = self._findSeriesConcurrently(frame)
+            else:
+                result = self._findSeriesSequentially(frame)
+        series, region, transform, matched = result
+        
+        if self._isHinting():
+            self.locationHints.put(self._getHintKey(), series, matched)
+        
+        # Apply entity transforms, only those of the series that matched
+        transform.apply(self.entity, self.transform.CONTEXT_ENTITY)
+        
+        self.lastRegionFound = region
+        self.lastSeriesFound = series
+        return region
+    
+    def _isHinting(self):
+        return self.locationHinting and _BACKEND in ADAPTER_BACKENDS
+    
+    def _getHintKey(self):
+        return "%s|%s%s" % (self.entity.getCanonicalName(), self.filename, self.state)
+    
+    def _findSeriesAtHint(self, frame):
+        """ Match the series last found around its last known location, None when it isn't there """
+        
+        if not self._isHinting():
+            return None
+        
+        key = self._getHintKey()
+        hint = self.locationHints.get(key)
+        if hint is None or hint[0] not in self.seriesRange:
+            return None
+        
+        series, bounds = hint
+        try:
+            region, transform, matched = self._matchSeries(series, frame, hint=bounds)
+        except (FindFailed, BackendError):
+            self.locationHints.miss(key)
+            self.logger.trace("not at last known location %s, searching the whole region" % (bounds,))
+            return None
+        
+        self.locationHints.hit()
+        return series, region, transform, matched
+    
+    def _findSeriesSequentially(self, frame):
+        """ Try each series in order, the first one to match wins """
+        
+        for series in self.seriesRange:
+            try:
+                region, transform, matched = self._matchSeries(series, frame)
+            except (FindFailed, BackendError):
+                continue
+            return series, region, transform, matched
+        
+        raise ImageSearchExhausted()
+    
+    def _findSeriesConcurrently(self, frame):
+        """ 
+        Match every series at the same time, the first one to fully match wins.  The remaining series are cancelled, 
+        series already waiting on the screen stop within seriesWaitSlice.
+        """
+        
+        from concurrent.futures import ThreadPoolExecutor, as_completed # not available on the legacy Jython runtime
+        
+        cancelled = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(self.seriesWorkers, len(self.seriesRange)))
+        futures = {}
+        try:
+            for series in self.seriesRange:
+                futures[executor.submit(self._matchSeries, series, frame, cancelled)] = series
             
-            # try to match all images in the sequence       
-            try:                                
-                for (sequence, filename) in enumerate(self.getImageNames(series=series,state=self.state)):
-                    
-                    transform = self.transform(filename, entity=self.entity, regionsMatched=regions, context=self)     
-                    
-                    # Apply prev search attribs
-                    nextRegion = transform.apply(nextRegion, self.transform.CONTEXT_PREVIOUS)
-                    # Apply search attribs
-
-                    pattern = transform.apply(
-                        Pattern.from_image(filename) if _BACKEND == BACKEND_SIKULIGO else Pattern(filename),
-                        self.transform.CONTEXT_CURRENT,
-                    )
-                    self.logger.trace("Loading %%s", self.logger.getFormatter()(pattern))            
-                    
-                    # find the image on the screen
-                    if _BACKEND == BACKEND_SIKULIGO:
-                        timeout_millis = int(max(1, float(self.config.regionTimeout) * 1000))
-                        lastRegion = nextRegion.wait(pattern, timeout_millis=timeout_millis)
-                    else:
-                        lastRegion = nextRegion.wait(pattern) # If we don't set to zero wait time (dialog handler threads wait indefinitely)
-                    lastRegion = transform.apply(lastRegion, self.transform.CONTEXT_MATCH)
+            for future in as_completed(futures):
+                try:
+                    region, transform, matched = future.result()
+                except (FindFailed, BackendError, SeriesCancelled):
+                    continue
+                return futures[future], region, transform, matched
+        finally:
+            cancelled.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        raise ImageSearchExhausted()
+    
+    def _matchSeries(self, series, frame=None, cancelled=None, hint=None):
+        """ 
+        Match all images in the sequence of one series, returns the final region, the transform of the last image and 
+        the bounds of the matched images.  With a hint (x, y, w, h) the first image is only looked for around it.
+        Raises FindFailed/BackendError when an image isn't on the screen, SeriesCancelled once another series won.
+        """
+        
+        regions = []
+        lastRegion = self.region
+        nextRegion = self.region if _BACKEND in ADAPTER_BACKENDS else Region(self.region)
+        sequence = 0
+        
+        # try to match all images in the sequence       
+        try:                                
+            for (sequence, filename) in enumerate(self.getImageNames(series=series,state=self.state)):
+                
+                if cancelled is not None and cancelled.is_set():
+                    raise SeriesCancelled()
+                
+                transform = self.transform(filename, entity=self.entity, regionsMatched=regions, context=self)     
                     
-                    self.logger.trace("validated %%s %%s in region %%s nameType=%s colType=%s ser=%s seq=%s" % (self.nameType, self.collectionType, series, sequence), self.logger.getFormatter()(pattern), self.logger.getFormatter()(lastRegion), self.logger.getFormatter()(nextRegion))
-                    regions.append( lastRegion ) 
-
-                    # Transform next region with the spacial region
-                    # spacialRegion is only used if there are spacial modifiers
-                    if _BACKEND == BACKEND_SIKULIGO:
-                        nextRegion = transform.apply(nextRegion, self.transform.CONTEXT_NEXT, override=lastRegion)
-                    else:
-                        nextRegion = transform.apply(Region(nextRegion), self.transform.CONTEXT_NEXT, override=lastRegion)
+                # Apply prev search attribs
+                nextRegion = transform.apply(nextRegion, self.transform.CONTEXT_PREVIOUS)
+                
+                # Only look around the last known location, raises BackendError when it's outside the search region
+                if hint is not None and sequence == 0:
+                    nextRegion = nextRegion.scoped(self.locationHints.getWindow(hint))
+                # Apply search attribs
 
-            except (FindFailed, BackendError):
-                self.logger.trace("failed to find on screen %%s in %%s nameType=%s colType=%s ser=%s seq=%s" % (self.nameType, self.collectionType, series, sequence),  self.logger.getFormatter()(self).setLabel("Images"), self.logger.getFormatter()(nextRegion))
-            else:
+                pattern = transform.apply(
+                    Pattern.from_image(filename) if _BACKEND in ADAPTER_BACKENDS else Pattern(filename),
+                    self.transform.CONTEXT_CURRENT,
+                )
+                self.logger.trace("Loading %%s", self.logger.getFormatter()(pattern))            
                 
-                region = None
-                for currentRegion in regions:
-                    if not region:
-                        region = currentRegion if _BACKEND == BACKEND_SIKULIGO else Region(currentRegion)
+                # find the image on the screen
+                if frame is not None:
+                    lastRegion = nextRegion.find(pattern, frame=frame)
+                elif _BACKEND in ADAPTER_BACKENDS:
+                    timeout = self.hintTimeout if hint is not None else self.config.regionTimeout
+                    if self.deadline is not None:
+                        timeout = self.deadline.limit(timeout) # Only what's left of the find() timeout
+                    if cancelled is not None:
+                        lastRegion = self._waitUnlessCancelled(nextRegion, pattern, timeout, cancelled)
                     else:
-                        merged = region.add(currentRegion)
-                        if merged is not None:
-                            region = merged
-
-                region = transform.apply(region, self.transform.CONTEXT_FINAL)
-                
-                # Apply entity transforms
-                transform.apply(self.entity, self.transform.CONTEXT_ENTITY)
+                        timeout_millis = int(max(1, round(float(timeout) * 1000)))
+                        lastRegion = nextRegion.wait(pattern, timeout_millis=timeout_millis)
+                else:
+                    lastRegion = nextRegion.wait(pattern) # If we don't set to zero wait time (dialog handler threads wait indefinitely)
+                lastRegion = transform.apply(lastRegion, self.transform.CONTEXT_MATCH)
                 
-                self.lastRegionFound = region
-                self.lastSeriesFound = series
-                return region
+                self.logger.trace("validated %%s %%s in region %%s nameType=%s colType=%s ser=%s seq=%s" % (self.nameType, self.collectionType, series, sequence), self.logger.getFormatter()(pattern), self.logger.getFormatter()(lastRegion), self.logger.getFormatter()(nextRegion))
+                regions.append( lastRegion ) 
+
+                # Transform next region with the spacial region
+                # spacialRegion is only used if there are spacial modifiers
+                if _BACKEND in ADAPTER_BACKENDS:
+                    nextRegion = transform.apply(nextRegion, self.transform.CONTEXT_NEXT, override=lastRegion)
+                else:
+                    nextRegion = transform.apply(Region(nextRegion), self.transform.CONTEXT_NEXT, override=lastRegion)
+
+        except (FindFailed, BackendError):
+            self.logger.trace("failed to find on screen %%s in %%s nameType=%s colType=%s ser=%s seq=%s" % (self.nameType, self.collectionType, series, sequence),  self.logger.getFormatter()(self).setLabel("Images"), self.logger.getFormatter()(nextRegion))
+            raise
         
-        raise ImageSearchExhausted()
+        region = None
+        if _BACKEND in ADAPTER_BACKENDS and len(regions) > 1 and all(isinstance(r, Region) for r in regions):
+            # One bounding region over all sequence matches instead of a new region per add()
+            region = Region(regions)
+        else:
+            for currentRegion in regions:
+                if not region:
+                    region = currentRegion if _BACKEND in ADAPTER_BACKENDS else Region(currentRegion)
+                else:
+                    merged = region.add(currentRegion)
+                    if merged is not None:
+                        region = merged
+        matched = (region.getX(), region.getY(), region.getW(), region.getH()) if self._isHinting() else None
+
+        region = transform.apply(region, self.transform.CONTEXT_FINAL)
+        return region, transform, matched
+    
+    def _waitUnlessCancelled(self, region, pattern, timeout, cancelled):
+        """ 
+        wait() for a series matched concurrently, in slices of seriesWaitSlice seconds.  A losing series stops within a
+        slice once another one won, instead of keeping the backend busy for the rest of its timeout.
+        """
+        
+        end = time.time() + timeout
+        while True:
+            if cancelled.is_set():
+                raise SeriesCancelled()
+            
+            remaining = max(0.0, end - time.time())
+            if self.deadline is not None:
+                remaining = self.deadline.limit(remaining)
+            
+            seconds = min(self.seriesWaitSlice, remaining)
+            match = region.exists(pattern, timeout_millis=int(max(1, round(seconds * 1000))))
+            if match is not None:
+                return match
+            if remaining <= seconds:
+                raise FindFailed("%s not found in %.1fs" % (pattern, timeout))
+    
+    def _captureFrame(self):
+        """ Capture the frame used for a find attempt, None to let every match grab the screen itself """
+        
+        if not self.frameSnapshot or _BACKEND not in ADAPTER_BACKENDS:
+            return None
+        
+        if not accelerated():
+            # Decoding and cropping a whole screen in pure Python costs more than the waits it saves
+            return None
+        
+        try:
+            frame = self.config.getScreen().capture_frame(max_age_millis=self.frameMaxAge, newer_than=self.lastFrame)
+        except BackendError as e:
+            self.logger.trace("frame capture failed, matching against the live screen: %s" % e)
+            return None
+        
+        self.lastFrame = frame.captured_at
+        return frame
     
     def __str__(self):        
         if self.entity:
@@ -0,0 +1,108 @@
+"""
+Last known location of entities on the screen.
+
+Finder remembers where each entity was matched.  The next search for the
+entity first looks in a small padded window around that location and only
+searches its whole region when the entity isn't there anymore.
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+
+class LocationHints(object):
+
+    VERSION = 1
+
+    padding = 50    # pixels added around the last known location
+
+    def __init__(self, padding=None):
+        super(LocationHints, self).__init__()
+
+        if padding is not None:
+            self.padding = padding
+
+        self.hints = {}     # key -> (series, (x, y, w, h))
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """ (series, bounds) of the last match, None when the location isn't known """
+        return self.hints.get(key)
+
+    def put(self, key, series, bounds):
+        with self.lock:
+            self.hints[key] = (series, tuple(int(value) for value in bounds))
+
+    def getWindow(self, bounds):
+        """ Padded search window around a last known location """
+        x, y, w, h = bounds
+        return (x - self.padding, y - self.padding, w + 2 * self.padding, h + 2 * self.padding)
+
+    def hit(self):
+        with self.lock:
+            self.hits += 1
+
+    def miss(self, key=None):
+        with self.lock:
+            self.misses += 1
+            if key is not None:
+                self.hints.pop(key, None) # Moved, searched in full and re-learned on the next match
+
+    def invalidate(self, key=None):
+        with self.lock:
+            if key is None:
+                self.hints = {}
+            else:
+                self.hints.pop(key, None)
+
+    def getHitRate(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def stats(self):
+        return {
+            "hints": len(self.hints),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.getHitRate(),
+        }
+
+    def save(self, path):
+        """ Persist the known locations so the next run starts with them """
+
+        data = {
+            "version": self.VERSION,
+            "hints": dict((key, [series, list(bounds)]) for key, (series, bounds) in self.hints.items()),
+        }
+        fd, temp = tempfile.mkstemp(prefix=".location-hints-", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "w") as handle:
+                json.dump(data, handle, indent=1, sort_keys=True)
+            os.replace(temp, path)
+        except Exception:
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+            raise
+
+    def load(self, path):
+        """ Add the locations saved by a previous run, returns the number loaded """
+
+        try:
+            with open(path) as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return 0
+
+        if data.get("version") != self.VERSION:
+            return 0
+
+        with self.lock:
+            for key, (series, bounds) in data.get("hints", {}).items():
+                self.hints.setdefault(key, (series, tuple(bounds)))
+        return len(data.get("hints", {}))
@@ -0,0 +1,57 @@
+"""
+Pacing of the Finder retry loop.
+
+Finder.find retries a failed search until its timeout runs out.  The schedule
+spaces the retries with an exponential, jittered backoff and the deadline
+hands every backend wait only what is left of the timeout.
+"""
+
+import random
+import time
+
+
+class Deadline(object):
+    """ Point in time a call has to finish by """
+
+    def __init__(self, timeout, clock=None):
+        self.clock = clock or (lambda: time.time())
+        self.start = self.clock()
+        self.timeout = float(timeout)
+        self.end = self.start + self.timeout
+
+    def remaining(self):
+        return max(0.0, self.end - self.clock())
+
+    def elapsed(self):
+        return self.clock() - self.start
+
+    def expired(self):
+        return self.clock() >= self.end
+
+    def limit(self, timeout):
+        """ The smaller of timeout and the time left """
+        return min(float(timeout), self.remaining())
+
+
+class RetrySchedule(object):
+    """ Delays between attempts: initial, initial*factor, ... capped at maximum, +/- jitter (a fraction) """
+
+    def __init__(self, initial=0.05, factor=2.0, maximum=1.0, jitter=0.2, random=random.random):
+        super(RetrySchedule, self).__init__()
+        self.initial = float(initial)
+        self.factor = float(factor)
+        self.maximum = float(maximum)
+        self.jitter = float(jitter)
+        self.random = random
+
+    def delays(self):
+        """ Endless iterator of the delays before each retry """
+
+        delay = self.initial
+        while True:
+            spread = delay * self.jitter
+            yield max(0.0, delay - spread + (2 * spread * self.random()))
+            delay = min(self.maximum, delay * self.factor)
+
+    def __str__(self):
+        return "RetrySchedule(initial=%s, factor=%s, maximum=%s, jitter=%s)" % (self.initial, self.factor, self.maximum, self.jitter)
@@ -31,12 +31,13 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import pickle
 import re
 import os
-from compat import execfile_compat, text_type
-from config import BACKEND_SIKULIGO, Config
+from compat import text_type
+from config import ADAPTER_BACKENDS, Config
+from region.transformCache import TransformCache
 import time
 
-if Config.backend == BACKEND_SIKULIGO:
-    from adapters.sikuligo_backend import Location, Pattern, Region, Screen
+if Config.backend in ADAPTER_BACKENDS:
+    from adapters.backend import Location, Pattern, Region, Screen
 
     class InputEvent(object):
         BUTTON1_MASK = "left"
@@ -57,6 +58,7 @@ class Transform(object):
     """
         
     logger = None
+    transformCache = TransformCache() # Compiled sidecars shared by every Transform
     
     transforms = None
     regionsMatched = None
@@ -76,6 +78,15 @@ class Transform(object):
     def setLogger(cls, logger):
         cls.logger = logger
         
+    @classmethod
+    def setTransformCache(cls, transformCache):
+        cls.transformCache = transformCache
+        
+    @classmethod
+    def prewarm(cls, roots, imageSuffix=".png"):
+        """ Compile the sidecars of every baseline under the roots ahead of the first find """
+        return cls.transformCache.prewarm(roots, imageSuffix)
+        
     def __init__(self, source, entity=None, regionsMatched=None, context=None, *args, **kargs):
         """ Returns a pattern and attributes given a filename """        
         super(Transform, self).__init__(*args, **kargs)
@@ -103,10 +114,15 @@ class Transform(object):
             
             # Try and get extra attributes
             try:            
-                tempDict = {}
-                execfile_compat(source[:-3] + "py", tempDict)
-                transforms = tempDict['transforms']                
-                assert isinstance(transforms, dict)
+                plan = self.transformCache.getPlan(source[:-3] + "json")
+                code = self.transformCache.getCode(source[:-3] + "py") if plan is None else None
+                if plan is not None: # Declarative sidecar
+                    transforms = plan.build()
+                elif code is not None: # None when the image has no sidecar
+                    tempDict = {}
+                    exec(code, tempDict)
+                    transforms = tempDict['transforms']                
+                    assert isinstance(transforms, dict)
                 
             except TypeError: # If doesn't contain a tEXt section
                 pass   
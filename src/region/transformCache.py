@@ -0,0 +1,126 @@
+"""
+Cache of the compiled transform sidecars of baseline images.
+
+Every baseline image may have a ``.py`` sidecar defining its transforms.
+Transform used to read and compile the sidecar for every image on every find
+attempt.  The cache keeps the compiled code keyed by sidecar path and mtime,
+and remembers images without a sidecar so they don't hit the file system
+(and an IOError) each time.  Declarative .json sidecars are cached the same
+way as parsed TransformPlans.
+
+Only the code is cached: transform objects keep state while they're applied,
+so every Transform still executes the code to get its own instances.
+"""
+
+import os
+import threading
+import time
+
+
+class TransformSource(object):
+    """ Compiled sidecar (code object or TransformPlan), code is None when the sidecar doesn't exist """
+
+    __slots__ = ("path", "mtime", "code", "checked")
+
+    def __init__(self, path, mtime, code, checked):
+        self.path = path
+        self.mtime = mtime
+        self.code = code
+        self.checked = checked
+
+
+class TransformCache(object):
+
+    refreshInterval = 1.0   # seconds between sidecar mtime checks, 0 checks on every lookup
+
+    def __init__(self, refreshInterval=None):
+        super(TransformCache, self).__init__()
+
+        if refreshInterval is not None:
+            self.refreshInterval = refreshInterval
+
+        self.sources = {}
+        self.compiles = 0
+        self.lock = threading.Lock()
+
+    def getCode(self, path):
+        """ Return the compiled code of a .py sidecar, None if it doesn't exist """
+        return self.get(path, self.compile)
+
+    def getPlan(self, path):
+        """ Return the TransformPlan of a .json sidecar, None if it doesn't exist """
+        return self.get(path, self.parse)
+
+    def get(self, path, load):
+
+        now = time.time()
+
+        source = self.sources.get(path)
+        if source is not None and (now - source.checked) < self.refreshInterval:
+            return source.code
+
+        mtime = self.getMtime(path)
+
+        if source is None or source.mtime != mtime:
+            source = TransformSource(path, mtime, load(path) if mtime is not None else None, now)
+            with self.lock:
+                self.sources[path] = source
+        else:
+            source.checked = now
+
+        return source.code
+
+    def compile(self, path):
+        """ Read and compile a sidecar, None if it vanished since it was stat'ed """
+
+        try:
+            with open(path, "rb") as handle:
+                text = handle.read().decode("utf-8")
+        except IOError:
+            return None
+
+        self.compiles += 1
+        return compile(text, path, "exec")
+
+    def parse(self, path):
+        """ Read and parse a declarative sidecar, None if it vanished since it was stat'ed """
+
+        from region.transformPlan import TransformPlan # region.transformPlan is also run as a script
+
+        try:
+            plan = TransformPlan.load(path)
+        except IOError:
+            return None
+
+        self.compiles += 1
+        return plan
+
+    def prewarm(self, roots, imageSuffix=".png"):
+        """ Compile the sidecars of every image under the roots, and remember the images without one """
+
+        count = 0
+        for root in roots:
+            for path, _dirs, files in os.walk(root):
+                for filename in files:
+                    if not filename.lower().endswith(imageSuffix.lower()):
+                        continue
+                    base = os.path.join(path, filename)[:-3] # same derivation as Transform
+                    if self.getPlan(base + "json") is not None or self.getCode(base + "py") is not None:
+                        count += 1
+        return count
+
+    def invalidate(self, path=None):
+        """ Forget a sidecar (or all of them) """
+
+        with self.lock:
+            if path is None:
+                self.sources = {}
+            else:
+                self.sources.pop(path, None)
+
+    @staticmethod
+    def getMtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,283 @@
+"""
+Declarative transform sidecars.
+
+A baseline image may define its transforms in a JSON sidecar (``Button.json``
+next to ``Button.png``) instead of a Python script:
+
+    {
+     "version": 1,
+     "transforms": {
+      "PREVIOUS": [{"type": "RegionNearby", "args": [10]}],
+      "NEXT": [{"type": "RegionBelow"}],
+      "ENTITY": [{"type": "ClickableEntityClickStrategy", "args": [{"type": "QuickClick"}]}]
+     }
+    }
+
+Keys of "transforms" are the Transform.CONTEXT_* values.  Only the types listed
+in TransformPlan.TYPES can be used, nothing in the sidecar is executed.  A
+sidecar parses into an immutable, picklable TransformPlan which builds fresh
+transform objects for every Transform.
+
+Existing .py sidecars are converted without executing them:
+
+    export SIKULI_FRAMEWORK_BACKEND=sikuligo PYTHONPATH=src
+    python -m region.transformPlan convert examples/calculator/baseline
+    python -m region.transformPlan convert examples/calculator/baseline --write
+"""
+
+import argparse
+import ast
+import collections
+import importlib
+import json
+import os
+import sys
+
+
+class TransformStep(collections.namedtuple("TransformStep", ("type", "args", "kwargs"))):
+    """ One transform, eg. RegionMorph(0, 0, 100, 200).  Arguments may themselves be steps """
+
+    __slots__ = ()
+
+    def __new__(cls, type, args=(), kwargs=()):
+        return super(TransformStep, cls).__new__(cls, type, tuple(args), tuple(sorted(dict(kwargs).items())))
+
+    def build(self):
+        factory = TransformPlan.resolve(self.type)
+        args = [self._build(arg) for arg in self.args]
+        kwargs = dict((key, self._build(value)) for key, value in self.kwargs)
+        return factory(*args, **kwargs)
+
+    @classmethod
+    def _build(cls, value):
+        return value.build() if isinstance(value, TransformStep) else value
+
+    def toDict(self):
+        result = {"type": self.type}
+        if self.args:
+            result["args"] = [_valueToJson(arg) for arg in self.args]
+        if self.kwargs:
+            result["kwargs"] = dict((key, _valueToJson(value)) for key, value in self.kwargs)
+        return result
+
+    @classmethod
+    def fromDict(cls, data):
+        if not isinstance(data, dict) or "type" not in data:
+            raise ValueError("expecting {\"type\": ...} got [%r]" % (data,))
+        if data["type"] not in TransformPlan.TYPES:
+            raise ValueError("unknown transform type [%s]" % data["type"])
+        return cls(
+            data["type"],
+            [_valueFromJson(arg) for arg in data.get("args", [])],
+            dict((key, _valueFromJson(value)) for key, value in data.get("kwargs", {}).items()),
+        )
+
+    def __str__(self):
+        args = [str(arg) if isinstance(arg, TransformStep) else repr(arg) for arg in self.args]
+        args += ["%s=%r" % item for item in self.kwargs]
+        return "%s(%s)" % (self.type, ", ".join(args))
+
+
+def _valueToJson(value):
+    if isinstance(value, TransformStep):
+        return value.toDict()
+    if isinstance(value, tuple):
+        return [_valueToJson(item) for item in value]
+    return value
+
+
+def _valueFromJson(value):
+    if isinstance(value, dict):
+        return TransformStep.fromDict(value)
+    if isinstance(value, list):
+        return tuple(_valueFromJson(item) for item in value) # Keep plans hashable and immutable
+    return value
+
+
+class TransformPlan(collections.namedtuple("TransformPlan", ("contexts",))):
+    """ Immutable transforms of one image: ((context, (TransformStep, ..)), ..) """
+
+    __slots__ = ()
+
+    VERSION = 1
+    SUFFIX = ".json"
+
+    CONTEXTS = ("PREVIOUS", "CURRENT", "NEXT", "MATCH", "FINAL", "ENTITY")
+
+    # Types usable in a declarative sidecar -> module defining them
+    TYPES = {
+        "PatternSimilarity": "region.transform",
+        "PatternTargetOffset": "region.transform",
+        "ActionClick": "region.transform",
+        "RegionClickOffset": "region.transform",
+        "RegionMorph": "region.transform",
+        "RegionScreen": "region.transform",
+        "RegionPreviouslyMatched": "region.transform",
+        "RegionMaxMinMatched": "region.transform",
+        "RegionAbove": "region.transform",
+        "RegionBelow": "region.transform",
+        "RegionRight": "region.transform",
+        "RegionLeft": "region.transform",
+        "RegionNearby": "region.transform",
+        "RegionParent": "region.transform",
+        "RegionLimitByParent": "region.transform",
+        "ClickableEntityClickStrategy": "region.transform",
+        "StandardClick": "entity.clickStrategy",
+        "QuickClick": "entity.clickStrategy",
+        "ClickAfterVisualChange": "entity.clickStrategy",
+    }
+
+    def __new__(cls, contexts):
+        if isinstance(contexts, dict):
+            contexts = contexts.items()
+        return super(TransformPlan, cls).__new__(cls, tuple(sorted((context, tuple(steps)) for context, steps in contexts)))
+
+    @classmethod
+    def resolve(cls, name):
+        return getattr(importlib.import_module(cls.TYPES[name]), name)
+
+    def build(self):
+        """ New transform objects for every context, the dictionary a .py sidecar would define """
+
+        transforms = dict((context, []) for context in self.CONTEXTS)
+        for context, steps in self.contexts:
+            transforms[context] = [step.build() for step in steps]
+        return transforms
+
+    def getSteps(self, context):
+        return dict(self.contexts).get(context, ())
+
+    def toDict(self):
+        return {
+            "version": self.VERSION,
+            "transforms": dict((context, [step.toDict() for step in steps]) for context, steps in self.contexts),
+        }
+
+    @classmethod
+    def fromDict(cls, data):
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            raise ValueError("unsupported transform sidecar version [%r]" % (data.get("version") if isinstance(data, dict) else data))
+
+        contexts = {}
+        for context, steps in data.get("transforms", {}).items():
+            if context not in cls.CONTEXTS:
+                raise ValueError("unknown transform context [%s]" % context)
+            contexts[context] = [TransformStep.fromDict(step) for step in steps]
+        return cls(contexts)
+
+    @classmethod
+    def parse(cls, text, path="<string>"):
+        try:
+            return cls.fromDict(json.loads(text))
+        except ValueError as e:
+            raise ValueError("%s: %s" % (path, e))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as handle:
+            return cls.parse(handle.read().decode("utf-8"), path)
+
+    def dumps(self):
+        return json.dumps(self.toDict(), indent=1, sort_keys=True)
+
+    @classmethod
+    def fromPython(cls, text, path="<string>"):
+        """ Convert the source of a .py sidecar without executing it """
+
+        tree = ast.parse(text, path)
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == "transforms" for target in node.targets):
+                if not isinstance(node.value, ast.Dict):
+                    raise ValueError("%s: transforms isn't a dictionary literal" % path)
+                contexts = {}
+                for key, value in zip(node.value.keys, node.value.values):
+                    context = _contextFromAst(key, path)
+                    if not isinstance(value, (ast.List, ast.Tuple)):
+                        raise ValueError("%s: transforms of %s aren't a list" % (path, context))
+                    contexts[context] = [_stepFromAst(step, path) for step in value.elts]
+                return cls(contexts)
+        raise ValueError("%s: no transforms dictionary" % path)
+
+
+def _contextFromAst(node, path):
+    # Transform.CONTEXT_NEXT or "NEXT"
+    if isinstance(node, ast.Attribute) and node.attr.startswith("CONTEXT_"):
+        context = node.attr[len("CONTEXT_"):]
+    else:
+        try:
+            context = ast.literal_eval(node)
+        except ValueError:
+            context = None
+    if context not in TransformPlan.CONTEXTS:
+        raise ValueError("%s:%d: unsupported transform context" % (path, node.lineno))
+    return context
+
+
+def _stepFromAst(node, path):
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name) or node.func.id not in TransformPlan.TYPES:
+        raise ValueError("%s:%d: only calls of %s are supported" % (path, node.lineno, ", ".join(sorted(TransformPlan.TYPES))))
+    return TransformStep(
+        node.func.id,
+        [_argumentFromAst(arg, path) for arg in node.args],
+        dict((keyword.arg, _argumentFromAst(keyword.value, path)) for keyword in node.keywords),
+    )
+
+
+def _argumentFromAst(node, path):
+    if isinstance(node, ast.Call):
+        return _stepFromAst(node, path)
+    try:
+        return _valueFromJson(ast.literal_eval(node))
+    except ValueError:
+        raise ValueError("%s:%d: transform arguments must be literals" % (path, node.lineno))
+
+
+def convert(path, write=False):
+    """ Convert a .py sidecar, returns (json path, plan) """
+
+    with open(path, "rb") as handle:
+        plan = TransformPlan.fromPython(handle.read().decode("utf-8"), path)
+
+    target = path[:-3] + TransformPlan.SUFFIX
+    if write:
+        with open(target, "w") as handle:
+            handle.write(plan.dumps() + "\n")
+    return target, plan
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog="transformPlan", description="Convert .py transform sidecars to declarative JSON")
+    parser.add_argument("command", choices=("convert",))
+    parser.add_argument("paths", nargs="+", help="sidecars or baseline directories")
+    parser.add_argument("--write", action="store_true", help="write <image>.json next to each sidecar (default: dry run)")
+    parser.add_argument("--suffix", default=".png", help="image suffix, only sidecars of an image are converted")
+    args = parser.parse_args(argv)
+
+    sidecars = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for directory, _dirs, files in os.walk(path):
+                images = set(filename[:-len(args.suffix)] for filename in files if filename.endswith(args.suffix))
+                sidecars.extend(os.path.join(directory, filename) for filename in sorted(files) if filename.endswith(".py") and filename[:-3] in images)
+        else:
+            sidecars.append(path)
+
+    failed = 0
+    for sidecar in sidecars:
+        try:
+            target, plan = convert(sidecar, write=args.write)
+        except (SyntaxError, ValueError) as e:
+            failed += 1
+            print("skipped: %s" % e)
+            continue
+        print("%s %s" % ("wrote" if args.write else "would write", target))
+        for context, steps in plan.contexts:
+            if steps:
+                print("  %s: %s" % (context, ", ".join(str(step) for step in steps)))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -34,6 +34,7 @@ import time
 from entity import Entity
 from entity.entities import ClickableEntity
 from log import EntityLoggerProxy
+from log.traceContext import traced
 from compat import text_type
 
 
@@ -56,6 +57,7 @@ class SikuliFwRfAbstractLib(object):
     def displayConfig(self):
         self.logger.info("%s" % Config.toString())
         
+    @traced()
     def validate(self, *args):
         """
         Validates an entity, finding it on the screen
@@ -80,6 +82,7 @@ class SikuliFwRfAbstractLib(object):
         return self.store(context)
         
 
+    @traced()
     def select(self, *args):
         
         # Set the context, take it if it's the first in the list        
@@ -97,6 +100,7 @@ class SikuliFwRfAbstractLib(object):
         # Let the entity do the selectin
         return self.store(context)
     
+    @traced()
     def click(self, *args):
         
         # Set the context, take it if it's the first in the list        
@@ -121,6 +125,7 @@ class SikuliFwRfAbstractLib(object):
         return self.store(context)
     
     
+    @traced()
     def type(self, *args):
 
         try:
@@ -147,6 +152,7 @@ class SikuliFwRfAbstractLib(object):
                     
         return self.store(context.type(text))
 
+    @traced()
     def waitUntilVanish(self, target=None, timeout=None):
         
         if target:
@@ -168,6 +174,7 @@ class SikuliFwRfAbstractLib(object):
         
         return self.store(context.waitUntilVanish(**kargs))
     
+    @traced()
     def waitUntilAppears(self, target=None, timeout=None):
         
         if target:
@@ -254,6 +261,7 @@ class SikuliFwRfAbstractLib(object):
     def captureScreen(self):
         self.logger.info("Screen=%%s", self.logger.getFormatter()(Config.screen))
         
+    @traced()
     def assertBaseline(self, *args):
         
         # Set the context, take it if it's the first in the list        
@@ -265,6 +273,7 @@ class SikuliFwRfAbstractLib(object):
             
         context.assertBaseline(args[0])
 
+    @traced()
     def assertEquals(self, *args):
         
         # Set the context, take it if it's the first in the list        
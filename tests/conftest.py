@@ -10,6 +10,8 @@ import pytest
 # Run migration tests against the new backend path by default.
 os.environ.setdefault("SIKULI_FRAMEWORK_BACKEND", "sikuligo")
 
+from finder_stubs import ConfigStub, EntityStub, IdentityTransform, Logger, PatternFake  # noqa: E402
+
 
 def _workspace_root() -> Path:
     return Path(__file__).resolve().parents[2]
@@ -29,3 +31,31 @@ def sikuligo_binary() -> Path:
 @pytest.fixture()
 def free_port() -> int:
     return random.randint(50000, 59000)
+
+
+@pytest.fixture()
+def stub_finder(tmp_path, monkeypatch):
+    """
+    Wire Finder to the finder_stubs searching `screen`, with the baselines of `entity` under tmp_path.
+
+    stub_finder(screen, baselines=("Widget.png",), **settings) returns the entity to build
+    Finders for; settings override Finder class attributes (seriesWorkers, retrySchedule, ...).
+    """
+    import region.finder as finder_module
+
+    def install(screen, baselines=("Widget.png",), entity="Widget", regionTimeout=2,
+                transform=IdentityTransform, pattern=PatternFake, **settings):
+        for baseline in baselines:
+            path = tmp_path / entity / baseline
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+        monkeypatch.setattr(finder_module.Finder, "logger", lambda _entity: Logger())
+        monkeypatch.setattr(finder_module.Finder, "config", ConfigStub(tmp_path, screen, regionTimeout))
+        monkeypatch.setattr(finder_module.Finder, "transform", transform)
+        for name, value in settings.items():
+            monkeypatch.setattr(finder_module.Finder, name, value)
+        monkeypatch.setattr(finder_module, "Pattern", pattern)
+        return EntityStub(entity)
+
+    return install
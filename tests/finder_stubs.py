@@ -0,0 +1,102 @@
+"""Stand-ins for what Finder takes from the framework (logger, config, transforms, entity)."""
+
+from __future__ import annotations
+
+
+class Formatter:
+    def setLabel(self, *_args, **_kwargs):
+        return self
+
+    def showBaseline(self):
+        return self
+
+    def showBaselines(self):
+        return self
+
+    def setLogLevel(self, *_args, **_kwargs):
+        return self
+
+    def __str__(self):
+        return "fmt"
+
+
+class Logger:
+    def trace(self, *_args, **_kwargs):
+        return None
+
+    def debug(self, *_args, **_kwargs):
+        return None
+
+    def info(self, *_args, **_kwargs):
+        return None
+
+    def warn(self, *_args, **_kwargs):
+        return None
+
+    def error(self, *_args, **_kwargs):
+        return None
+
+    def getFormatter(self):
+        return lambda _entity: Formatter()
+
+
+class IdentityTransform:
+    CONTEXT_PREVIOUS = "PREVIOUS"
+    CONTEXT_NEXT = "NEXT"
+    CONTEXT_CURRENT = "CURRENT"
+    CONTEXT_FINAL = "FINAL"
+    CONTEXT_MATCH = "MATCH"
+    CONTEXT_ENTITY = "ENTITY"
+
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def apply(self, operand, *_args, **_kwargs):
+        return operand
+
+
+class PatternFake:
+    def __init__(self, image: str):
+        self.image = image
+
+    @classmethod
+    def from_image(cls, image: str):
+        return cls(image)
+
+    def __str__(self):
+        return f"Pattern({self.image})"
+
+
+class EntityStub:
+    def __init__(self, name: str = "Widget"):
+        self.name = name
+
+    def getCanonicalName(self, **_kwargs):
+        return self.name
+
+    def getClassName(self):
+        return self.name.rsplit(".", 1)[-1]
+
+    @property
+    def parent(self):
+        return None
+
+    def __str__(self):
+        return self.name
+
+
+class ConfigStub:
+    backend = "sikuligo"
+    imageSuffix = ".png"
+
+    def __init__(self, root, screen, regionTimeout: int = 2):
+        self.imageBaseline = str(root)
+        self.imageSearchPaths = [str(root)]
+        self.regionTimeout = regionTimeout
+        self._screen = screen
+
+    def getScreen(self):
+        return self._screen
+
+    def getImageSearchPaths(self):
+        return list(self.imageSearchPaths)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from entity.entity import Entity
+from error import SikuliFrameworkException
+from finder_stubs import Logger
+from region.exception import FindExhaustedException, ImageSearchExhausted
+from region.finder import Finder
+from region.retrySchedule import RetrySchedule
+
+
+@pytest.fixture()
+def finder(monkeypatch):
+    monkeypatch.setattr(Finder, "logger", lambda _entity: Logger())
+    monkeypatch.setattr(SikuliFrameworkException, "logger", lambda _entity: Logger())
+    monkeypatch.setattr(Finder, "retrySchedule", RetrySchedule(initial=0.01, factor=1, maximum=0.01, jitter=0))
+
+    def make(perform):
+        instance = Finder.__new__(Finder)
+        instance.logger = Logger()
+        instance.entity = "Widget"
+        instance.findBaselines = lambda: None
+        instance.performFind = perform
+        return instance
+
+    return make
+
+
+def test_find_async_retries_until_found(finder):
+    attempts = []
+
+    def perform():
+        attempts.append(threading.current_thread())
+        if len(attempts) < 3:
+            raise ImageSearchExhausted()
+        return "region"
+
+    assert asyncio.run(finder(perform).findAsync(timeout=5)) == "region"
+    assert len(attempts) == 3
+    assert threading.main_thread() not in attempts
+
+
+def test_find_async_gives_up_at_deadline(finder):
+    def perform():
+        raise ImageSearchExhausted()
+
+    with pytest.raises(FindExhaustedException):
+        asyncio.run(finder(perform).findAsync(timeout=0.1))
+
+
+def test_finders_wait_at_the_same_time(finder):
+    def perform():
+        time.sleep(0.2)
+        return "region"
+
+    async def main():
+        return await asyncio.gather(*(finder(perform).findAsync(timeout=5) for _ in range(4)))
+
+    started = time.monotonic()
+    assert asyncio.run(main()) == ["region"] * 4
+    assert time.monotonic() - started < 0.6
+
+
+def test_find_async_can_be_cancelled(finder):
+    attempts = []
+
+    def perform():
+        attempts.append(1)
+        raise ImageSearchExhausted()
+
+    async def main():
+        task = asyncio.ensure_future(finder(perform).findAsync(timeout=30))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return len(attempts)
+
+    started = time.monotonic()
+    count = asyncio.run(main())
+    time.sleep(0.05)
+    assert len(attempts) == count  # no attempts after the cancellation
+    assert time.monotonic() - started < 1
+
+
+class _RegionFinder:
+    def __init__(self, result, delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.regions = []
+
+    def setRegion(self, region):
+        self.regions.append(region)
+
+    async def findAsync(self, timeout=5):
+        self.finds = getattr(self, "finds", 0) + 1
+        await asyncio.sleep(self.delay)
+        if self.result is None:
+            raise ImageSearchExhausted()
+        return self.result
+
+
+class _EntityStub:
+    STATUS_VALID = Entity.STATUS_VALID
+    validateAsync = Entity.validateAsync
+    performValidationAsync = Entity.performValidationAsync
+    runOffLoop = Entity.runOffLoop
+    needsValidation = Entity.needsValidation
+    prepareSearch = Entity.prepareSearch
+    identified = Entity.identified
+    expireValidation = Entity.expireValidation
+    reuseValidation = Entity.reuseValidation
+    rememberValidation = Entity.rememberValidation
+    isValidationCurrent = Entity.isValidationCurrent
+    validationTtl = None
+    validationFingerprint = None
+    validation = None
+    validationCallers = 0
+
+    def __init__(self, regionFinder, parent=None, statusCascade=False):
+        self.status = Entity.STATUS_INVALID
+        self.statusCascade = statusCascade
+        self.parentRegion = None
+        self.parent = parent
+        self.timeout = 5
+        self.logger = Logger()
+        self.regionFinder = regionFinder
+        self.region = None
+
+    def isValid(self):
+        return self.status == Entity.STATUS_VALID
+
+
+def test_validate_async_validates_many_entities_at_once():
+    window = _EntityStub(_RegionFinder("window"))
+    window.status = Entity.STATUS_VALID
+    window.region = "window region"
+    buttons = [_EntityStub(_RegionFinder("button %d" % i, delay=0.2), parent=window) for i in range(5)]
+
+    async def main():
+        return await asyncio.gather(*(button.validateAsync() for button in buttons))
+
+    started = time.monotonic()
+    assert asyncio.run(main()) == buttons
+    assert time.monotonic() - started < 0.6
+    assert [button.region for button in buttons] == ["button %d" % i for i in range(5)]
+    assert all(button.regionFinder.regions == ["window region"] for button in buttons)
+
+
+def test_validate_async_cascades_to_parent():
+    window = _EntityStub(_RegionFinder("window"))
+    button = _EntityStub(_RegionFinder("button"), parent=window, statusCascade=True)
+
+    asyncio.run(button.validateAsync())
+    assert window.isValid() and button.isValid()
+    assert button.regionFinder.regions == ["window"]
+
+
+def test_children_share_the_validation_of_their_parent():
+    window = _EntityStub(_RegionFinder("window", delay=0.1))
+    buttons = [_EntityStub(_RegionFinder("button %d" % i), parent=window, statusCascade=True) for i in range(3)]
+
+    async def main():
+        return await asyncio.gather(*(button.validateAsync() for button in buttons))
+
+    assert asyncio.run(main()) == buttons
+    assert window.regionFinder.finds == 1
+    assert all(button.regionFinder.regions == ["window"] for button in buttons)
+
+
+def test_validation_is_cancelled_with_its_last_caller():
+    window = _EntityStub(_RegionFinder("window", delay=0.2))
+
+    async def validateTwice(cancelBoth):
+        window.status = Entity.STATUS_INVALID
+        callers = [asyncio.ensure_future(window.validateAsync()) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for caller in callers[:2 if cancelBoth else 1]:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        return callers[1], window.validation
+
+    second, validation = asyncio.run(validateTwice(cancelBoth=False))
+    assert second.result() is window and window.isValid()  # still ran for the second caller
+
+    second, validation = asyncio.run(validateTwice(cancelBoth=True))
+    assert second.cancelled() and validation.cancelled()
+    assert not window.isValid()
+
+
+def test_validate_async_failure(monkeypatch):
+    from entity.exception import UpdateFailureException
+
+    monkeypatch.setattr(SikuliFrameworkException, "logger", lambda _entity: Logger())
+    button = _EntityStub(_RegionFinder(None))
+    with pytest.raises(UpdateFailureException):
+        asyncio.run(button.validateAsync())
+    assert not button.isValid()
+
+
+def test_adapter_async_methods():
+    np = pytest.importorskip("numpy")
+    from adapters.frame import encode_png
+    from adapters.local_backend import Screen
+
+    pixels = np.random.default_rng(5).integers(0, 256, size=(60, 80), dtype=np.uint8)
+    screen = Screen.from_image(encode_png(80, 60, pixels.tobytes()))
+    first = encode_png(10, 10, pixels[5:15, 5:15].tobytes())
+    second = encode_png(10, 10, pixels[40:50, 60:70].tobytes())
+
+    async def main():
+        found = await asyncio.gather(screen.find_async(first), screen.exists_async(second))
+        await screen.click_point_async(3, 4)
+        await screen.type_text_async("hi")
+        return found
+
+    one, two = asyncio.run(main())
+    assert (one.getX(), one.getY(), two.getX(), two.getY()) == (5, 5, 60, 40)
+    assert screen.input.events == [("click", 3, 4, "left"), ("type", "hi")]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+
+import region.finder as finder_module
+from finder_stubs import Logger
+from region.baselineIndex import BaselineIndex
+from region.finder import Finder
+
+
+class _EntityStub:
+    def __init__(self, name: str):
+        self.name = name
+
+    def getCanonicalName(self, **_kwargs):
+        return self.name
+
+    def getClassName(self):
+        return "Window"
+
+    def __str__(self):
+        return self.name
+
+
+class _ConfigStub:
+    backend = "sikuligo"
+    imageSuffix = ".png"
+
+    def __init__(self, *roots):
+        self.imageSearchPaths = [str(root) for root in roots]
+        self.imageBaseline = self.imageSearchPaths[-1]
+
+    def getScreen(self):
+        return None
+
+    def getImageSearchPaths(self):
+        return list(self.imageSearchPaths)
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+
+def _new_finder(monkeypatch, cfg, name, index):
+    monkeypatch.setattr(Finder, "logger", lambda _entity: Logger())
+    monkeypatch.setattr(Finder, "config", cfg)
+    monkeypatch.setattr(Finder, "baselineIndex", index)
+    return Finder(_EntityStub(name))
+
+
+def test_parse_name_splits_series_sequence_and_state():
+    assert BaselineIndex.parseName("Calculator.png") == ("Calculator", None, None, "")
+    assert BaselineIndex.parseName("Calculator[2].png") == ("Calculator", 2, None, "")
+    assert BaselineIndex.parseName("Calculator,lcdDisplay-1.png") == ("Calculator,lcdDisplay", None, 1, "")
+    assert BaselineIndex.parseName("Calculator[1]-0[disabled].png") == ("Calculator", 1, 0, "[disabled]")
+    assert BaselineIndex.parseName("Calculator[0].py") is None
+
+
+def test_finder_resolves_series_from_index_without_file_probes(tmp_path, monkeypatch):
+    for series in range(3):
+        _touch(tmp_path / "App" / f"App[{series}].png")
+
+    index = BaselineIndex(refreshInterval=60)
+    finder = _new_finder(monkeypatch, _ConfigStub(tmp_path), "App", index)
+
+    def _no_probe(_path):
+        raise AssertionError("os.path.isfile must not be used for baseline lookups")
+
+    monkeypatch.setattr(finder_module.os.path, "isfile", _no_probe)
+
+    assert list(finder.getSeriesRange()) == [0, 1, 2]
+    assert finder.collectionType == Finder.COL_TYPE_SERIES
+    assert finder.getImageNames(series=1) == [os.path.join(str(tmp_path), "App", "App[1].png")]
+    assert index.scans == 1  # App/ listed once, missing directories under other roots are never listed
+
+
+def test_index_prefers_earlier_search_roots(tmp_path):
+    specific = tmp_path / "os" / "mac"
+    _touch(specific / "App" / "App.png")
+    _touch(tmp_path / "App" / "App.png")
+
+    index = BaselineIndex()
+    assert index.locate("App/App.png", [specific, tmp_path]) == str(specific / "App" / "App.png")
+    assert index.locate("App/Missing.png", [specific, tmp_path]) is None
+
+
+def test_index_rescans_directory_when_mtime_changes(tmp_path):
+    _touch(tmp_path / "App" / "App-0.png")
+
+    index = BaselineIndex(refreshInterval=0)
+    assert index.isfile(str(tmp_path / "App" / "App-0.png"))
+    assert not index.isfile(str(tmp_path / "App" / "App-1.png"))
+
+    _touch(tmp_path / "App" / "App-1.png")
+    os.utime(tmp_path / "App", ns=(0, os.stat(tmp_path / "App").st_mtime_ns + 1_000_000_000))
+
+    assert index.isfile(str(tmp_path / "App" / "App-1.png"))
+    assert [entry.sequence for entry in index.getEntries("App", [tmp_path])] == [0, 1]
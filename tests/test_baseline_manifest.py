@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+
+from region.baselineIndex import BaselineIndex
+from region.baselineManifest import BaselineManifest, main
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+
+def _baseline_tree(root):
+    _touch(root / "App" / "App[0]-0.png")
+    _touch(root / "App" / "App[0]-1[disabled].png")
+    _touch(root / "App" / "App,button.png")
+    _touch(root / "os" / "mac" / "App" / "App.png")
+    return root
+
+
+def test_manifest_round_trip_skips_directory_scans(tmp_path):
+    baseline = _baseline_tree(tmp_path / "baseline")
+    path = BaselineManifest.getPath(str(baseline))
+    assert path == str(tmp_path / "baseline.manifest.json")
+
+    BaselineManifest.save(BaselineManifest.build(BaselineIndex(), [baseline]), path)
+
+    index = BaselineIndex(refreshInterval=0)
+    assert BaselineManifest.load(index, path) == 5  # baseline, App, os, os/mac, os/mac/App
+    assert index.locate("App/App[0]-1[disabled].png", [baseline]) == str(baseline / "App" / "App[0]-1[disabled].png")
+    assert index.locate("App/App.png", [baseline / "os" / "mac", baseline]) == str(baseline / "os" / "mac" / "App" / "App.png")
+    assert index.scans == 0
+    assert index.dirty is False
+
+    entries = {os.path.basename(entry.path): entry for entry in index.getEntries("App", [baseline])}
+    assert entries["App[0]-1[disabled].png"].toTuple()[:4] == ("App", 0, 1, "[disabled]")
+
+
+def test_manifest_directory_is_rescanned_when_stale(tmp_path):
+    baseline = _baseline_tree(tmp_path / "baseline")
+    path = BaselineManifest.getPath(str(baseline))
+    assert main(["build", str(baseline)]) == 0
+    assert main(["verify", str(baseline)]) == 0
+
+    _touch(baseline / "App" / "App[1]-0.png")
+    os.utime(baseline / "App", ns=(0, os.stat(baseline / "App").st_mtime_ns + 1_000_000_000))
+
+    assert BaselineManifest.verify(path, [baseline]) == [str(baseline / "App")]
+    assert main(["verify", str(baseline)]) == 1
+
+    index = BaselineIndex(refreshInterval=0)
+    BaselineManifest.load(index, path)
+    assert index.isfile(str(baseline / "App" / "App[1]-0.png"))
+    assert index.scans == 1
+    assert index.dirty is True
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from entity.entity import Entity
+from region.finder import Finder
+
+
+class _Logger:
+    def trace(self, *_args, **_kwargs):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def _entities(monkeypatch):
+    monkeypatch.setattr(Entity, "logger", lambda _entity: _Logger())
+    monkeypatch.setattr(Entity, "regionFinderStrategy", lambda _entity: None)
+    monkeypatch.setattr(Finder, "logger", lambda _finder: _Logger())
+
+
+class Notebook(Entity):
+    family = True
+
+
+class FileMenu(Entity):
+    pass
+
+
+class SaveDialog(Entity):
+    family = True
+
+
+class Button(Entity):
+    pass
+
+
+@pytest.fixture()
+def button():
+    return Button(SaveDialog(FileMenu(Notebook(None))), name="OkButton")
+
+
+def _fresh(entity, **kwargs):
+    Entity.hierarchyVersion += 1  # drops every cached name
+    return entity.getCanonicalName(**kwargs)
+
+
+def test_cached_names_match_built_names(button):
+    for rootEntity, ancestorEntities, topLevel in itertools.product((True, False), (99, 2, 1, 0, True, False), (True, False)):
+        kwargs = dict(rootEntity=rootEntity, ancestorEntities=ancestorEntities, topLevel=topLevel)
+        expected = _fresh(button, **kwargs)
+        assert button.getCanonicalName(**kwargs) == expected
+        assert button.getCanonicalName(**kwargs) == expected  # from the cache
+
+    assert button.getCanonicalName() == "Notebook.FileMenu.SaveDialog,okButton"
+    assert button.getCanonicalName(ancestorEntities=1) == "Notebook.SaveDialog,okButton"
+    assert button.getCanonicalName(ancestorEntities=True) == "Notebook.FileMenu.SaveDialog,okButton"
+    assert str(button) == "Notebook.FileMenu.SaveDialog,okButton:Button"
+
+
+def test_names_follow_hierarchy_changes(button):
+    dialog = button.parent
+    assert str(button) == "Notebook.FileMenu.SaveDialog,okButton:Button"
+
+    dialog.parent = dialog.parent.parent
+    assert str(button) == "Notebook.SaveDialog,okButton:Button"
+    button.name = "CancelButton"
+    assert button.getCanonicalName() == "Notebook.SaveDialog,cancelButton"
+
+    version = Entity.hierarchyVersion
+    Button(dialog, name="HelpButton")  # naming a new entity keeps the cached names
+    assert Entity.hierarchyVersion == version
+
+
+def test_baseline_candidates_are_built_once(button):
+    candidates = Finder(button, region="screen").getBaselineCandidates()
+
+    assert [filename for filename, _nameType in candidates] == [
+        "Notebook/Notebook.FileMenu.SaveDialog,okButton",
+        "Notebook/Notebook.SaveDialog,okButton",
+        "Notebook/Button,okButton",
+        "Notebook/Button",
+        "Button,okButton",
+        "Button",
+    ]
+    assert Finder(button, region="screen", state="disabled").getBaselineCandidates() is candidates
+
+    button.name = "CancelButton"
+    assert Finder(button, region="screen").getBaselineCandidates()[0][0] == "Notebook/Notebook.FileMenu.SaveDialog,cancelButton"
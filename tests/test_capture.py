@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+import adapters.capture as capture_module
+import adapters.frame as frame_module
+from adapters.capture import CaptureProvider, CaptureWorker, SubprocessCapture, X11Capture, detect_provider, set_capture_provider
+from adapters.frame import Frame
+from adapters.sikuligo_backend import BackendError, Screen
+
+
+def _bgrx(width: int, height: int, padding: int = 0) -> bytes:
+    rows = []
+    for y in range(height):
+        row = b"".join(bytes((x, y, 100 + x, 255)) for x in range(width))  # B, G, R, X
+        rows.append(row + b"\xee" * padding)
+    return b"".join(rows)
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_bgrx_pixels_become_rgb(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(frame_module, "np", None)
+    elif frame_module.np is None:
+        pytest.skip("numpy is not installed")
+
+    frame = Frame.from_bgrx(3, 2, memoryview(_bgrx(3, 2, padding=4)), stride=16, x=5, y=6)
+
+    assert frame.bounds == (5, 6, 3, 2)
+    assert frame.channels == 3
+    assert frame.pixels[:9] == bytes((100, 0, 0, 101, 0, 1, 102, 0, 2))
+    assert frame.pixels[9:12] == bytes((100, 1, 0))
+
+
+class _Provider(CaptureProvider):
+    name = "fake"
+
+    def __init__(self):
+        self.requests = []
+        self.closed = False
+
+    def grab(self, bounds):
+        self.requests.append(bounds)
+        x, y, w, h = bounds or (0, 0, 4, 4)
+        return Frame(w, h, bytes(w * h), channels=1, x=x, y=y)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture()
+def provider():
+    fake = _Provider()
+    set_capture_provider(fake)
+    yield fake
+    set_capture_provider(None)
+
+
+def test_screen_captures_requested_bounds_in_memory(provider):
+    screen = Screen(object())
+
+    frame = screen.capture_frame((10, 20, 3, 2))
+    assert frame.bounds == (10, 20, 3, 2)
+    assert provider.requests == [(10, 20, 3, 2)]
+
+
+def test_capture_region_encodes_png_only_for_files(provider):
+    screen = Screen(object())
+
+    path = screen.capture_region((1, 2, 3, 4))
+    try:
+        decoded = Frame.from_file(path)
+    finally:
+        os.unlink(path)
+    assert (decoded.width, decoded.height) == (3, 4)
+    assert provider.requests == [(1, 2, 3, 4)]
+
+
+def test_replacing_the_provider_closes_the_previous_one(provider):
+    set_capture_provider(_Provider())
+    assert provider.closed
+
+
+def test_provider_is_detected_once(monkeypatch):
+    detections = []
+    monkeypatch.setattr(capture_module, "detect_provider", lambda: detections.append(1) or _Provider())
+    set_capture_provider(None)
+    try:
+        capture_module.grab(None)
+        capture_module.grab((0, 0, 2, 2))
+    finally:
+        set_capture_provider(None)
+    assert detections == [1]
+
+
+def test_detection_falls_back_to_capture_tools(monkeypatch):
+    def unavailable():
+        raise ImportError("mss")
+
+    monkeypatch.delenv("SIKULI_FRAMEWORK_CAPTURE", raising=False)
+    monkeypatch.delenv("DISPLAY", raising=False)
+    monkeypatch.setattr(capture_module, "MssCapture", unavailable)
+    assert isinstance(detect_provider(), SubprocessCapture)
+
+
+def test_forced_provider_must_exist(monkeypatch):
+    monkeypatch.setenv("SIKULI_FRAMEWORK_CAPTURE", "carrier-pigeon")
+    with pytest.raises(BackendError):
+        detect_provider()
+
+
+@pytest.mark.skipif(not os.environ.get("DISPLAY"), reason="needs an X display")
+def test_x11_capture_grabs_bounds():
+    provider = X11Capture()
+    try:
+        frame = provider.grab((0, 0, 16, 8))
+    finally:
+        provider.close()
+    assert frame.bounds == (0, 0, 16, 8)
+    assert frame.channels == 3
+
+
+_FAKE_TOOL = """#!{python}
+import sys
+if "fail" in sys.argv[0]:
+    sys.exit(3)
+if "hang" in sys.argv[0]:
+    import time
+    time.sleep(30)
+if sys.argv[-1] == "ppm:-":
+    sys.stdout.buffer.write(b"P5 2 1 255\\n" + bytes((7, 9)))
+elif sys.argv[-1].endswith(".ppm"):
+    with open(sys.argv[-1], "wb") as handle:
+        handle.write(b"P5 1 2 255\\n" + bytes((5, 6)))
+else:
+    sys.exit(4)
+"""
+
+
+def _fake_tool(tmp_path, name):
+    path = tmp_path / name
+    path.write_text(_FAKE_TOOL.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture()
+def worker_env(monkeypatch):
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    monkeypatch.setenv("PYTHONPATH", src)
+
+
+@pytest.mark.parametrize("kind, size", [("import", (2, 1)), ("scrot", (1, 2))])
+def test_persistent_worker_runs_the_detected_tool(tmp_path, worker_env, kind, size):
+    provider = SubprocessCapture(tool=(kind, _fake_tool(tmp_path, kind)))
+    try:
+        first = provider.grab((3, 4, 2, 1))
+        second = provider.grab(None)
+    finally:
+        provider.close()
+
+    assert (first.x, first.y, first.width, first.height) == (3, 4) + size
+    assert second.bounds == (0, 0) + size
+    assert provider.worker.starts == 1
+
+
+def test_worker_is_restarted_after_it_died(tmp_path, worker_env):
+    provider = SubprocessCapture(tool=("import", _fake_tool(tmp_path, "import")))
+    try:
+        provider.grab(None)
+        provider.worker._process.kill()
+        provider.worker._process.wait()
+        assert provider.grab(None).width == 2
+    finally:
+        provider.close()
+    assert provider.worker.starts == 2
+
+
+def test_worker_reports_tool_failures(tmp_path, worker_env):
+    provider = SubprocessCapture(tool=("import", _fake_tool(tmp_path, "import-fail")))
+    try:
+        with pytest.raises(BackendError, match="screen capture failed"):
+            provider.grab(None)
+    finally:
+        provider.close()
+
+
+def test_worker_stops_hung_tools(tmp_path, worker_env):
+    provider = SubprocessCapture(tool=("import", _fake_tool(tmp_path, "import-hang")))
+    provider.worker.timeout = 0.5
+    try:
+        with pytest.raises(BackendError, match="TimeoutExpired"):
+            provider.grab(None)
+        provider.tool = ("import", _fake_tool(tmp_path, "import"))
+        assert provider.grab(None).width == 2
+    finally:
+        provider.close()
+    assert provider.worker.starts == 1
+
+
+def test_silent_worker_is_killed_and_replaced(monkeypatch):
+    monkeypatch.setattr(capture_module, "REPLY_MARGIN", 0.2)
+    worker = CaptureWorker(argv=[sys.executable, "-c", "import time; time.sleep(30)"], timeout=0)
+    try:
+        with pytest.raises(BackendError, match="timed out"):
+            worker.run(["import"])
+        assert worker._process is None
+        with pytest.raises(BackendError, match="timed out"):
+            worker.run(["import"])
+    finally:
+        worker.close()
+    assert worker.starts == 2
+
+
+def test_missing_tool_fails_on_capture():
+    provider = SubprocessCapture(persistent=False, tool=None)
+    provider.tool = None
+    with pytest.raises(BackendError, match="unavailable"):
+        provider.grab(None)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+
+from entity.entity import Entity
+from entity.keyRegistry import KeyRegistry
+
+
+class _Logger:
+    def trace(self, *_args, **_kwargs):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def _entities(monkeypatch):
+    monkeypatch.setattr(Entity, "logger", lambda _entity: _Logger())
+    monkeypatch.setattr(Entity, "regionFinderStrategy", lambda _entity: None)
+
+
+class Dialog(Entity):
+    pass
+
+
+class Button(Entity):
+    pass
+
+
+class Window(Entity):
+    OK = ["ok", Button]
+    CANCEL = ["cancel", Button, {"timeout": 5}]
+    DIALOG = [Dialog]
+    TITLE = "not a key"
+
+
+class SaveWindow(Window):
+    CANCEL = ["dismiss", Button]
+    DIALOG = None
+
+
+def test_keys_are_created_once():
+    window = Window(None)
+
+    ok = window[Window.OK]
+    assert isinstance(ok, Button) and ok.getName() == "ok"
+    assert window[Window.OK] is ok
+    assert window[Window.CANCEL].timeout == 5
+    assert type(window[Window.DIALOG]) is Dialog and window[Window.DIALOG].getName() == "Dialog"
+    assert window[["ok", Button]] is ok  # an equal copy of the key
+
+
+def test_inherited_and_redefined_keys():
+    window = SaveWindow(None)
+
+    assert window[Window.OK].getName() == "ok"
+    assert window[SaveWindow.CANCEL].getName() == "dismiss"
+    with pytest.raises(Exception, match=r"Key \[cancel\] is not found"):
+        window[Window.CANCEL]  # shadowed by the subclass
+    with pytest.raises(Exception, match=r"Key \[Dialog\] is not found"):
+        window[Window.DIALOG]
+
+    registry = KeyRegistry.forClass(SaveWindow)
+    assert sorted(entry.attribute for entry in registry.getKeys()) == ["CANCEL", "OK"]
+    assert registry.find(Window.OK).owner is Window
+    assert KeyRegistry.forClass(Window) is not registry
+
+
+def test_keys_added_after_first_use(monkeypatch):
+    window = Window(None)
+    window[Window.OK]
+
+    monkeypatch.setattr(Window, "HELP", ["help", Button], raising=False)
+    assert window[Window.HELP].getName() == "help"
+
+    replaced = ["ok", Button, {"timeout": 9}]
+    original = Window.OK
+    monkeypatch.setattr(Window, "OK", replaced)
+    assert KeyRegistry.lookup(Window, replaced).key is replaced
+    assert KeyRegistry.lookup(Window, original) is None
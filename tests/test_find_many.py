@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from adapters.frame import Frame, encode_png
+from adapters.local_backend import LocalScreen, Pattern, RecordingInput, Screen
+from adapters.match_cache import match_cache
+
+
+def _noise(width, height, seed):
+    return np.random.default_rng(seed).integers(0, 256, size=(height, width), dtype=np.uint8)
+
+
+@pytest.fixture()
+def images(tmp_path):
+    match_cache.clear()
+    desktop = _noise(160, 100, seed=1)
+    paths = {}
+    for name, pixels in (
+        ("ok", desktop[10:30, 20:60]),
+        ("cancel", desktop[60:80, 100:140]),
+        ("missing", _noise(40, 20, seed=2)),
+    ):
+        path = tmp_path / f"{name}.png"
+        path.write_bytes(encode_png(pixels.shape[1], pixels.shape[0], pixels.tobytes()))
+        paths[name] = str(path)
+    return desktop, paths
+
+
+class _Screens:
+    """Capture function showing one picture after the other, the last one stays."""
+
+    def __init__(self, *pictures):
+        self.pictures = list(pictures)
+        self.captures = 0
+
+    def __call__(self, bounds):
+        picture = self.pictures[min(self.captures, len(self.pictures) - 1)]
+        self.captures += 1
+        return Frame(picture.shape[1], picture.shape[0], picture.tobytes()).crop(bounds)
+
+
+def _screen(capture):
+    screen = Screen(LocalScreen(capture=capture, input=RecordingInput(), scan_interval=0.01))
+    screen.frame_max_age_millis = 0
+    return screen
+
+
+def test_find_many_matches_all_patterns_on_one_capture(images):
+    desktop, paths = images
+    capture = _Screens(desktop)
+    screen = _screen(capture)
+
+    ok, cancel, missing = screen.find_many([paths["ok"], Pattern.from_image(paths["cancel"]), paths["missing"]])
+
+    assert (ok.getX(), ok.getY()) == (20, 10)
+    assert (cancel.getX(), cancel.getY()) == (100, 60)
+    assert cancel.score == pytest.approx(1.0, abs=1e-6)
+    assert missing is None
+    assert capture.captures == 1
+
+
+def test_find_many_in_region_and_supplied_frame(images):
+    desktop, paths = images
+    capture = _Screens(desktop)
+    screen = _screen(capture)
+    frame = Frame(160, 100, desktop.tobytes())
+
+    ok, cancel = screen.region(0, 0, 80, 50).find_many([paths["ok"], paths["cancel"]], frame=frame)
+
+    assert ok is not None and cancel is None
+    assert capture.captures == 0
+
+
+def test_find_many_waits_for_missing_patterns(images):
+    desktop, paths = images
+    blank = np.zeros_like(desktop)
+    blank[10:30, 20:60] = desktop[10:30, 20:60]  # only "ok" is up yet
+    capture = _Screens(blank, blank, desktop)
+    screen = _screen(capture)
+
+    ok, cancel = screen.find_many([paths["ok"], paths["cancel"]], timeout_millis=2000)
+
+    assert ok is not None and cancel is not None
+    assert capture.captures == 3
+
+
+def test_exists_any_returns_first_pattern_seen(images):
+    desktop, paths = images
+    screen = _screen(_Screens(desktop))
+
+    index, match = screen.exists_any([paths["missing"], paths["cancel"], paths["ok"]])
+    assert index == 1
+    assert (match.getX(), match.getY()) == (100, 60)
+
+
+def test_exists_any_gives_up_after_timeout(images):
+    desktop, paths = images
+    capture = _Screens(desktop)
+    screen = _screen(capture)
+
+    assert screen.exists_any([paths["missing"]]) is None
+    assert capture.captures == 1
+    assert screen.exists_any([paths["missing"]], timeout_millis=50) is None
+    assert capture.captures > 2
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import adapters.sikuligo_backend as sikuligo_module
+from adapters.types import BackendError
+from region.finder import Finder
+from region.locationHints import LocationHints
+
+
+class _PatternFake:
+    @classmethod
+    def from_image(cls, image: str):
+        return sikuligo_module.Pattern(None, image=image)
+
+
+class _RawScreen:
+    """ sikuligo screen (or region of it) showing one 20x10 widget on a 1000x1000 screen, records the areas searched """
+
+    def __init__(self, location, bounds=(0, 0, 1000, 1000), searched=None):
+        self.location = location
+        self.bounds = bounds
+        self.searched = [] if searched is None else searched
+
+    def region(self, x, y, w, h):
+        return _RawScreen(self.location, (x, y, w, h), self.searched)
+
+    def wait(self, _pattern, timeout_millis=None):
+        self.searched.append((self.bounds, timeout_millis))
+        x, y = self.location
+        bx, by, bw, bh = self.bounds
+        if not (bx <= x and by <= y and x + 20 <= bx + bw and y + 10 <= by + bh):
+            raise BackendError("not found")
+        return SimpleNamespace(x=x, y=y, w=20, h=10)
+
+
+def _finder(stub_finder, screen):
+    """ Entity App.Widget searched on `screen`, and the location hints its Finders share """
+    hints = LocationHints(padding=50)
+    entity = stub_finder(screen, ["App.Widget.png"], entity="App.Widget", regionTimeout=3,
+                         pattern=_PatternFake, locationHinting=True, locationHints=hints)
+    return entity, hints
+
+
+def _bounds(region):
+    return (region.getX(), region.getY(), region.getW(), region.getH())
+
+
+def test_search_starts_at_last_known_location(stub_finder):
+    raw = _RawScreen(location=(400, 300))
+    entity, hints = _finder(stub_finder, sikuligo_module.Screen(raw))
+
+    Finder(entity).find(timeout=5)
+    assert raw.searched == [((0, 0, 1000, 1000), 3000)]
+
+    # A new Finder (next validation) looks around the last match first, on the screen itself
+    del raw.searched[:]
+    region = Finder(entity).find(timeout=5)
+    assert _bounds(region) == (400, 300, 20, 10)
+    assert raw.searched == [((350, 250, 120, 110), 1)]
+
+    # The widget moved, the hint misses and the whole screen is searched
+    raw.location = (10, 900)
+    del raw.searched[:]
+    region = Finder(entity).find(timeout=5)
+    assert _bounds(region) == (10, 900, 20, 10)
+    assert [bounds for bounds, _timeout in raw.searched] == [(350, 250, 120, 110), (0, 0, 1000, 1000)]
+
+    assert hints.stats() == {"hints": 1, "hits": 1, "misses": 1, "hitRate": 0.5}
+    assert hints.get("App.Widget|App.Widget/App.Widget")[1] == (10, 900, 20, 10)
+
+
+def test_hint_window_stays_inside_the_searched_region(stub_finder):
+    raw = _RawScreen(location=(310, 210))
+    screen = sikuligo_module.Screen(raw)
+    entity, _hints = _finder(stub_finder, screen)
+
+    Finder(entity, region=screen.region(300, 200, 200, 200)).find(timeout=5)
+    del raw.searched[:]
+    Finder(entity, region=screen.region(300, 200, 200, 200)).find(timeout=5)
+    assert raw.searched == [((300, 200, 80, 70), 1)]  # (260, 160, 120, 110) clipped to the region
+
+    assert _bounds(screen.scoped((-50, -50, 100, 100))) == (0, 0, 50, 50)
+
+
+def test_hints_persist_between_runs(tmp_path):
+    hints = LocationHints()
+    hints.put("App.Widget|App.Widget/App.Widget", 1, (1, 2, 3, 4))
+    hints.save(str(tmp_path / "hints.json"))
+
+    restored = LocationHints()
+    assert restored.load(str(tmp_path / "hints.json")) == 1
+    assert restored.get("App.Widget|App.Widget/App.Widget") == (1, (1, 2, 3, 4))
+    assert LocationHints().load(str(tmp_path / "missing.json")) == 0
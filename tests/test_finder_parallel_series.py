@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from adapters.types import BackendError
+from finder_stubs import IdentityTransform
+from region.finder import Finder
+
+
+class _EntityTransform(IdentityTransform):
+    """ Records the entity transforms applied, by baseline """
+
+    applied = []
+
+    def __init__(self, source, *_args, **_kwargs):
+        self.source = source
+
+    def apply(self, operand, context, *_args, **_kwargs):
+        if context == self.CONTEXT_ENTITY:
+            self.applied.append(self.source.rsplit("/", 1)[-1])
+        return operand
+
+
+def _image(pattern):
+    return pattern.image.rsplit("/", 1)[-1]
+
+
+class _Screen:
+    """ Widget[0]-0 blocks until released, series 1 matches straight away, series 2 is missing """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.waited = []
+        self.polls = []
+
+    def exists(self, pattern, timeout_millis=0):
+        self.polls.append((_image(pattern), timeout_millis))
+        if _image(pattern) == "Widget[0]-0.png":
+            self.release.wait(timeout_millis / 1000.0)
+            return self if self.release.is_set() else None
+        if _image(pattern).startswith("Widget[2]"):
+            return None
+        return self
+
+    def wait(self, pattern, timeout_millis=None):
+        self.waited.append(_image(pattern))
+        if _image(pattern) == "Widget[0]-0.png":
+            self.release.wait(5)
+        if _image(pattern).startswith("Widget[2]"):
+            raise BackendError("not found")
+        return self
+
+    def add(self, other):
+        return self
+
+
+def _finder(stub_finder, screen, workers):
+    _EntityTransform.applied = []
+    baselines = [f"Widget[{series}]-{sequence}.png" for series in range(3) for sequence in range(2)]
+    entity = stub_finder(screen, baselines, regionTimeout=5, transform=_EntityTransform, seriesWorkers=workers)
+    return Finder(entity)
+
+
+def test_first_series_to_match_wins_and_losers_stop(stub_finder):
+    screen = _Screen()
+    finder = _finder(stub_finder, screen, workers=3)
+
+    try:
+        finder.find(timeout=5)
+    finally:
+        screen.release.set()
+
+    assert finder.getLastSeriesMatched() == 1
+    assert _EntityTransform.applied == ["Widget[1]-1.png"]  # entity transforms of the winner only
+
+    # Series 0 was still waiting on its first image when series 1 won, it must not go on to the next one
+    for thread in threading.enumerate():
+        if thread.name.startswith("ThreadPoolExecutor"):
+            thread.join(5)
+    assert "Widget[0]-1.png" not in screen.waited
+    assert "Widget[0]-1.png" not in [image for image, _millis in screen.polls]
+    assert all(millis <= 100 for _image, millis in screen.polls)
+
+
+def test_losing_series_stop_waiting_once_cancelled(stub_finder):
+    screen = _Screen()  # Widget[0]-0 never shows up
+    finder = _finder(stub_finder, screen, workers=3)
+
+    finder.find(timeout=5)
+    started = time.time()
+    for thread in threading.enumerate():
+        if thread.name.startswith("ThreadPoolExecutor"):
+            thread.join(5)
+
+    assert time.time() - started < 1  # not the 5s region timeout
+    assert finder.getLastSeriesMatched() == 1
+
+
+def test_sequential_series_remain_the_default(stub_finder):
+    screen = _Screen()
+    screen.release.set()
+    finder = _finder(stub_finder, screen, workers=1)
+
+    finder.find(timeout=5)
+
+    assert finder.getLastSeriesMatched() == 0
+    assert screen.waited == ["Widget[0]-0.png", "Widget[0]-1.png"]
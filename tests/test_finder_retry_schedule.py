@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+import region.finder as finder_module
+import region.retrySchedule as schedule_module
+from adapters.types import BackendError
+from error import SikuliFrameworkException
+from finder_stubs import Logger
+from region.exception import FindExhaustedException
+from region.finder import Finder
+from region.retrySchedule import RetrySchedule
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+class _Screen:
+    """ Never finds anything, a wait takes its whole timeout or `cost` seconds when the backend fails fast """
+
+    def __init__(self, clock, cost=None):
+        self.clock = clock
+        self.cost = cost
+        self.waits = []
+
+    def wait(self, _pattern, timeout_millis=None):
+        self.waits.append(timeout_millis)
+        self.clock.now += self.cost if self.cost is not None else timeout_millis / 1000.0
+        raise BackendError("not found")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(finder_module, "time", clock)
+    monkeypatch.setattr(schedule_module, "time", clock)
+    return clock
+
+
+def _finder(stub_finder, monkeypatch, screen):
+    monkeypatch.setattr(SikuliFrameworkException, "logger", lambda _entity: Logger())
+    schedule = RetrySchedule(initial=0.1, factor=2, maximum=0.5, jitter=0)
+    return Finder(stub_finder(screen, regionTimeout=3, retrySchedule=schedule))
+
+
+def test_schedule_backs_off_exponentially_with_jitter():
+    delays = RetrySchedule(initial=0.1, factor=2, maximum=0.5, jitter=0.2, random=lambda: 1.0).delays()
+    assert [round(next(delays), 3) for _ in range(5)] == [0.12, 0.24, 0.48, 0.6, 0.6]
+
+
+def test_backend_waits_only_get_the_remaining_budget(stub_finder, monkeypatch, clock):
+    screen = _Screen(clock)
+    finder = _finder(stub_finder, monkeypatch, screen)
+
+    with pytest.raises(FindExhaustedException):
+        finder.find(timeout=5)
+
+    # 3s region timeout, then only the 2s left (less the 0.1s backoff)
+    assert screen.waits == [3000, 1900]
+    assert clock.now == pytest.approx(1005.0)
+
+
+def test_fast_failures_are_paced(stub_finder, monkeypatch, clock):
+    screen = _Screen(clock, cost=0.01)
+    finder = _finder(stub_finder, monkeypatch, screen)
+
+    with pytest.raises(FindExhaustedException):
+        finder.find(timeout=2)
+
+    assert clock.sleeps[:5] == [0.1, 0.2, 0.4, 0.5, 0.5]
+    assert len(screen.waits) == 6
+    assert clock.now == pytest.approx(1002.0)
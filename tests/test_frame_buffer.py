@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from adapters.frame import Frame
+from adapters.frame_buffer import FrameBuffer
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Grabber:
+    def __init__(self, clock):
+        self.clock = clock
+        self.requests = []
+
+    def __call__(self, bounds):
+        self.requests.append(bounds)
+        x, y, w, h = bounds or (0, 0, 10, 10)
+        return Frame(w, h, bytes(w * h), x=x, y=y, captured_at=self.clock())
+
+
+@pytest.fixture()
+def clock():
+    return _Clock()
+
+
+@pytest.fixture()
+def grab(clock):
+    return _Grabber(clock)
+
+
+def test_recent_frame_is_reused(clock, grab):
+    frames = FrameBuffer(grab, clock=clock)
+
+    first = frames.get(max_age_millis=50)
+    clock.now += 0.03
+    assert frames.get(max_age_millis=50) is first
+    clock.now += 0.03
+    assert frames.get(max_age_millis=50) is not first
+    assert len(grab.requests) == 2
+    assert frames.stats()["hits"] == 1
+
+
+def test_zero_max_age_always_captures(clock, grab):
+    frames = FrameBuffer(grab, clock=clock)
+    frames.get()
+    frames.get()
+    assert len(grab.requests) == 2
+
+
+def test_newer_than_skips_searched_frame(clock, grab):
+    frames = FrameBuffer(grab, clock=clock)
+    searched = frames.get(max_age_millis=1000)
+    clock.now += 0.001
+    fresh = frames.get(max_age_millis=1000, newer_than=searched.captured_at)
+    assert fresh is not searched
+    assert frames.get(max_age_millis=1000, newer_than=searched.captured_at) is fresh
+
+
+def test_region_is_cropped_from_covering_frame(clock, grab):
+    frames = FrameBuffer(grab, clock=clock)
+    frames.get(max_age_millis=100)
+
+    part = frames.get((2, 3, 4, 5), max_age_millis=100)
+    assert part.bounds == (2, 3, 4, 5)
+    assert grab.requests == [None]
+
+    frames.invalidate()
+    frames.get((2, 3, 4, 5), max_age_millis=100)
+    frames.get(max_age_millis=100)  # a region capture doesn't cover the screen
+    assert grab.requests == [None, (2, 3, 4, 5), None]
+
+
+def test_capacity_and_memory_cap(clock, grab):
+    frames = FrameBuffer(grab, capacity=2, max_bytes=10 * 1024, clock=clock)
+    for _ in range(3):
+        frames.get()
+    assert frames.stats()["frames"] == 2
+    assert frames.stats()["bytes"] == 200
+
+    frames.configure(max_bytes=150)
+    assert frames.stats()["frames"] == 1
+
+    frames.get((0, 0, 20, 20))  # 400 bytes, over the cap, not kept
+    assert frames.stats()["frames"] == 1
+
+
+def test_concurrent_requests_share_one_capture(clock):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_grab(bounds):
+        calls.append(bounds)
+        started.set()
+        release.wait(5)
+        return Frame(10, 10, bytes(100), captured_at=clock())
+
+    frames = FrameBuffer(slow_grab, clock=clock)
+    results = []
+    first = threading.Thread(target=lambda: results.append(frames.get(max_age_millis=100)))
+    first.start()
+    assert started.wait(5)
+
+    second = threading.Thread(target=lambda: results.append(frames.get((1, 1, 2, 2), max_age_millis=100)))
+    second.start()
+    while frames.stats()["joins"] == 0:
+        second.join(0.01)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == [None]
+    assert sorted(frame.bounds for frame in results) == [(0, 0, 10, 10), (1, 1, 2, 2)]
+
+
+def test_failed_capture_is_raised_and_not_buffered(clock):
+    def broken(_bounds):
+        raise RuntimeError("no display")
+
+    frames = FrameBuffer(broken, clock=clock)
+    with pytest.raises(RuntimeError):
+        frames.get(max_age_millis=100)
+    assert frames.stats()["frames"] == 0
+
+
+def test_screen_input_drops_buffered_frames(tmp_path):
+    pytest.importorskip("numpy")
+    from adapters.frame import encode_png
+    from adapters.local_backend import Screen
+
+    path = tmp_path / "screen.png"
+    path.write_bytes(encode_png(8, 8, bytes(64)))
+    screen = Screen.from_image(str(path))
+
+    screen.capture_frame()
+    screen.capture_frame()
+    assert screen.frames.stats()["captures"] == 1
+    screen.capture_frame(max_age_millis=0)
+    assert screen.frames.stats()["captures"] == 2
+
+    screen.click_point(1, 1)
+    assert screen.frames.stats()["frames"] == 0
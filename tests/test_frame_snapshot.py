@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import random
+import struct
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+import adapters.frame as frame_module
+import adapters.sikuligo_backend as backend_module
+import region.finder as finder_module
+from adapters.frame import Frame, encode_png
+from adapters.sikuligo_backend import BackendError, Pattern, Region
+from region.finder import Finder
+
+
+class _FrameRegion:
+    """Screen stub: counts captures and records which frame every find was matched against."""
+
+    def __init__(self, missing: set[str]):
+        self.missing = missing
+        self.captures = 0
+        self.frames = []
+        self.waits = 0
+
+    def capture_frame(self, region=None, max_age_millis=None, newer_than=None):
+        self.captures += 1
+        return Frame(1, 1, b"\x00")
+
+    def find(self, pattern, timeout_millis=None, frame=None):
+        self.frames.append(frame)
+        if pattern.image.rsplit("/", 1)[-1] in self.missing:
+            raise BackendError("not found")
+        return _FrameRegion(self.missing)
+
+    def wait(self, pattern, timeout_millis=None):
+        self.waits += 1
+        if pattern.image.rsplit("/", 1)[-1] in self.missing:
+            raise BackendError("not found")
+        return _FrameRegion(self.missing)
+
+    def add(self, other):
+        return self
+
+
+def _snapshot_finder(stub_finder, screen):
+    baselines = [f"Widget[{series}]-{sequence}.png" for series in range(2) for sequence in range(2)]
+    return Finder(stub_finder(screen, baselines, regionTimeout=1, frameSnapshot=True))
+
+
+def test_finder_matches_all_series_against_one_frame(stub_finder, monkeypatch):
+    screen = _FrameRegion(missing={"Widget[0]-1.png"})
+    monkeypatch.setattr(finder_module, "accelerated", lambda: True)
+    finder = _snapshot_finder(stub_finder, screen)
+    finder.find(timeout=1)
+
+    assert finder.getLastSeriesMatched() == 1
+    assert screen.captures == 1
+    assert screen.waits == 0
+    assert len(screen.frames) == 4  # [0]-0, [0]-1 (miss), [1]-0, [1]-1
+    assert all(frame is screen.frames[0] for frame in screen.frames)
+
+
+def test_finder_waits_on_the_live_screen_without_numpy(stub_finder, monkeypatch):
+    screen = _FrameRegion(missing={"Widget[0]-1.png"})
+    monkeypatch.setattr(frame_module, "np", None)
+    finder = _snapshot_finder(stub_finder, screen)
+    finder.find(timeout=1)
+
+    assert finder.getLastSeriesMatched() == 1
+    assert screen.captures == 0
+    assert screen.waits == 4
+
+
+@pytest.mark.parametrize("depth, color_type", [(8, 2), (8, 6), (4, 0), (8, 3)])
+def test_png_filters_decode_the_same_with_and_without_numpy(depth, color_type):
+    pytest.importorskip("numpy")
+    rng = random.Random(depth * 10 + color_type)
+    width, height = 9, 8
+    samples = {0: 1, 2: 3, 3: 1, 6: 4}[color_type]
+    stride = (width * samples * depth + 7) // 8
+    rows = b"".join(bytes([row % 5]) + bytes(rng.randrange(256) for _ in range(stride)) for row in range(height))
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    png = (b"\x89PNG\r\n\x1a\n"
+           + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, depth, color_type, 0, 0, 0))
+           + (chunk(b"PLTE", bytes(range(256)) * 3) if color_type == 3 else b"")
+           + chunk(b"IDAT", zlib.compress(rows))
+           + chunk(b"IEND", b""))
+
+    vectorised = Frame.from_image(png)
+    numpy = frame_module.np
+    frame_module.np = None
+    try:
+        python = Frame.from_image(png)
+    finally:
+        frame_module.np = numpy
+    assert vectorised.pixels == python.pixels
+    assert vectorised.gray().pixels == python.gray().pixels
+
+
+def test_frame_png_round_trip_crop_and_gray():
+    pixels = bytes(value for i in range(12) for value in (i * 20, 0, 255 - i * 20))
+    frame = Frame(4, 3, pixels, channels=3, x=100, y=200)
+
+    decoded = Frame.from_image(frame.to_png(), x=100, y=200)
+    assert decoded.pixels == frame.pixels and decoded.channels == 3
+
+    cropped = frame.crop((101, 201, 10, 10))
+    assert cropped.bounds == (101, 201, 3, 2)
+    assert cropped.pixels[:3] == pixels[15:18]
+    assert cropped.gray().pixels[0] == (100 * 299 + 155 * 114) // 1000
+
+    with pytest.raises(BackendError):
+        frame.crop((0, 0, 10, 10))
+
+
+def test_frame_decodes_ppm_and_bottom_up_bmp():
+    ppm = Frame.from_image(b"P6\n# capture\n2 1\n255\n" + bytes([1, 2, 3, 4, 5, 6]))
+    assert (ppm.width, ppm.height, ppm.pixels) == (2, 1, bytes([1, 2, 3, 4, 5, 6]))
+
+    rows = [bytes([3, 2, 1, 0]), bytes([6, 5, 4, 0])]  # BGR + padding, stored bottom row first
+    header = b"BM" + struct.pack("<IHHI", 0, 0, 0, 54) + struct.pack("<IiiHHIIiiII", 40, 1, 2, 1, 24, 0, 0, 0, 0, 0, 0)
+    bmp = Frame.from_image(header + rows[1] + rows[0])
+    assert bmp.pixels == bytes([1, 2, 3, 4, 5, 6])
+
+
+def test_region_find_in_frame_sends_cropped_gray_frame(monkeypatch):
+    requests = []
+
+    class _Client:
+        def find(self, req):
+            requests.append(req)
+            return SimpleNamespace(match=SimpleNamespace(x=1, y=2, w=2, h=2, score=0.9))
+
+    fake_pb = SimpleNamespace(
+        FindRequest=lambda **kwargs: SimpleNamespace(**kwargs),
+        Pattern=lambda **kwargs: SimpleNamespace(**kwargs),
+        GrayImage=lambda **kwargs: SimpleNamespace(**kwargs),
+    )
+    monkeypatch.setattr(backend_module, "pb", fake_pb)
+
+    screen = SimpleNamespace(client=_Client())
+    region = Region(object(), screen=screen, bounds=(10, 10, 6, 5))
+    frame = Frame(20, 20, bytes(range(200)) * 2, channels=1)
+    pattern = Pattern(object(), image=encode_png(2, 2, b"\x00\x01\x02\x03"))
+    pattern.offset = (3, 0)
+
+    match = region.find(pattern, frame=frame)
+
+    assert (requests[0].source.width, requests[0].source.height) == (6, 5)
+    assert (requests[0].pattern.image.width, requests[0].pattern.image.height) == (2, 2)
+    assert (match.getX(), match.getY(), match.getW(), match.getH()) == (11, 12, 2, 2)
+    assert (match.target_x, match.target_y) == (15, 13)
+
+    pattern.similarity = 0.95
+    with pytest.raises(BackendError):
+        region.find(pattern, frame=frame)
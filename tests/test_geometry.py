@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from collections import namedtuple
+
+import pytest
+
+from adapters.geometry import Point, Rect, as_point, as_rect
+from adapters.sikuligo_backend import Location, Region
+from adapters.types import BackendError
+from region.transform import RegionAbove, RegionLimitByParent, RegionMorph, RegionNearby, RegionPreviouslyMatched
+
+
+def test_rect_transforms():
+    rect = Rect(10, 20, 30, 40)
+
+    assert rect.grow(5) == (5, 15, 40, 50)
+    assert (rect.above(7), rect.below(7)) == ((10, 13, 30, 7), (10, 60, 30, 7))
+    assert (rect.left_of(7), rect.right_of(7)) == ((3, 20, 7, 40), (40, 20, 7, 40))
+    assert rect.union(Rect(0, 50, 5, 20)) == (0, 20, 40, 50)
+    assert rect.union_point(50, 0) == (10, 0, 40, 60)
+    assert rect.intersection(Rect(30, 50, 100, 100)) == (30, 50, 10, 10)
+    assert rect.intersection(Rect(40, 60, 5, 5)) == (40, 60, 0, 0)
+    assert rect.intersection(Rect(41, 0, 5, 5)) is None
+    assert Rect.bounding([rect, Rect(0, 0, 1, 1), Rect(50, 50, 10, 10)]) == (0, 0, 60, 60)
+    assert rect.center == Point(25, 40) and rect.contains(39, 59) and not rect.contains(40, 20)
+
+
+def test_values_are_immutable_and_slotted():
+    rect = Rect(1, 2, 3, 4)
+    with pytest.raises(AttributeError):
+        rect.x = 5
+    region = Region(None, bounds=rect)
+    with pytest.raises(AttributeError):
+        region.extra = 1
+    assert not hasattr(Location(1, 2), "__dict__")
+
+
+def test_coercion():
+    Box = namedtuple("Box", "left top width height")
+    Size = namedtuple("Size", "x y w h")
+
+    rect = Rect(1, 2, 3, 4)
+    assert as_rect(rect) is rect and type(as_rect([1, 2, 3, 4])) is Rect
+    assert as_rect(Box(1, 2, 3, 4)) == as_rect(Size(1, 2, 3, 4)) == (1, 2, 3, 4)
+    assert as_rect(Region(None, bounds=(5, 6, 7, 8))) == (5, 6, 7, 8)
+    assert as_point(Location(3, 4)) == as_point([3, 4]) == Point(3, 4)
+    assert as_point(Region(None, bounds=(0, 0, 10, 10))) == (0, 0)
+    with pytest.raises(BackendError):
+        as_rect("nope")
+    with pytest.raises(BackendError):
+        as_point(object())
+
+
+def test_region_keeps_rect_bounds():
+    region = Region(None, bounds=[1.0, 2, 3, 4])
+    assert type(region._bounds) is Rect and region._bounds == (1, 2, 3, 4)
+    assert type(region.nearby(1)._bounds) is Rect
+
+    region.setX(10)
+    region.setClickOffset(Location(1, -1))
+    assert region._bounds == (10, 2, 3, 4)
+    assert region.getClickLocation() == Location(12, 3)
+
+
+def test_sikuli_style_construction():
+    screen_region = Region("raw", bounds=(0, 0, 100, 100))
+
+    assert Region(5, 6, 7, 8)._bounds == (5, 6, 7, 8)
+    copy = Region(screen_region)
+    assert (copy._raw, copy._bounds) == ("raw", (0, 0, 100, 100)) and copy is not screen_region
+    covering = Region([Region(None, bounds=(10, 10, 5, 5)), Region(None, bounds=(40, 30, 10, 10))])
+    assert covering._bounds == (10, 10, 40, 30)
+
+
+class _Entity:
+    def __init__(self, region, parent=None):
+        self.region = region
+        self.parent = parent
+
+
+def test_transform_pipeline_on_adapter_regions():
+    window = _Entity(Region("raw", bounds=(0, 0, 200, 100)))
+    button = _Entity(Region("raw", bounds=(150, 80, 40, 15)), parent=window)
+
+    region = button.region
+    for transform in (RegionNearby(20), RegionAbove(30), RegionLimitByParent()):
+        region = transform.apply(region, previousMatches=[], entity=button)
+    assert region._bounds == (130, 30, 70, 30)
+
+    assert RegionMorph(-1, -1, 1, 1).apply(region)._bounds == (129, 29, 72, 32)
+    previous = RegionPreviouslyMatched(parent=True).apply(region, previousMatches=[button.region], entity=button)
+    assert previous._bounds == (0, 0, 200, 100)
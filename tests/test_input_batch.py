@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import adapters.sikuligo_backend as sikuligo_module
+from adapters.input_batch import InputEvent, fuse_events
+from adapters.local_backend import XdotoolInput
+
+
+def test_fuse_events():
+    events = [
+        InputEvent("move", x=1, y=2),
+        InputEvent("click", x=1, y=2),
+        InputEvent("move", x=5, y=5),
+        InputEvent("move", x=5, y=5),
+        InputEvent("move", x=6, y=6),
+        InputEvent("type", text="12"),
+        InputEvent("type", text="+3"),
+        InputEvent("type", text="=", delay_millis=50),
+        InputEvent("move", x=9, y=9, delay_millis=10),
+        InputEvent("click", x=9, y=9),
+        InputEvent("hotkey", keys=("ctrl", "c")),
+    ]
+
+    assert fuse_events(events) == [
+        InputEvent("click", x=1, y=2),
+        InputEvent("move", x=5, y=5),
+        InputEvent("move", x=6, y=6),  # drawing paths keep every point
+        InputEvent("type", text="12+3"),
+        InputEvent("type", text="=", delay_millis=50),
+        InputEvent("move", x=9, y=9, delay_millis=10),  # the delay before the click is kept
+        InputEvent("click", x=9, y=9),
+        InputEvent("hotkey", keys=("ctrl", "c")),
+    ]
+
+
+class _Request(SimpleNamespace):
+    def __init__(self, **kwargs):
+        super().__init__(opts=SimpleNamespace(), **kwargs)
+
+
+_PB = SimpleNamespace(MoveMouseRequest=_Request, ClickRequest=_Request, TypeTextRequest=_Request, HotkeyRequest=_Request)
+
+
+class _Client:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda request: self.calls.append((name, request))
+
+
+@pytest.fixture()
+def screen(monkeypatch):
+    monkeypatch.setattr(sikuligo_module, "_require_pb", lambda: _PB)
+    screen = sikuligo_module.Screen(SimpleNamespace(client=_Client()))
+    screen.invalidations = []
+    screen.frames.invalidate = lambda: screen.invalidations.append(1)
+    return screen
+
+
+def _rpcs(screen):
+    return [name for name, _request in screen.client.calls]
+
+
+def test_batch_sends_when_the_block_ends(screen):
+    with screen.batch(delay_millis=20) as batch:
+        screen.move_mouse(10, 20)
+        screen.click_point(10, 20, button="right")
+        screen.type_text("4")
+        screen.type_text("2")
+        screen.hotkey(["enter"])
+        assert screen.client.calls == [] and len(batch) == 5
+
+    assert _rpcs(screen) == ["move_mouse", "click", "type_text", "hotkey"]
+    move, click, text, _hotkey = (request for _name, request in screen.client.calls)
+    assert (click.x, click.y, click.opts.button, click.opts.delay_millis) == (10, 20, "right", 20)
+    assert (move.opts.delay_millis, text.text) == (20, "42")
+    assert screen.invalidations == [1]  # buffered frames dropped once per batch
+    assert screen._cursor == (10, 20)
+
+
+def test_drag_to_is_a_move_and_a_click(screen):
+    screen.drag_to((1, 2), (30, 40))
+    assert _rpcs(screen) == ["move_mouse", "click"]
+
+
+def test_focus_then_click_is_one_click(screen):
+    with screen.batch():
+        screen.move_to((15, 25))
+        screen.click_point(15, 25)
+    assert _rpcs(screen) == ["click"]
+
+
+def test_nested_batches_and_errors(screen):
+    with pytest.raises(RuntimeError):
+        with screen.batch():
+            with screen.batch():
+                screen.click_point(1, 1)
+            assert screen.client.calls == []  # the outer block decides
+            raise RuntimeError()
+    assert screen.client.calls == [] and screen._batch is None
+
+    screen.click_point(2, 2)
+    assert _rpcs(screen) == ["click"]
+
+
+def test_searches_see_queued_input(screen, monkeypatch):
+    monkeypatch.setattr(screen, "_raw", SimpleNamespace(exists=lambda *_args, **_kwargs: None))
+    with screen.batch():
+        screen.click_point(5, 5)
+        assert screen.exists(sikuligo_module.Pattern(None, image="x.png")) is None
+        assert _rpcs(screen) == ["click"]
+        screen.type_text("a")
+    assert _rpcs(screen) == ["click", "type_text"]
+
+
+def test_batches_belong_to_their_thread(screen, monkeypatch):
+    monkeypatch.setattr(screen, "_raw", SimpleNamespace(exists=lambda *_args, **_kwargs: None))
+
+    def other_thread():
+        screen.exists(sikuligo_module.Pattern(None, image="x.png"))  # doesn't flush the batch
+        screen.type_text("b")
+
+    with screen.batch():
+        screen.click_point(5, 5)
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        assert _rpcs(screen) == ["type_text"]
+    assert _rpcs(screen) == ["type_text", "click"]
+
+
+def test_local_batch_with_recorded_input():
+    np = pytest.importorskip("numpy")
+    from adapters.frame import encode_png
+    from adapters.local_backend import Screen
+
+    local = Screen.from_image(encode_png(4, 4, np.zeros((4, 4), dtype=np.uint8).tobytes()))
+    with local.batch():
+        local.move_mouse(1, 1)
+        local.click_point(1, 1)
+        local.type_text("h")
+        local.type_text("i")
+        assert local.input.events == []
+    assert local.input.events == [("click", 1, 1, "left"), ("type", "hi")]
+
+
+def test_xdotool_chains_a_batch(monkeypatch):
+    commands = []
+    monkeypatch.setattr(subprocess, "run", lambda args, **_kwargs: commands.append(args[1:]))
+
+    XdotoolInput("xdotool").run(
+        [
+            InputEvent("click", x=1, y=2),
+            InputEvent("move", x=3, y=4, delay_millis=250),
+            InputEvent("type", text="-5"),
+            InputEvent("hotkey", keys=("ctrl", "a")),
+            InputEvent("click", x=5, y=6, button="right"),
+        ]
+    )
+
+    assert commands == [
+        ["mousemove", "1", "2", "click", "1", "sleep", "0.25", "mousemove", "3", "4", "type", "--", "-5"],
+        ["key", "ctrl+a"],
+        ["mousemove", "5", "6", "click", "3"],
+    ]
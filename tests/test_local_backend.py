@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from adapters.frame import Frame, encode_png
+from adapters.local_backend import LocalPattern, Pattern, Region, Screen, best_match, match_frame, match_scores
+from adapters.types import BackendError
+
+
+def _noise(width: int, height: int, seed: int = 7):
+    return np.random.default_rng(seed).integers(0, 256, size=(height, width), dtype=np.uint8)
+
+
+def _write_png(path, pixels) -> str:
+    height, width = pixels.shape
+    path.write_bytes(encode_png(width, height, pixels.tobytes(), channels=1))
+    return str(path)
+
+
+@pytest.fixture()
+def desktop(tmp_path):
+    """Noise screenshot with a known template cut out of it at (70, 40)."""
+    pixels = _noise(200, 120)
+    template = pixels[40:60, 70:100].copy()
+    return {
+        "pixels": pixels,
+        "screen": _write_png(tmp_path / "screen.png", pixels),
+        "button": _write_png(tmp_path / "button.png", template),
+        "other": _write_png(tmp_path / "other.png", _noise(30, 20, seed=99)),
+    }
+
+
+def test_ncc_locates_template():
+    image = _noise(64, 48).astype(float)
+    x, y, score = best_match(image, image[10:22, 30:45])
+    assert (x, y) == (30, 10)
+    assert score == pytest.approx(1.0, abs=1e-6)
+
+
+def test_ncc_is_invariant_to_brightness_and_contrast():
+    image = _noise(64, 48).astype(float)
+    template = image[5:15, 8:28] * 0.5 + 40
+    x, y, score = best_match(image, template)
+    assert (x, y, round(score, 6)) == (8, 5, 1.0)
+
+
+def test_template_larger_than_image_has_no_scores():
+    assert match_scores(np.zeros((4, 4)), np.zeros((5, 5))) is None
+
+
+def test_match_frame_honours_similarity_and_offset():
+    pixels = _noise(80, 60)
+    frame = Frame(80, 60, pixels.tobytes(), channels=1, x=100, y=200)
+    template = Frame(10, 8, pixels[20:28, 30:40].tobytes(), channels=1)
+
+    match = match_frame(frame, template, 0.9, (5, -3))
+    assert (match.x, match.y, match.w, match.h) == (130, 220, 10, 8)
+    assert (match.target_x, match.target_y) == (130 + 5 + 5, 220 + 4 - 3)
+
+    other = Frame(10, 8, _noise(10, 8, seed=3).tobytes(), channels=1)
+    assert match_frame(frame, other, 0.9) is None
+
+
+def test_local_pattern_is_immutable():
+    base = LocalPattern("button.png")
+    derived = base.similar(0.95).target_offset(2, 3).resize(2.0)
+    assert (base.similarity, base.offset, base.factor) == (0.7, (0, 0), 1.0)
+    assert (derived.similarity, derived.offset, derived.factor) == (0.95, (2, 3), 2.0)
+
+
+def test_screen_finds_pattern_in_still_image(desktop):
+    screen = Screen.from_image(desktop["screen"])
+
+    match = screen.find(Pattern.from_image(desktop["button"]))
+    assert isinstance(match, Region)
+    assert (match.getX(), match.getY(), match.getW(), match.getH()) == (70, 40, 30, 20)
+    assert match.score == pytest.approx(1.0, abs=1e-6)
+
+    assert screen.exists(desktop["other"]) is None
+    with pytest.raises(BackendError):
+        screen.find(desktop["other"])
+
+
+def test_region_search_is_limited_to_its_bounds(desktop):
+    screen = Screen.from_image(desktop["screen"])
+    assert screen.region(60, 30, 60, 40).exists(desktop["button"]) is not None
+    assert screen.region(100, 0, 100, 120).exists(desktop["button"]) is None
+
+
+def test_region_matches_in_supplied_frame(desktop):
+    screen = Screen.from_image(desktop["screen"])
+    frame = screen.capture_frame()
+    pattern = Pattern.from_image(desktop["button"]).target_offset(1, 2)
+
+    match = screen.region(0, 0, 150, 100).find(pattern, frame=frame)
+    assert (match.getX(), match.getY()) == (70, 40)
+    assert (match.target_x, match.target_y) == (70 + 15 + 1, 40 + 10 + 2)
+
+
+def test_click_goes_to_target_offset(desktop):
+    screen = Screen.from_image(desktop["screen"])
+    screen.click(Pattern.from_image(desktop["button"]).targetOffset(-5, 0))
+    screen.type_text("abc")
+    screen.hotkey(["ctrl", "s"])
+
+    assert screen.input.events == [
+        ("click", 70 + 15 - 5, 40 + 10, "left"),
+        ("type", "abc"),
+        ("hotkey", ("ctrl", "s")),
+    ]
+
+
+def test_exact_pattern_rejects_near_matches(desktop):
+    pixels = desktop["pixels"].copy()
+    pixels[45:48, 75:78] ^= 0xFF  # a few pixels off inside the template area
+    frame = Frame(200, 120, pixels.tobytes(), channels=1)
+    screen = Screen.from_image(desktop["screen"])
+
+    pattern = Pattern.from_image(desktop["button"])
+    assert screen.find(pattern, frame=frame) is not None
+    with pytest.raises(BackendError):
+        screen.find(Pattern.from_image(desktop["button"]).exact(), frame=frame)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import adapters.local_backend as local_module
+from adapters.frame import Frame, encode_png
+from adapters.local_backend import Pattern, Screen
+from adapters.match_cache import MatchCache, match_cache, pattern_key
+from adapters.types import BackendError, MatchNotFound
+
+
+def _noise(width, height, seed=11):
+    return np.random.default_rng(seed).integers(0, 256, size=(height, width), dtype=np.uint8)
+
+
+@pytest.fixture()
+def scene(tmp_path, monkeypatch):
+    pixels = _noise(120, 80)
+    screen_path = tmp_path / "screen.png"
+    screen_path.write_bytes(encode_png(120, 80, pixels.tobytes()))
+    button_path = tmp_path / "button.png"
+    button_path.write_bytes(encode_png(20, 10, pixels[30:40, 50:70].tobytes()))
+
+    calls = []
+    match_frame = local_module.match_frame
+    monkeypatch.setattr(local_module, "match_frame", lambda *args: calls.append(1) or match_frame(*args))
+
+    match_cache.clear()
+    match_cache.reset_stats()
+    yield {
+        "pixels": pixels,
+        "screen": Screen.from_image(str(screen_path)),
+        "button": str(button_path),
+        "calls": calls,
+    }
+    match_cache.configure(MatchCache().max_entries)
+    match_cache.clear()
+
+
+def _frame(pixels):
+    return Frame(pixels.shape[1], pixels.shape[0], pixels.tobytes())
+
+
+def test_unchanged_pixels_are_not_matched_again(scene):
+    region = scene["screen"].region(0, 0, 100, 60)
+    frame = _frame(scene["pixels"])
+    pattern = Pattern.from_image(scene["button"]).target_offset(3, 1)
+
+    first = region.find(pattern, frame=frame)
+    again = region.find(Pattern.from_image(scene["button"]).target_offset(3, 1), frame=_frame(scene["pixels"].copy()))
+
+    assert len(scene["calls"]) == 1
+    assert again is not first
+    assert (again.getX(), again.getY(), again.getW(), again.getH()) == (50, 30, 20, 10)
+    assert (again.score, again.target_x, again.target_y) == (first.score, first.target_x, first.target_y)
+    assert match_cache.stats()["hits"] == 1
+
+
+def test_changed_pixels_replace_the_entry(scene):
+    region = scene["screen"].region(0, 0, 100, 60)
+    pattern = Pattern.from_image(scene["button"])
+    region.find(pattern, frame=_frame(scene["pixels"]))
+
+    changed = scene["pixels"].copy()
+    changed[0:5, 0:5] = 0
+    region.find(pattern, frame=_frame(changed))
+
+    assert len(scene["calls"]) == 2
+    assert match_cache.stats()["entries"] == 1
+
+
+def test_pixels_outside_the_bounds_dont_matter(scene):
+    region = scene["screen"].region(40, 20, 40, 30)
+    pattern = Pattern.from_image(scene["button"])
+    region.find(pattern, frame=_frame(scene["pixels"]))
+
+    changed = scene["pixels"].copy()
+    changed[70:80, 100:120] = 0
+    region.find(pattern, frame=_frame(changed))
+
+    assert len(scene["calls"]) == 1
+
+
+def test_misses_are_cached(scene):
+    region = scene["screen"].region(0, 0, 40, 30)
+    frame = _frame(scene["pixels"])
+    for _ in range(2):
+        with pytest.raises(MatchNotFound):
+            region.find(scene["button"], frame=frame)
+    assert len(scene["calls"]) == 1
+
+
+def test_similarity_is_part_of_the_key(scene):
+    region = scene["screen"].region(0, 0, 100, 60)
+    frame = _frame(scene["pixels"])
+    region.find(Pattern.from_image(scene["button"]), frame=frame)
+    region.find(Pattern.from_image(scene["button"]).similar(0.95), frame=frame)
+    assert len(scene["calls"]) == 2
+    assert pattern_key(Pattern.from_image(scene["button"])) != pattern_key(Pattern.from_image(scene["button"]).exact())
+
+
+def test_search_errors_are_not_cached(scene):
+    region = scene["screen"].region(500, 500, 10, 10)
+    with pytest.raises(BackendError):
+        region.find(scene["button"], frame=_frame(scene["pixels"]))
+    assert match_cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_always_matches(scene):
+    match_cache.configure(0)
+    region = scene["screen"].region(0, 0, 100, 60)
+    frame = _frame(scene["pixels"])
+    region.find(scene["button"], frame=frame)
+    region.find(scene["button"], frame=frame)
+    assert len(scene["calls"]) == 2
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import adapters.sikuligo_backend as backend_module
+from adapters.frame import encode_png
+from adapters.pattern_cache import PatternCache
+from adapters.sikuligo_backend import Pattern
+
+
+class _RawPattern:
+    loads = 0
+
+    def __init__(self, image, similarity=None, offset=(0, 0), derived=False):
+        if not derived:
+            _RawPattern.loads += 1
+        self.image = image
+        self.similarity = similarity
+        self.offset = offset
+
+    def similar(self, similarity):
+        return _RawPattern(self.image, similarity, self.offset, derived=True)
+
+    def exact(self):
+        return self.similar(1.0)
+
+    def target_offset(self, dx, dy):
+        return _RawPattern(self.image, self.similarity, (dx, dy), derived=True)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PatternCache(max_bytes=1024 * 1024)
+    _RawPattern.loads = 0
+    monkeypatch.setattr(backend_module, "pattern_cache", cache)
+    monkeypatch.setattr(backend_module, "SikuligoPattern", _RawPattern)
+    monkeypatch.setattr(backend_module, "SikuligoScreen", object)
+    return cache
+
+
+def _write(path, value=0):
+    path.write_bytes(encode_png(4, 4, bytes([value]) * 16))
+    return str(path)
+
+
+def test_patterns_are_decoded_once_per_file_and_variant(tmp_path, cache):
+    path = _write(tmp_path / "Button.png")
+
+    for _ in range(3):
+        assert Pattern.from_image(path).similar(0.9).raw.similarity == 0.9
+        assert Pattern.from_image(path).raw.similarity is None
+    offset = Pattern.from_image(path).target_offset(5, 0).raw
+
+    assert offset.offset == (5, 0)
+    assert _RawPattern.loads == 3  # similar(0.9), plain and target offset variants
+    assert cache.stats()["misses"] == 3 and cache.stats()["hits"] == 4
+
+    first = Pattern.from_image(path).gray()
+    assert Pattern.from_image(path).gray() is first
+
+
+def test_changed_file_is_decoded_again(tmp_path, cache):
+    path = _write(tmp_path / "Button.png")
+    Pattern.from_image(path).raw
+
+    _write(tmp_path / "Button.png", value=255)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+    Pattern.from_image(path).raw
+
+    assert _RawPattern.loads == 2
+    assert Pattern.from_image(path).gray().pixels[0] == 255
+
+
+def test_cache_evicts_least_recently_used_within_memory_cap(tmp_path, cache):
+    cache.configure(2 * 4 * 4 * 4)  # two 4x4 RGBA patterns
+    paths = [_write(tmp_path / f"Button{i}.png") for i in range(3)]
+
+    Pattern.from_image(paths[0]).raw
+    Pattern.from_image(paths[1]).raw
+    Pattern.from_image(paths[0]).raw  # 0 is now the most recently used
+    Pattern.from_image(paths[2]).raw  # evicts 1
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1 and stats["bytes"] <= stats["max_bytes"]
+
+    Pattern.from_image(paths[0]).raw
+    assert _RawPattern.loads == 3
+    Pattern.from_image(paths[1]).raw
+    assert _RawPattern.loads == 4
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+
+import adapters.region_set as region_set_module
+from adapters.geometry import Rect
+from adapters.region_set import PointSet, RegionSet
+from adapters.sikuligo_backend import Location, Region
+from adapters.types import BackendError
+from entity.canvas.drawingStrategy import ContiniousDrawingStrategy, PracticeDrawingStrategy, pathRegion
+
+RECTS = [Rect(10, 10, 20, 20), (20, 15, 30, 5), Region(None, bounds=(25, 0, 10, 40))]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(region_set_module, "np", None)
+    return request.param
+
+
+def test_union_and_intersection(backend):
+    rects = RegionSet(RECTS)
+
+    assert len(rects) == 3 and rects[1] == (20, 15, 30, 5) and type(rects[1]) is Rect
+    assert rects.union() == (10, 0, 40, 40)
+    assert rects.intersection() == (25, 15, 5, 5)
+    assert RegionSet([(0, 0, 5, 5), (10, 10, 5, 5)]).intersection() is None
+    assert RegionSet().union() is None and RegionSet().intersection() is None
+
+
+def test_clip_and_nearby(backend):
+    rects = RegionSet(RECTS)
+
+    assert list(rects.clip((0, 0, 28, 18))) == [(10, 10, 18, 8), (20, 15, 8, 3), (25, 0, 3, 18)]
+    assert list(rects.clip(Rect(40, 30, 10, 10))) == []
+    assert list(rects.nearby(5)) == [(5, 5, 30, 30), (15, 10, 40, 15), (20, -5, 20, 50)]
+    assert rects.nearby(5).union() == Region(None, bounds=rects.union()).nearby(5)._bounds
+
+
+def test_point_queries(backend):
+    rects = RegionSet(RECTS)
+    points = PointSet([(12, 12), Location(26, 16), [100, 100]])
+
+    assert [list(row) for row in rects.contains(points)] == [
+        [True, False, False],
+        [True, True, True],
+        [False, False, False],
+    ]
+    assert rects.containing(26, 16) == [0, 1, 2]
+    assert rects.containing(30, 10) == [2]  # right and bottom edges are outside
+    assert list(points.within((0, 0, 20, 20))) == [True, False, False]
+
+
+def test_point_bounds_match_region_add(backend):
+    path = [(5.5, 10), (30, 40), (12, 25.25), (30, 40)]
+
+    region = Region(int(path[0][0]), int(path[0][1]), 1, 1)
+    for x, y in path[1:]:
+        region = region.add(Location(x, y))
+    assert PointSet(path).bounds() == region._bounds == (5, 10, 25, 30)
+    assert list(PointSet(path)) == path
+    assert PointSet([(3, 4)]).bounds() == (3, 4, 1, 1)
+    assert PointSet().bounds() is None
+
+
+def test_region_of_many_regions(backend):
+    screen = Region("screen")
+    first = Region("scope", screen=screen, bounds=(10, 10, 5, 5))
+    covering = Region([first, (40, 30, 10, 10)])
+
+    assert (covering._raw, covering._screen, covering._bounds) == ("scope", screen, (10, 10, 40, 30))
+    assert Region([first, screen])._bounds is None  # covering the whole screen
+    with pytest.raises(BackendError):
+        Region([])
+
+
+class _Screen:
+    batches = 0
+
+    @contextmanager
+    def batch(self):
+        self.batches += 1
+        yield
+
+
+class _Config:
+    def __init__(self):
+        self.screen = _Screen()
+
+    def getScreen(self):
+        return self.screen
+
+
+class _Canvas:
+    def __init__(self):
+        self.centered = []
+        self.moves = []
+        self.config = _Config()
+
+    def center(self, region):
+        self.centered.append(region._bounds)
+
+    def mouseMove(self, x, y):
+        self.moves.append((x, y))
+
+    def startDrawing(self):
+        pass
+
+    stopDrawing = startDrawing
+
+
+@pytest.mark.parametrize("strategy", [ContiniousDrawingStrategy, PracticeDrawingStrategy])
+def test_drawing_strategies_center_on_the_path(strategy):
+    canvas = _Canvas()
+    drawing = strategy(canvas)
+    drawing.on()
+    for x, y in [(10, 50), (40, 20), (25.5, 80)]:
+        drawing.goto(x, y)
+    drawing.off()
+
+    assert canvas.centered == [(10, 20, 30, 60)]
+    assert pathRegion([]) is None
+    if strategy is ContiniousDrawingStrategy:
+        assert canvas.moves == [(10, 50), (40, 20), (25.5, 80)]
+        assert canvas.config.screen.batches == 1
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from entity.entity import Entity
+from entity.multiResultProxy import MultiResultProxy
+from entity.searcher import AmbiguousKeySearchException, KeyNotFoundException, Searcher, WordIndex, nameWords
+
+
+class _Logger:
+    def trace(self, *_args, **_kwargs):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def _entities(monkeypatch):
+    monkeypatch.setattr(Entity, "logger", lambda _entity: _Logger())
+    monkeypatch.setattr(Entity, "regionFinderStrategy", lambda _entity: None)
+    monkeypatch.setattr(Entity, "searcherStrategy", Searcher)
+    monkeypatch.setattr(MultiResultProxy, "entitySeacher", Searcher)
+
+
+class Button(Entity):
+    pass
+
+
+class Calculator(Entity):
+    BUTTON_TWO = ["buttonTwo", Button]
+    BUTTON_TWENTY_TWO = ["buttonTwentyTwo", Button]
+    BIG_RED_SPECK = ["bigRedSpeck", Button]
+    BLUE_SPECK = ["blueSpeck", Button]
+
+
+class ScientificCalculator(Calculator):
+    BUTTON_SINE = ["buttonSine", Button]
+
+
+class BlueMarble(Entity):
+    BLUE_SPECK = ["blueSpeck", Button]
+
+
+class RedMarble(Entity):
+    RED_SPECK = ["redSpeck", Button]
+
+
+def test_name_words():
+    assert nameWords("buttonTwo") == ("button", "two")
+    assert nameWords("ScientificCalculator") == ("scientific", "calculator")
+    assert nameWords("button2Way") == ("button", "2", "way")
+
+
+def test_fewest_words_win():
+    searcher = Searcher()
+    searcher.add(Calculator)
+
+    assert searcher.search("speck").getEntity() is Calculator.BLUE_SPECK
+    assert searcher.search("red speck").getEntity() is Calculator.BIG_RED_SPECK
+    assert searcher.search("two").getEntity() is Calculator.BUTTON_TWO
+    assert searcher.search("calculator").getEntity() == [Calculator]
+    with pytest.raises(KeyNotFoundException):
+        searcher.search("two two")  # each search word needs its own word in the name
+    with pytest.raises(KeyNotFoundException):
+        searcher.search("three")
+
+
+def test_ambiguous_and_proxy_searches():
+    searcher = Searcher()
+    searcher.add(MultiResultProxy(None, [BlueMarble, RedMarble], None))
+
+    with pytest.raises(AmbiguousKeySearchException):
+        searcher.search("speck")
+    with pytest.raises(AmbiguousKeySearchException):
+        searcher.search("marble")
+    assert searcher.search("red speck").getEntity() is RedMarble.RED_SPECK
+    assert searcher.search("red speck").getOwner() is RedMarble
+    assert searcher.search("blue marble").getEntity() == [BlueMarble]
+    assert searcher.search(RedMarble.RED_SPECK).getEntity() is RedMarble.RED_SPECK
+
+
+def test_entities_search_their_inherited_keys():
+    calculator = ScientificCalculator(None)
+
+    assert calculator["sine"].getName() == "buttonSine"
+    assert calculator["button two"] is calculator[Calculator.BUTTON_TWO]
+    assert calculator.findEntityByName("twenty").getName() == "buttonTwentyTwo"
+
+
+def test_index_is_built_once_per_class(monkeypatch):
+    index = WordIndex.forClass(ScientificCalculator)
+    assert WordIndex.forClass(ScientificCalculator) is index
+    assert WordIndex.forClass(Calculator) is not index
+    assert sorted(key.name for _count, key in index.search(["button"])) == ["buttonSine", "buttonTwentyTwo", "buttonTwo"]
+
+    monkeypatch.setattr(ScientificCalculator, "BUTTON_COSINE", ["buttonCosine", Button], raising=False)
+    assert ScientificCalculator(None)["cosine"].getName() == "buttonCosine"
+    assert WordIndex.forClass(ScientificCalculator) is not index
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+import adapters.sikuligo_backend as sikuligo_module
+from adapters import server_pool
+from adapters.server_pool import ServerPool
+
+pytestmark = pytest.mark.skipif(server_pool.fcntl is None, reason="the pool needs POSIX file locks")
+
+FAKE_SERVER = """#!%s
+import socket, sys
+host, port = sys.argv[sys.argv.index("-listen") + 1].rsplit(":", 1)
+server = socket.create_server((host, int(port)))
+while True:
+    server.accept()[0].close()
+"""
+
+
+@pytest.fixture()
+def pool(tmp_path):
+    binary = tmp_path / "sikuligo"
+    binary.write_text(FAKE_SERVER % sys.executable)
+    binary.chmod(0o755)
+    pool = ServerPool(str(tmp_path / "pool"), str(binary))
+    yield pool
+    pool.stop_all()
+
+
+def _kill(record):
+    os.kill(record["pid"], signal.SIGKILL)
+    os.waitpid(record["pid"], 0)
+
+
+def test_idle_servers_are_leased_one_process_at_a_time(pool):
+    assert pool.maintain(2) == {"running": 2, "started": 2, "evicted": 0}
+    assert all(pool.healthy(record) for record in pool.records())
+
+    first, second = pool.lease(), pool.lease()
+    assert first.address != second.address
+    assert pool.lease() is None  # both in use
+    assert pool.idle_for() is None
+
+    second.release()
+    with pool.lease() as again:
+        assert again.address == second.address
+    first.release()
+    assert pool.idle_for() < 5
+    assert pool.maintain(2)["started"] == 0
+
+
+def test_leases_are_exclusive_across_processes(pool):
+    pool.maintain(1)
+    code = "import sys; sys.path.insert(0, %r); from adapters.server_pool import ServerPool; print(ServerPool(%r).lease())"
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+
+    with pool.lease():
+        output = subprocess.check_output([sys.executable, "-c", code % (src, pool.directory)], text=True)
+        assert output.strip() == "None"
+    output = subprocess.check_output([sys.executable, "-c", code % (src, pool.directory)], text=True)
+    assert output.startswith("Lease(127.0.0.1:")  # released when the other process exited
+
+
+def test_dead_servers_are_evicted_and_replaced(pool):
+    pool.maintain(2)
+    dead, alive = pool.records()
+    _kill(dead)
+    old = time.time() - 60
+    os.utime(pool._path(dead["name"], ".lock"), (old, old))  # tried first, used longest ago
+
+    lease = pool.lease()
+    assert lease.address == alive["address"]
+    assert [record["name"] for record in pool.records()] == [alive["name"]]
+    lease.release()
+
+    _kill(alive)
+    assert pool.maintain(1) == {"running": 1, "started": 1, "evicted": 1}
+    assert len(pool.records()) == 1
+
+
+def test_pool_stops_when_idle(pool):
+    pool.maintain(1)
+    old = time.time() - 60
+    for record in pool.records():
+        os.utime(pool._path(record["name"], ".lock"), (old, old))
+
+    pool.run(1, idle_timeout=30, interval=0)
+    assert pool.records() == []
+
+
+def test_busy_servers_are_stopped_when_released(pool):
+    pool.maintain(2)
+    lease = pool.lease()
+
+    assert pool.stop_all() == 2
+    assert pool.records() == []
+    assert pool.healthy(lease.record)  # still serving its client
+    lease.release()
+    assert not server_pool._pid_alive(lease.record["pid"])
+
+
+def test_stop_ends_the_manager(pool):
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), "..", "src"))
+    manager = subprocess.Popen(
+        [sys.executable, "-m", "adapters.server_pool", "start", "--directory", pool.directory, "--binary", pool.binary_path, "--size", "1"],
+        env=env,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not (pool.records() and pool.manager_pid()):
+            assert time.monotonic() < deadline and manager.poll() is None
+            time.sleep(0.05)
+        assert pool.manager_pid() == manager.pid
+        with pytest.raises(server_pool.BackendError, match="already running"):
+            pool.run(1)
+
+        assert server_pool.main(["stop", "--directory", pool.directory]) == 0
+        assert manager.wait(5) == 0
+        assert pool.records() == [] and pool.manager_pid() is None
+    finally:
+        if manager.poll() is None:
+            manager.kill()
+
+
+class _RawScreen:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _SikuligoScreen:
+    connected = []
+
+    @classmethod
+    def connect(cls, **kwargs):
+        cls.connected.append(kwargs)
+        return _RawScreen()
+
+    @classmethod
+    def auto(cls, **kwargs):
+        return "spawned"
+
+
+def test_screen_auto_attaches_to_the_pool(pool, monkeypatch):
+    monkeypatch.setattr(sikuligo_module, "SikuligoScreen", _SikuligoScreen)
+    monkeypatch.setattr(sikuligo_module, "SikuligoPattern", object)
+    monkeypatch.setenv("SIKULI_FRAMEWORK_POOL_DIR", pool.directory)
+    monkeypatch.delenv("SIKULI_GRPC_ADDR", raising=False)
+    pool.maintain(1)
+    address = pool.records()[0]["address"]
+
+    assert sikuligo_module.Screen.auto(binary_path="/opt/sikuligo")._raw_screen == "spawned"  # options the pool can't honour
+    screen = sikuligo_module.Screen.auto(startup_timeout_seconds=5.0)
+    assert _SikuligoScreen.connected[-1] == {"address": address, "startup_timeout_seconds": 5.0}
+    assert sikuligo_module.Screen.auto()._raw_screen == "spawned"  # the only server is taken
+
+    screen.close()
+    assert screen._raw_screen.closed
+    with pool.lease() as lease:
+        assert lease.address == address
+
+    monkeypatch.setenv("SIKULI_FRAMEWORK_POOL", "0")
+    assert sikuligo_module.Screen.connect(address="127.0.0.1:1")._raw_screen is not None
+    assert _SikuligoScreen.connected[-1] == {"address": "127.0.0.1:1"}
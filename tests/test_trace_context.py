@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+
+import pytest
+
+from entity.entity import Entity
+from log import EntityLoggerProxy, traceContext
+from log.traceContext import breadcrumb, span, traced
+
+
+class _Logger:
+    def __init__(self, entity):
+        self.entity = entity
+
+    def trace(self, *_args, **_kwargs):
+        self.entity.trails.append(breadcrumb())
+
+
+@pytest.fixture(autouse=True)
+def _entities(monkeypatch):
+    monkeypatch.setattr(Entity, "logger", _Logger)
+    monkeypatch.setattr(Entity, "regionFinderStrategy", lambda _entity: None)
+
+
+class Button(Entity):
+    pass
+
+
+class Calculator(Entity):
+    BUTTON_TWO = ["buttonTwo", Button]
+
+    def __init__(self, *args, **kargs):
+        self.trails = []
+        super(Calculator, self).__init__(*args, **kargs)
+
+
+class _Library:
+    def __init__(self, calculator):
+        self.calculator = calculator
+
+    @traced()
+    def click(self, target, times=1):
+        """Clicks target"""
+        return self.calculator[target].formatPrefix()
+
+
+def test_spans_nest_and_end():
+    assert breadcrumb() == ""
+    with span("suite"):
+        with span("Calculator"):
+            assert breadcrumb() == "->suite->Calculator"
+        assert breadcrumb() == "->suite"
+    assert breadcrumb() == ""
+
+    token = traceContext.push("keyword")
+    assert breadcrumb() == "->keyword"
+    traceContext.pop(token)
+    assert breadcrumb() == ""
+
+
+def test_entities_and_keywords_are_traced():
+    Button.trails = []
+    calculator = Calculator(None)
+    assert calculator.trails == ["->Calculator"]  # logged while created
+
+    library = _Library(calculator)
+    assert library.click(Calculator.BUTTON_TWO) == "[Calculator,buttonTwo:Button]->click "
+    assert Button.trails == ["->click->Button"]
+    assert calculator.formatPrefix() == "[Calculator:Entity] "
+    with span("suite"):
+        assert calculator.formatPrefix(showStackTrace=False) == "[Calculator:Entity] "
+
+    assert inspect.signature(_Library.click) == inspect.signature(_Library.click.__wrapped__)
+    assert _Library.click.__doc__ == "Clicks target"
+
+
+class _Formatter:
+    def __init__(self, entity):
+        self.entity = entity
+
+    def setLogLevel(self, _level):
+        return self
+
+    def __str__(self):
+        return "[%s](shot.png)" % self.entity
+
+
+class _Sink:
+    def __init__(self):
+        self.lines = []
+
+    def log(self, _level, msg, *_args, **_kwargs):
+        self.lines.append(msg)
+
+
+def test_entity_log_lines_carry_the_trail(monkeypatch):
+    sink = _Sink()
+    monkeypatch.setattr(EntityLoggerProxy, "logger", sink)
+    monkeypatch.setattr(EntityLoggerProxy, "formatter", _Formatter)
+    monkeypatch.setattr(Entity, "logger", EntityLoggerProxy)
+
+    with span("open"):
+        calculator = Calculator(None)
+    calculator.logger.info("ready")
+    library = _Library(calculator)
+    EntityLoggerProxy(library).info("not an entity")
+
+    assert sink.lines == [
+        "[Calculator:Entity](shot.png)->open->Calculator created",
+        "[Calculator:Entity](shot.png) ready",
+        "[%s](shot.png) not an entity" % library,
+    ]
+
+
+def test_threads_and_tasks_have_their_own_trail():
+    seen = {}
+
+    def worker(name):
+        with span(name):
+            seen[name] = breadcrumb()
+
+    with span("main"):
+        thread = threading.Thread(target=worker, args=("thread",))
+        thread.start()
+        thread.join()
+
+        async def task(name):
+            with span(name):
+                await asyncio.sleep(0)
+                return breadcrumb()
+
+        async def main():
+            return await asyncio.gather(task("first"), task("second"))
+
+        assert asyncio.run(main()) == ["->main->first", "->main->second"]
+        assert breadcrumb() == "->main"
+    assert seen == {"thread": "->thread"}
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+
+from region.transform import PatternSimilarity, RegionNearby, Transform
+from region.transformCache import TransformCache
+
+SIDECAR = """
+from region.transform import Transform, PatternSimilarity
+
+transforms = {
+    Transform.CONTEXT_CURRENT: [PatternSimilarity(%s)],
+}
+"""
+
+
+class _Logger:
+    def warn(self, *_args, **_kwargs):
+        return None
+
+
+def _use_cache(monkeypatch, cache):
+    monkeypatch.setattr(Transform, "logger", lambda _transform: _Logger())
+    monkeypatch.setattr(Transform, "transformCache", cache)
+
+
+def test_sidecar_compiled_once_with_fresh_transform_objects(tmp_path, monkeypatch):
+    cache = TransformCache(refreshInterval=0)
+    _use_cache(monkeypatch, cache)
+    (tmp_path / "Button.png").write_bytes(b"")
+    (tmp_path / "Button.py").write_text(SIDECAR % "0.9")
+    image = str(tmp_path / "Button.png")
+
+    first = Transform(image).transforms[Transform.CONTEXT_CURRENT][0]
+    second = Transform(image).transforms[Transform.CONTEXT_CURRENT][0]
+
+    assert isinstance(first, PatternSimilarity) and first.similarity == 0.9
+    assert first is not second  # transforms keep state while applied, never shared
+    assert cache.compiles == 1
+
+    (tmp_path / "Button.py").write_text(SIDECAR % "0.5")
+    os.utime(tmp_path / "Button.py", ns=(0, os.stat(tmp_path / "Button.py").st_mtime_ns + 1_000_000_000))
+
+    assert Transform(image).transforms[Transform.CONTEXT_CURRENT][0].similarity == 0.5
+    assert cache.compiles == 2
+
+
+def test_missing_sidecar_is_remembered(tmp_path, monkeypatch):
+    cache = TransformCache(refreshInterval=60)
+    _use_cache(monkeypatch, cache)
+    image = str(tmp_path / "Plain.png")
+
+    assert isinstance(Transform(image).transforms[Transform.CONTEXT_PREVIOUS][0], RegionNearby)
+
+    def _no_stat(_path):
+        raise AssertionError("missing sidecar must not be looked up again")
+
+    monkeypatch.setattr(TransformCache, "getMtime", staticmethod(_no_stat))
+    assert isinstance(Transform(image).transforms[Transform.CONTEXT_PREVIOUS][0], RegionNearby)
+
+
+def test_prewarm_compiles_sidecars_under_the_baseline(tmp_path, monkeypatch):
+    cache = TransformCache(refreshInterval=60)
+    _use_cache(monkeypatch, cache)
+    (tmp_path / "App").mkdir()
+    for name in ("App-0", "App-1", "App-2"):
+        (tmp_path / "App" / f"{name}.png").write_bytes(b"")
+    (tmp_path / "App" / "App-1.py").write_text(SIDECAR % "0.8")
+
+    assert Transform.prewarm([str(tmp_path)]) == 1
+    assert cache.compiles == 1
+    assert len(cache.sources) == 6  # .json and .py of each image, all but one remembered as missing
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import glob
+import os
+import pickle
+
+import pytest
+
+from region.transform import ClickableEntityClickStrategy, RegionMorph, Transform
+from region.transformCache import TransformCache
+from region.transformPlan import TransformPlan, TransformStep, main
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "examples")
+
+
+class _Logger:
+    def warn(self, *_args, **_kwargs):
+        return None
+
+
+def _state(transform):
+    state = dict(vars(transform))
+    if isinstance(transform, ClickableEntityClickStrategy):
+        state["clickStrategy"] = type(state["clickStrategy"]).__name__
+    return type(transform).__name__, state
+
+
+@pytest.mark.parametrize("sidecar", sorted(glob.glob(os.path.join(EXAMPLES, "*", "baseline", "**", "*.py"), recursive=True)))
+def test_converted_example_sidecars_build_the_same_transforms(sidecar):
+    namespace = {}
+    with open(sidecar) as handle:
+        exec(compile(handle.read(), sidecar, "exec"), namespace)
+
+    with open(sidecar) as handle:
+        plan = TransformPlan.fromPython(handle.read(), sidecar)
+    plan = pickle.loads(pickle.dumps(TransformPlan.parse(plan.dumps())))  # through JSON and back
+
+    built = plan.build()
+    for context, transforms in namespace["transforms"].items():
+        assert [_state(t) for t in built[context]] == [_state(t) for t in transforms]
+
+
+def test_plans_are_immutable_and_reject_unknown_types():
+    plan = TransformPlan.parse('{"version": 1, "transforms": {"PREVIOUS": [{"type": "RegionMorph", "args": [0, 0, 1, 1]}]}}')
+
+    assert plan.getSteps("PREVIOUS") == (TransformStep("RegionMorph", (0, 0, 1, 1)),)
+    assert hash(plan) == hash(TransformPlan.parse(plan.dumps()))
+    with pytest.raises(AttributeError):
+        plan.contexts = ()
+
+    with pytest.raises(ValueError):
+        TransformPlan.parse('{"version": 1, "transforms": {"PREVIOUS": [{"type": "os.system", "args": ["true"]}]}}')
+    with pytest.raises(ValueError):
+        TransformPlan.fromPython("transforms = {Transform.CONTEXT_NEXT: [__import__('os').system('true')]}")
+
+
+def test_transform_prefers_declarative_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setattr(Transform, "logger", lambda _transform: _Logger())
+    monkeypatch.setattr(Transform, "transformCache", TransformCache(refreshInterval=0))
+    (tmp_path / "Button.png").write_bytes(b"")
+    (tmp_path / "Button.py").write_text("raise RuntimeError('the .py sidecar must not be executed')\n")
+    (tmp_path / "Button.json").write_text('{"version": 1, "transforms": {"FINAL": [{"type": "RegionMorph", "args": [1, 2, 3, 4]}]}}')
+
+    first = Transform(str(tmp_path / "Button.png")).transforms
+    second = Transform(str(tmp_path / "Button.png")).transforms
+
+    assert isinstance(first[Transform.CONTEXT_FINAL][0], RegionMorph)
+    assert first[Transform.CONTEXT_FINAL][0] is not second[Transform.CONTEXT_FINAL][0]
+    assert first[Transform.CONTEXT_PREVIOUS] == []
+
+
+def test_convert_cli_writes_json_next_to_sidecars(tmp_path, capsys):
+    (tmp_path / "App.png").write_bytes(b"")
+    (tmp_path / "App.py").write_text(
+        "from region.transform import Transform, RegionBelow\n"
+        "transforms = {Transform.CONTEXT_NEXT: [RegionBelow(100)], Transform.CONTEXT_FINAL: []}\n"
+    )
+    (tmp_path / "helper.py").write_text("x = 1\n")  # no image, not a sidecar
+
+    assert main(["convert", str(tmp_path), "--write"]) == 0
+
+    plan = TransformPlan.load(str(tmp_path / "App.json"))
+    assert plan.getSteps("NEXT") == (TransformStep("RegionBelow", (100,)),)
+    assert not (tmp_path / "helper.json").exists()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from adapters.frame import Frame
+from adapters.types import BackendError
+from entity import entity as entityModule
+from entity.entity import Entity
+
+
+class _Logger:
+    traces = []
+
+    def trace(self, message, *_args, **_kwargs):
+        self.traces.append(message)
+
+    debug = trace
+
+    def getFormatter(self):
+        return lambda _value: self
+
+    def showBaseline(self):
+        return None
+
+
+class _Screen:
+    def __init__(self):
+        self.pixels = b"\x00" * 4
+        self.captures = 0
+        self.ages = set()
+        self.threads = set()
+
+    def capture_frame(self, region, max_age_millis=None):
+        if self.pixels is None:
+            raise BackendError("capture failed")
+        self.captures += 1
+        self.ages.add(max_age_millis)
+        self.threads.add(threading.current_thread())
+        return Frame(2, 2, self.pixels, channels=1)
+
+
+class _Config:
+    backend = "sikuligo"
+
+    def __init__(self):
+        self.screen = _Screen()
+
+    def getScreen(self):
+        return self.screen
+
+
+class _Finder:
+    def __init__(self):
+        self.finds = 0
+
+    def setRegion(self, region):
+        return None
+
+    def find(self, timeout=None):
+        self.finds += 1
+        return "region"
+
+    async def findAsync(self, timeout=None):
+        return self.find(timeout)
+
+
+class Window(Entity):
+    pass
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(entityModule.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture()
+def window(monkeypatch, clock):
+    config = _Config()
+    monkeypatch.setattr(Entity, "logger", lambda _entity: _Logger())
+    monkeypatch.setattr(Entity, "regionFinderStrategy", lambda _entity: _Finder())
+    monkeypatch.setattr(Entity, "config", config)
+    monkeypatch.setattr(Entity, "validationTtl", 5)
+    return Window(None)
+
+
+def test_unchanged_region_is_not_searched_again(window):
+    window.validate()
+    assert window.regionFinder.finds == 1
+
+    window.invalidate()
+    window.validate()
+    window.validate()
+    assert window.isValid()
+    assert window.regionFinder.finds == 1
+    assert window.config.screen.captures == 3  # once when found, then once per validate
+    assert window.config.screen.ages == {0}  # never a buffered frame
+
+
+def test_failed_captures_are_logged_and_searched(window):
+    window.config.screen.pixels = None
+    _Logger.traces = []
+    window.validate()
+    window.invalidate()
+    window.validate()
+
+    assert window.regionFinder.finds == 2
+    assert any("cannot fingerprint region" in message for message in _Logger.traces)
+
+
+def test_changed_region_is_searched_again(window):
+    window.validate()
+
+    window.config.screen.pixels = b"\x01" * 4
+    window.validate()
+    assert window.regionFinder.finds == 2
+
+    window.invalidate()
+    window.validate()
+    assert window.regionFinder.finds == 2  # fingerprint of the new region
+
+
+def test_expired_validation_is_searched_again(window, clock):
+    window.validate()
+
+    clock[0] += 6
+    window.validate()
+    assert window.regionFinder.finds == 2
+
+
+def test_async_validation_uses_the_same_cache(window):
+    window.validate()
+    window.config.screen.threads.clear()
+    window.invalidate()
+    asyncio.run(window.validateAsync())
+    assert window.isValid() and window.regionFinder.finds == 1
+
+    window.config.screen.pixels = b"\x01" * 4
+    window.invalidate()
+    asyncio.run(window.validateAsync())
+    assert window.regionFinder.finds == 2
+    assert window.config.screen.threads and threading.main_thread() not in window.config.screen.threads  # off the event loop
+
+
+def test_cache_is_off_by_default(window, monkeypatch):
+    monkeypatch.setattr(Entity, "validationTtl", None)
+    window.validate()
+    window.invalidate()
+    window.validate()
+    window.validate()
+
+    assert window.regionFinder.finds == 2
+    assert window.config.screen.captures == 0